@@ -16,4 +16,12 @@ def create_app():
         from .dash_application import ga_cases
         app = ga_cases.Add_Dash(app)
 
+        # Import data export Blueprint
+        from . import export
+        app.register_blueprint(export.export_bp)
+
+        # Import read-only JSON API Blueprint
+        from . import api
+        app.register_blueprint(api.api_bp)
+
         return app
\ No newline at end of file
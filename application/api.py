@@ -0,0 +1,214 @@
+"""Read-only JSON API over the dashboard's data: county series, statewide and demographic snapshots.
+
+Every response is a pure function of the query and the data version, so it is built once per version
+(through the same result cache as the dashboard callbacks), served with a strong ETag derived from both
+and revalidated with `If-None-Match`. Bodies are gzipped for clients that accept it.
+"""
+import gzip
+import hashlib
+import numpy as np
+import pandas as pd
+from flask import Blueprint, Response, abort, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from .dash_application.ga_cases import (region_data, region_store, history_store, group_aggregator, selection_history,
+                                        get_datasets, current_version, LABEL_STATS, HOME_STATE)
+from .dash_application.cache import memoize
+from .dash_application.day_calendar import day_to_date
+from .dash_application.serialization import dumps
+from .dash_application.storage import STATE_ROW
+
+api_bp = Blueprint('api_bp', __name__, url_prefix='/api/v1')
+
+MAX_AGE_SECONDS = 300
+# Largest counties x stats batch answered by one `/series` request
+MAX_SERIES = 2000
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+DEMOGRAPHICS = ['age', 'gender', 'race', 'testing', 'summary']
+
+
+### QUERIES
+SERIES_PARAMS = {'state', 'county', 'counties', 'stat', 'stats', 'start', 'end'}
+STATE_PARAMS = {'state', 'start', 'end'}
+
+
+def check_params(args, allowed=()):
+    """Rejects query parameters a route does not read, so a misspelt one is not silently ignored."""
+    unknown = set(args) - set(allowed)
+    if unknown:
+        abort(400, description=f"Unknown query parameters: {', '.join(sorted(unknown))}")
+
+
+def parse_state(args):
+    state = args.get('state', HOME_STATE)
+    if state != HOME_STATE and state not in region_store.available():
+        abort(404, description=f"No data for state '{state}'")
+    return state
+
+
+def parse_list(args, name, plural):
+    """A repeated (`?county=A&county=B`) or comma separated plural (`?counties=A,B`) parameter."""
+    values = args.getlist(name) or args.get(plural, '').split(',')
+    return list(dict.fromkeys(value.strip() for value in values if value.strip()))
+
+
+def parse_day_range(args, max_day):
+    """`[start, end]` like the day slider: `start` is exclusive, both default to the whole history."""
+    try:
+        start, end = int(args.get('start', 0)), int(args.get('end', max_day))
+    except ValueError:
+        abort(400, description="'start' and 'end' must be whole day numbers")
+    if not 0 <= start < end:
+        abort(400, description="'start' must be at least 0 and less than 'end'")
+    return [start, min(end, max_day)]
+
+
+def parse_series(args):
+    """Reads the state, the counties (or district names, or 'All Counties'), the stats and the day range of a batch."""
+    check_params(args, SERIES_PARAMS)
+    state = parse_state(args)
+    items = parse_list(args, 'county', 'counties') or [STATE_ROW]
+    stats = parse_list(args, 'stat', 'stats') or ['TotalCases']
+
+    unknown_stats = set(stats) - set(LABEL_STATS)
+    if unknown_stats:
+        abort(400, description=f"Unknown stats: {', '.join(sorted(unknown_stats))}")
+    known = set(history_store(state).counties()) | set(group_aggregator(state).groups) | {STATE_ROW}
+    unknown = set(items) - known
+    if unknown:
+        abort(400, description=f"Unknown counties: {', '.join(sorted(unknown))}")
+    if len(items) * len(stats) > MAX_SERIES:
+        abort(400, description=f"At most {MAX_SERIES} series (counties x stats) per request")
+    return state, tuple(items), tuple(stats), parse_day_range(args, history_store(state).max_day())
+
+
+### PAYLOADS
+def iso_dates(days):
+    return np.datetime_as_string(day_to_date(days), unit='D').tolist()
+
+
+def records(df):
+    """Rows of a frame with dates as ISO strings and missing values as null."""
+    df = df.copy()
+    for column in df.columns[df.dtypes.map(pd.api.types.is_datetime64_any_dtype)]:
+        df[column] = df[column].dt.strftime('%Y-%m-%d')
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def series_payload(state, items, stats, day_range):
+    series = {}
+    for stat in stats:
+        days, values = selection_history(list(items), stat, day_range, state)
+        series[stat] = dict(zip(items, values))
+    return {'state': state, 'days': days, 'dates': iso_dates(days), 'series': series}
+
+
+def state_payload(state, day_range):
+    state_time = region_data(state)['state_time']
+    rows = state_time[state_time['Day'].between(day_range[0] + 1, day_range[1])]
+    return {'state': state, 'rows': records(rows)}
+
+
+def demographics_payload(category):
+    df = get_datasets()[category]
+    return {'state': HOME_STATE, 'category': category, 'rows': records(df)}
+
+
+def meta_payload():
+    states = sorted(set([HOME_STATE] + region_store.available()))
+    max_day = history_store(HOME_STATE).max_day()
+    return {
+        'states': states,
+        'stats': LABEL_STATS,
+        'max_day': max_day,
+        'max_date': iso_dates([max_day])[0],
+        'counties': history_store(HOME_STATE).counties(),
+        'districts': group_aggregator(HOME_STATE).groups,
+        'demographics': DEMOGRAPHICS,
+    }
+
+
+PAYLOADS = {
+    'series': series_payload,
+    'state': state_payload,
+    'demographics': demographics_payload,
+    'meta': meta_payload,
+}
+
+
+@memoize(current_version)
+def encoded(kind, *args):
+    """The JSON body of a payload and its gzip encoding, built once per data version."""
+    body = dumps(dict(PAYLOADS[kind](*args), version=current_version())).encode()
+    return body, gzip.compress(body, compresslevel=6)
+
+
+### RESPONSES
+def cached_response(kind, *args):
+    """
+    Serves a payload with a strong ETag of the data version and the query (one per content encoding),
+    answering 304 to a matching `If-None-Match` without building the body.
+    """
+    version = current_version()
+    use_gzip = request.accept_encodings['gzip'] > 0
+    query = f"{kind}|{args!r}"
+    etag = f"{version}-{hashlib.sha1(query.encode()).hexdigest()[:12]}"
+    matched = [tag for tag in (etag, f"{etag}-gz") if tag in request.if_none_match]
+
+    if matched:
+        response = Response(status=304)
+        etag = matched[0]
+    else:
+        body, compressed = encoded(kind, *args)
+        use_gzip = use_gzip and len(body) >= GZIP_MIN_BYTES
+        response = Response(compressed if use_gzip else body, mimetype='application/json')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+            etag = f"{etag}-gz"
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={MAX_AGE_SECONDS}'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['X-Data-Version'] = version
+    return response
+
+
+@api_bp.errorhandler(HTTPException)
+def json_error(error):
+    response = jsonify(error=error.name, description=error.description)
+    response.status_code = error.code
+    return response
+
+
+### ROUTES
+@api_bp.route('/meta')
+def meta():
+    """States, stats, counties, districts and the last day with data."""
+    check_params(request.args)
+    return cached_response('meta')
+
+
+@api_bp.route('/series')
+def series():
+    """
+    A batch of series: every requested county (or district, or 'All Counties') for every requested stat
+    over `(start, end]`, e.g. `/api/v1/series?county=Fulton&county=Cobb&stat=TotalCases&stat=Deaths_per_100k`.
+    """
+    return cached_response('series', *parse_series(request.args))
+
+
+@api_bp.route('/state')
+def state():
+    """Statewide rows over `(start, end]`; `?start=<end - 1>` gives a one-day snapshot."""
+    check_params(request.args, STATE_PARAMS)
+    state = parse_state(request.args)
+    return cached_response('state', state, parse_day_range(request.args, history_store(state).max_day()))
+
+
+@api_bp.route('/demographics/<category>')
+def demographics(category):
+    """The latest Georgia snapshot of one demographic breakdown (age, gender, race, testing or summary)."""
+    if category not in DEMOGRAPHICS:
+        abort(404, description=f"'category' must be one of {', '.join(DEMOGRAPHICS)}")
+    check_params(request.args)
+    return cached_response('demographics', category)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import time
+import logging
+import threading
+from werkzeug.exceptions import ServiceUnavailable
+
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER_SECONDS = 5
+
+
+class Overloaded(ServiceUnavailable):
+	description = "The dashboard is busy. Please try again in a few seconds."
+
+
+### ADMISSION CONTROL
+class AdmissionGate:
+	"""
+	Per-worker admission control for one class of expensive callback. At most `concurrency` computations
+	run at once and at most `queue_size` wait for a slot. A call is shed when the queue is full, when the
+	wait expected from recent computation times exceeds `budget` seconds, or when no slot frees up within
+	`budget`. Shed calls get `fallback()` (a cached or reduced result) when one is given, else a fast 503.
+	A call is always admitted while nothing is running, so one slow call cannot keep the estimate (only
+	updated when a computation finishes) above the budget and shed everything after it.
+	"""
+
+	def __init__(self, name, concurrency=4, queue_size=16, budget=10.0):
+		self.name = name
+		self.concurrency = concurrency
+		self.queue_size = queue_size
+		self.budget = budget
+		self.waiting = 0
+		self.running = 0
+		self.shed = 0
+		self.average_seconds = 0.0
+		self._slots = threading.BoundedSemaphore(concurrency)
+		self._lock = threading.Lock()
+
+	def expected_wait(self):
+		return self.average_seconds * (self.waiting + 1) / self.concurrency
+
+	def admit(self):
+		with self._lock:
+			idle = self.running == 0 and self.waiting == 0
+			if not idle and (self.waiting >= self.queue_size or self.expected_wait() > self.budget):
+				return False
+			self.waiting += 1
+		admitted = False
+		try:
+			admitted = self._slots.acquire(timeout=self.budget)
+			return admitted
+		finally:
+			with self._lock:
+				self.waiting -= 1
+				self.running += admitted
+
+	def run(self, func, fallback=None):
+		if not self.admit():
+			with self._lock:
+				self.shed += 1
+			logger.warning("Shedding %s call (%d waiting, ~%.1fs per call)", self.name, self.waiting, self.average_seconds)
+			if fallback is not None:
+				return fallback()
+			raise Overloaded(retry_after=RETRY_AFTER_SECONDS)
+
+		started = time.monotonic()
+		try:
+			return func()
+		finally:
+			self._slots.release()
+			elapsed = time.monotonic() - started
+			with self._lock:
+				self.running -= 1
+				self.average_seconds = elapsed if not self.average_seconds else 0.8 * self.average_seconds + 0.2 * elapsed
+
+	def status(self):
+		return {'waiting': self.waiting, 'running': self.running, 'shed': self.shed, 'average_seconds': round(self.average_seconds, 3)}
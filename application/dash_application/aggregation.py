@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import pandas as pd
+
+from .metrics import derived_metrics
+from .storage import day_axis
+
+
+# Additive county columns; every group statistic is computed from their sums
+COUNT_COLUMNS = ["TotalCases", "TotalDeaths", "nConfirmed_Change", "nDeaths_Change", "Population"]
+
+
+### GROUP STATISTICS
+def group_statistics(sums):
+	"""
+	All dashboard statistics of (groups x days) summed counts. Rates are ratios of sums, so each county
+	counts in proportion to its population (per-100k rates) or its cases (fatality rate).
+	"""
+	cases, deaths = sums["TotalCases"], sums["TotalDeaths"]
+	new_cases, new_deaths, population = sums["nConfirmed_Change"], sums["nDeaths_Change"], sums["Population"]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		prev_cases, prev_deaths = cases - new_cases, deaths - new_deaths
+		stats = dict(sums,
+			PctPopInfected=np.where(population > 0, cases / population, np.nan).round(4),
+			Infection_per_100k=np.where(population > 0, cases / population * 100000, np.nan).round(2),
+			Deaths_per_100k=np.where(population > 0, deaths / population * 100000, np.nan).round(2),
+			Deaths_per_100_Infections=np.where(cases > 0, deaths / cases * 100, np.nan).round(2),
+			Fatality_Rate=np.where(cases > 0, deaths / cases, 0).round(4),
+			pConfirmed_Change=np.where(prev_cases > 0, new_cases / prev_cases, 0).round(4),
+			pDeaths_Change=np.where(prev_deaths > 0, new_deaths / prev_deaths, 0).round(4),
+		)
+	stats.update({name: values.round(2) for name, values in derived_metrics(cases, new_cases, new_deaths).items()})
+	return stats
+
+
+### AGGREGATOR
+class GroupAggregator:
+	"""
+	County x day arrays of one state's history, built once per dataset version. A county set is a 0/1
+	selection vector over the counties, and its history is one matrix-vector product per column
+	(a matrix product for several sets at once). The named `groups` (e.g. public health districts)
+	are rolled up when the aggregator is built.
+	"""
+
+	def __init__(self, over_time, groups=None):
+		codes, counties = pd.factorize(over_time["County"], sort=True)
+		days = over_time["Day"].to_numpy(dtype=np.int64)
+		n_days = int(days.max())
+
+		self.matrix = {}
+		for column in COUNT_COLUMNS:
+			values = np.zeros((len(counties), n_days))
+			values[codes, days - 1] = over_time[column].to_numpy(dtype=float)
+			self.matrix[column] = values
+		self.setup(counties, n_days, groups)
+
+	def setup(self, counties, n_days, groups):
+		self.counties = counties
+		self.first_day = 1
+		self.n_days = n_days
+		self.index = {county: i for i, county in enumerate(self.counties)}
+		self.groups = dict(groups or {})
+		names = list(self.groups)
+		self.rollups = self.aggregate([self.groups[name] for name in names])
+		self.group_rows = {name: i for i, name in enumerate(names)}
+
+	def members(self, item):
+		"""Counties behind a selector value: a group name expands to its counties."""
+		return self.groups.get(item, [item])
+
+	def selection(self, items):
+		"""0/1 vector over the counties for the union of `items` (a county picked twice still counts once)."""
+		vector = np.zeros(len(self.counties))
+		for item in items:
+			vector[[self.index[county] for county in self.members(item) if county in self.index]] = 1
+		return vector
+
+	def selection_matrix(self, county_sets):
+		matrix = np.zeros((len(county_sets), len(self.counties)))
+		for row, counties in enumerate(county_sets):
+			matrix[row] = self.selection(counties)
+		return matrix
+
+	def sums(self, county_sets):
+		"""{column: (sets x days)} sums of the count columns over each set of selector values."""
+		weights = self.selection_matrix(county_sets)
+		return {column: weights @ values for column, values in self.matrix.items()}
+
+	def aggregate(self, county_sets):
+		"""Statistics of every set of selector values over all days."""
+		return group_statistics(self.sums(county_sets))
+
+	def query(self, items, stat, day_range):
+		"""Same surface as the history stores: one row per selector value (county or group), NaN outside the data."""
+		days = day_axis(day_range)
+		rows = np.full((len(items), len(days)), np.nan)
+		inside = (days >= self.first_day) & (days <= self.n_days)
+		for i, item in enumerate(items):
+			if item in self.group_rows:
+				rows[i, inside] = self.rollups[stat][self.group_rows[item], days[inside] - 1]
+			else:
+				rows[i, inside] = self.aggregate([[item]])[stat][0, days[inside] - 1]
+		return days, rows
+
+	def totals(self, items, day_range):
+		"""Key figures of the union of `items`: counts on the last day, increases over the range, weighted rates."""
+		first_day, last_day = int(day_range[0]), min(int(day_range[1]), self.n_days)
+		stats = self.aggregate([items])
+		window = slice(max(first_day, 0), last_day)
+		return {
+			"TotalCases": stats["TotalCases"][0, last_day - 1],
+			"TotalDeaths": stats["TotalDeaths"][0, last_day - 1],
+			"nConfirmed_Change": stats["nConfirmed_Change"][0, window].sum(),
+			"nDeaths_Change": stats["nDeaths_Change"][0, window].sum(),
+			"Infection_per_100k": stats["Infection_per_100k"][0, last_day - 1],
+			"Fatality_Rate": stats["Fatality_Rate"][0, last_day - 1],
+		}
+
+
+class StoreAggregator(GroupAggregator):
+	"""
+	The same aggregation with the sums computed by a history store (one `GROUP BY Day` query per county set)
+	instead of dense county x day matrices, so memory no longer grows with the history. Used with a history database.
+	"""
+
+	def __init__(self, store, groups=None):
+		self.store = store
+		self.setup(store.counties(), int(store.max_day()), groups)
+
+	def sums(self, county_sets):
+		sums = {column: np.zeros((len(county_sets), self.n_days)) for column in COUNT_COLUMNS}
+		for row, items in enumerate(county_sets):
+			counties = sorted({county for item in items for county in self.members(item) if county in self.index})
+			if counties:
+				for column, values in self.store.sums(counties, COUNT_COLUMNS, [0, self.n_days]).items():
+					sums[column][row] = values
+		return sums
@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import time
+import pickle
+import shutil
+import sqlite3
+import hashlib
+import logging
+import threading
+import functools
+import contextlib
+import datetime as dt
+from collections import OrderedDict
+
+try:
+	import fcntl
+except ImportError:  # not available on Windows; single flight then stays within one process
+	fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+VERSION_CHECK_SECONDS = 30
+MAX_CACHED_RESULTS = 512
+SHARED_CACHE_MB = 256
+
+
+### DATASET VERSION
+_version_lock = threading.Lock()
+_version_state = {'checked_at': 0, 'version': None}
+_version_listeners = []
+
+def on_version_change(callback):
+	"""Calls `callback(version)` whenever `dataset_version` finds the data changed (not on the first check)."""
+	_version_listeners.append(callback)
+
+def data_files(source):
+	if not os.path.isdir(source):
+		return [source]
+	paths = []
+	for root, dirs, names in os.walk(source):
+		dirs[:] = [name for name in dirs if not name.startswith('.')]
+		paths.extend(os.path.join(root, name) for name in names if not name.startswith('.'))
+	return sorted(paths)
+
+def dataset_version(sources, force=False):
+	"""
+	Returns a short digest of the data files in `sources` (paths or directories, walked recursively) and
+	today's date, since the visible day range depends on it. Dotfiles (bookkeeping such as the mirror
+	sync state) are left out. Files are only re-checked every `VERSION_CHECK_SECONDS`.
+	"""
+	with _version_lock:
+		now = time.monotonic()
+		previous = _version_state['version']
+		if not force and previous and now - _version_state['checked_at'] < VERSION_CHECK_SECONDS:
+			return previous
+
+		digest = hashlib.sha1(dt.date.today().isoformat().encode())
+		for source in sources:
+			if not os.path.exists(source):
+				continue
+			for path in data_files(source):
+				stat = os.stat(path)
+				digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+
+		_version_state['checked_at'] = now
+		_version_state['version'] = version = digest.hexdigest()[:12]
+
+	if previous and version != previous:
+		for callback in list(_version_listeners):
+			try:
+				callback(version)
+			except Exception:
+				logger.exception("Data version listener failed")
+	return version
+
+
+### RESULT CACHE
+def freeze(value):
+	"""Normalizes callback inputs (lists, dicts) into hashable cache keys."""
+	if isinstance(value, (list, tuple)):
+		return tuple(freeze(v) for v in value)
+	if isinstance(value, dict):
+		return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+	return value
+
+class ResultCache:
+	"""Thread-safe LRU cache of computed callback results, emptied when the dataset version changes."""
+
+	def __init__(self, maxsize=MAX_CACHED_RESULTS):
+		self.maxsize = maxsize
+		self.version = None
+		self._results = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, version, key):
+		with self._lock:
+			if version != self.version or key not in self._results:
+				return None
+			self._results.move_to_end(key)
+			return self._results[key]
+
+	def set(self, version, key, value):
+		with self._lock:
+			if version != self.version:
+				self._results.clear()
+				self.version = version
+			self._results[key] = value
+			self._results.move_to_end(key)
+			while len(self._results) > self.maxsize:
+				self._results.popitem(last=False)
+
+	def __contains__(self, version_key):
+		version, key = version_key
+		with self._lock:
+			return version == self.version and key in self._results
+
+result_cache = ResultCache()
+
+
+### SHARED RESULT CACHE
+@contextlib.contextmanager
+def transaction(connection):
+	"""An immediate (write-locked) transaction on an autocommit connection, rolled back on error."""
+	connection.execute("BEGIN IMMEDIATE")
+	try:
+		yield
+	except BaseException:
+		connection.execute("ROLLBACK")
+		raise
+	connection.execute("COMMIT")
+
+class SharedCache:
+	"""
+	Second cache tier shared by every worker process on the machine and kept across restarts: one SQLite
+	file of pickled results keyed on the dataset version and `ResultCache` key. Results of other versions
+	are dropped when a new version is first stored, and the least recently used ones are evicted once the
+	file holds more than `max_bytes`. Disabled while `path` is unset; database errors count as misses.
+
+	Hits stay reads: their last-use times are kept in memory and written in batches (every `TOUCH_BATCH`
+	hits or `TOUCH_SECONDS`), so eviction order lags by at most that much. The stored size is a running
+	total in the `totals` row, updated in the same transaction as each write rather than summed every time.
+	"""
+
+	TOUCH_BATCH = 64
+	TOUCH_SECONDS = 10
+
+	def __init__(self, path=None, max_bytes=SHARED_CACHE_MB * 2**20):
+		self.path = path
+		self.max_bytes = max_bytes
+		self.version = None
+		self._connections = {}
+		self._touched = {}
+		self._flushed_at = time.monotonic()
+		self._lock = threading.Lock()
+
+	def connection(self):
+		pid = os.getpid()
+		if pid not in self._connections:
+			connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+			connection.execute("PRAGMA journal_mode = WAL")
+			connection.execute("PRAGMA synchronous = NORMAL")
+			connection.execute("CREATE TABLE IF NOT EXISTS results "
+							   "(key TEXT PRIMARY KEY, version TEXT, value BLOB, size INTEGER, used REAL)")
+			connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+			connection.execute("CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER)")
+			connection.execute("INSERT OR IGNORE INTO totals SELECT 0, COALESCE(SUM(size), 0) FROM results")
+			self._connections = {pid: connection}
+			self._touched = {}
+		return self._connections[pid]
+
+	@staticmethod
+	def digest(key):
+		return hashlib.sha1(repr(key).encode()).hexdigest()
+
+	def get(self, version, key):
+		if not self.path:
+			return None
+		digest = self.digest(key)
+		try:
+			with self._lock:
+				connection = self.connection()
+				row = connection.execute("SELECT value FROM results WHERE key = ? AND version = ?", (digest, version)).fetchone()
+				if row is None:
+					return None
+				self._touched[digest] = time.time()
+				if len(self._touched) >= self.TOUCH_BATCH or time.monotonic() - self._flushed_at >= self.TOUCH_SECONDS:
+					self.flush_touches(connection)
+			return pickle.loads(row[0])
+		except (sqlite3.Error, pickle.UnpicklingError, EOFError):
+			logger.exception("Shared cache read failed")
+			return None
+
+	def set(self, version, key, value):
+		if not self.path:
+			return
+		try:
+			blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+			digest = self.digest(key)
+			with self._lock:
+				connection = self.connection()
+				self.flush_touches(connection)
+				with transaction(connection):
+					if version != self.version:
+						connection.execute("DELETE FROM results WHERE version != ?", (version,))
+						connection.execute("UPDATE totals SET bytes = (SELECT COALESCE(SUM(size), 0) FROM results)")
+					replaced = connection.execute("SELECT size FROM results WHERE key = ?", (digest,)).fetchone()
+					connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+									   (digest, version, blob, len(blob), time.time()))
+					connection.execute("UPDATE totals SET bytes = bytes + ?", (len(blob) - (replaced[0] if replaced else 0),))
+					self.evict(connection)
+				self.version = version
+		except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+			logger.exception("Shared cache write failed")
+
+	def flush_touches(self, connection):
+		"""Writes the batched last-use times of hits (expects `_lock` held)."""
+		touched, self._touched = self._touched, {}
+		self._flushed_at = time.monotonic()
+		if touched:
+			with transaction(connection):
+				connection.executemany("UPDATE results SET used = ? WHERE key = ?", [(used, digest) for digest, used in touched.items()])
+
+	def evict(self, connection):
+		excess = connection.execute("SELECT bytes FROM totals").fetchone()[0] - self.max_bytes
+		if excess <= 0:
+			return
+		stale, freed = [], 0
+		for digest, size in connection.execute("SELECT key, size FROM results ORDER BY used"):
+			stale.append((digest,))
+			freed += size
+			if freed >= excess:
+				break
+		connection.executemany("DELETE FROM results WHERE key = ?", stale)
+		connection.execute("UPDATE totals SET bytes = bytes - ?", (freed,))
+
+shared_cache = SharedCache()
+
+
+### SINGLE FLIGHT
+class _Call:
+	def __init__(self):
+		self.done = threading.Event()
+		self.result = None
+		self.error = None
+
+class SingleFlight:
+	"""
+	Runs at most one computation per key at a time. Callers arriving while it is in flight wait for it
+	and share its result (or exception) instead of computing the same thing again. With `lock_dir` set,
+	the computing thread also holds an exclusive lock file per key, so identical computations in other
+	worker processes on the same machine run one after another rather than all at once. Lock files live
+	in one directory per dataset version; the directories of other versions are removed when a new one
+	is first used, so they do not pile up.
+	"""
+
+	def __init__(self, lock_dir=None):
+		self.lock_dir = lock_dir
+		self.version = None
+		self._calls = {}
+		self._lock = threading.Lock()
+
+	def in_flight(self):
+		with self._lock:
+			return len(self._calls)
+
+	def do(self, key, func, version=None):
+		with self._lock:
+			call = self._calls.get(key)
+			leader = call is None
+			if leader:
+				call = self._calls[key] = _Call()
+
+		if not leader:
+			call.done.wait()
+			if call.error is not None:
+				raise call.error
+			return call.result
+
+		try:
+			call.result = self.locked(key, func, version)
+			return call.result
+		except BaseException as error:
+			call.error = error
+			raise
+		finally:
+			with self._lock:
+				del self._calls[key]
+			call.done.set()
+
+	def version_dir(self, version):
+		directory = os.path.join(self.lock_dir, str(version))
+		if version != self.version:
+			self.version = version
+			for name in os.listdir(self.lock_dir) if os.path.isdir(self.lock_dir) else []:
+				if name != str(version):
+					# A worker still waiting on a removed file only loses the cross-process dedup for the old version
+					shutil.rmtree(os.path.join(self.lock_dir, name), ignore_errors=True)
+		os.makedirs(directory, exist_ok=True)
+		return directory
+
+	def locked(self, key, func, version=None):
+		if not self.lock_dir or fcntl is None:
+			return func()
+		path = os.path.join(self.version_dir(version), hashlib.sha1(repr(key).encode()).hexdigest()[:16] + ".lock")
+		with open(path, "w") as lock_file:
+			fcntl.flock(lock_file, fcntl.LOCK_EX)
+			try:
+				return func()
+			finally:
+				fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+single_flight = SingleFlight()
+
+def memoize(version_func, shared=True):
+	"""
+	Caches a pure function of callback inputs in `result_cache`, keyed on the function name,
+	the normalized arguments and the dataset version returned by `version_func`.
+	Cache misses go through `single_flight`, so concurrent identical calls compute once, and then
+	through `shared_cache` unless `shared` is False (for results that are cheaper to rebuild than to unpickle).
+	"""
+	def decorator(func):
+		@functools.wraps(func)
+		def wrapper(*args):
+			version = version_func()
+			key = (func.__name__, freeze(args))
+			result = result_cache.get(version, key)
+			if result is not None:
+				return result
+
+			def compute():
+				# Another caller may have filled the cache while this one waited for the lock
+				result = result_cache.get(version, key)
+				if result is None and shared:
+					result = shared_cache.get(version, key)
+				if result is None:
+					result = func(*args)
+					if shared:
+						shared_cache.set(version, key, result)
+				result_cache.set(version, key, result)
+				return result
+			return single_flight.do((version, key), compute, version)
+		wrapper.cache_key = lambda *args: (version_func(), (func.__name__, freeze(args)))
+		wrapper.is_cached = lambda *args: wrapper.cache_key(*args) in result_cache
+		return wrapper
+	return decorator
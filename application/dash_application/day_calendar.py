@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import datetime as dt
+import numpy as np
+
+
+# Day 1 of the Georgia outbreak; every `Day` column counts from here
+OUTBREAK_START = np.datetime64("2020-03-02", "D")
+
+
+### DAY <-> DATE
+def day_to_date(days):
+	"""Calendar date(s) of outbreak day(s), as `datetime64[D]`. Works for any day, past or future."""
+	return OUTBREAK_START + (np.asarray(days, dtype=np.int64) - 1)
+
+def date_to_day(dates):
+	"""Outbreak day(s) of date(s): anything numpy can read as a date (strings, `datetime`, `datetime64`, pandas)."""
+	return (np.asarray(dates, dtype="datetime64[D]") - OUTBREAK_START).astype(np.int64) + 1
+
+def today_day(today=None):
+	return int(date_to_day(today or dt.date.today()))
+
+
+### FORMATTING (render time only)
+def format_dates(dates, short_year=False):
+	"""
+	`MM/DD/YYYY` labels for an array of dates (`MM/DD/YY`, i.e. `%x`, with `short_year`, as in the tables),
+	built with numpy string ops rather than per-row `strftime`.
+	"""
+	dates = np.asarray(dates, dtype="datetime64[D]")
+	months = dates.astype("datetime64[M]")
+	years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+	year = np.char.zfill((years % 100).astype(str), 2) if short_year else years.astype(str)
+	month = np.char.zfill((months.astype(np.int64) % 12 + 1).astype(str), 2)
+	day = np.char.zfill(((dates - months).astype(np.int64) + 1).astype(str), 2)
+	return np.char.add(np.char.add(np.char.add(np.char.add(month, "/"), day), "/"), year).tolist()
+
+def format_days(days):
+	return format_dates(day_to_date(days))
+
+def format_day(day):
+	return format_days([day])[0]
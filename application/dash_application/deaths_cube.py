@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import pandas as pd
+
+
+AGE_BAND_WIDTH = 5
+AGE_BAND_MAX = 95
+UNKNOWN = "Unknown"
+
+
+### DEATHS ROLLUP CUBE
+def age_band_labels():
+	labels = [f"{start}-{start + AGE_BAND_WIDTH - 1}" for start in range(0, AGE_BAND_MAX, AGE_BAND_WIDTH)]
+	return labels + [f"{AGE_BAND_MAX}+", UNKNOWN]
+
+def encode(values, labels):
+	"""Integer codes of `values` against the fixed `labels`; anything missing or unlisted maps to 'Unknown'."""
+	codes = pd.Index(labels).get_indexer(values).astype(np.int64)
+	codes[codes < 0] = labels.index(UNKNOWN)
+	return codes
+
+class DeathsCube:
+	"""
+	Death counts from the per-death line list rolled up once into a dense
+	county x age band x gender x underlying condition array with `bincount`.
+	Any filter combination is answered by slicing and summing the array,
+	so query cost depends on the number of dimension values, not on the number of deaths.
+	"""
+
+	DIMENSIONS = ("County", "Age_Band", "Gender", "Underlying")
+
+	def __init__(self, deaths):
+		self.labels = {
+			"County": sorted(set(deaths["County"].dropna().unique()) | {UNKNOWN}),
+			"Age_Band": age_band_labels(),
+			"Gender": ["Female", "Male", UNKNOWN],
+			"Underlying": ["Yes", "No", UNKNOWN],
+		}
+
+		ages = deaths["Age"].to_numpy(dtype=float)
+		age_codes = np.where(np.isnan(ages), len(self.labels["Age_Band"]) - 1,
+							 np.minimum(np.nan_to_num(ages) // AGE_BAND_WIDTH, AGE_BAND_MAX // AGE_BAND_WIDTH)).astype(np.int64)
+		codes = [
+			encode(deaths["County"], self.labels["County"]),
+			age_codes,
+			encode(deaths["Gender"], self.labels["Gender"]),
+			encode(deaths["Underlying"].replace({"Unk": UNKNOWN}), self.labels["Underlying"]),
+		]
+
+		self.shape = tuple(len(self.labels[dim]) for dim in self.DIMENSIONS)
+		flat = np.ravel_multi_index(codes, self.shape)
+		self.counts = np.bincount(flat, minlength=int(np.prod(self.shape))).reshape(self.shape)
+		self.total = int(self.counts.sum())
+
+	def indices(self, dim, values):
+		if values is None:
+			return np.arange(len(self.labels[dim]))
+		lookup = {label: i for i, label in enumerate(self.labels[dim])}
+		return np.array(sorted(lookup[value] for value in values if value in lookup), dtype=np.int64)
+
+	def counts_by(self, by, **filters):
+		"""
+		Deaths per value of dimension `by`, filtered on the other dimensions, e.g.
+		`counts_by("Age_Band", County=["Fulton"], Gender=["Male"])`. A filter on `by` itself is ignored
+		so each chart shows its full breakdown under the other selections.
+		"""
+		selection = np.ix_(*[
+			np.arange(size) if dim == by else self.indices(dim, filters.get(dim))
+			for dim, size in zip(self.DIMENSIONS, self.shape)
+		])
+		axis = self.DIMENSIONS.index(by)
+		other_axes = tuple(i for i in range(len(self.DIMENSIONS)) if i != axis)
+		counts = self.counts[selection].sum(axis=other_axes)
+		return pd.Series(counts, index=self.labels[by], name="Deaths")
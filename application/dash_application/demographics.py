@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import numpy as np
+import pandas as pd
+
+from .day_calendar import format_dates
+
+
+# Series pivoted from merged/categories: name -> (file, group column, value column)
+CATEGORY_SERIES = {
+	'age_cases': ('Age_all.csv', 'Ages', 'Ages_Total'),
+	'age_deaths': ('Age_all.csv', 'Ages', 'Ages_Death_Total'),
+	'gender_cases': ('Gender_all.csv', 'Gender', 'Gender_Num'),
+	'gender_deaths': ('Gender_all.csv', 'Gender', 'nDeaths'),
+	'race_cases': ('Race_all.csv', 'Race', 'Cases'),
+	'tests_total': ('Testing_all.csv', 'LabType', 'TotalTests'),
+	'tests_positive': ('Testing_all.csv', 'LabType', 'PositiveTests'),
+	'summary': ('Summary_all.csv', 'Confirmed', 'TotalCases'),
+}
+
+# Views offered in the dashboard: value -> (label, series, transform)
+DEMOGRAPHIC_VIEWS = {
+	'positivity': ("Test Positivity (%)", 'tests_positive', 'positivity'),
+	'tests': ("Tests Completed by Lab Type", 'tests_total', 'count'),
+	'age_share': ("Age Group Share of Cases (%)", 'age_cases', 'share'),
+	'age_death_share': ("Age Group Share of Deaths (%)", 'age_deaths', 'share'),
+	'gender_cases': ("Cases by Gender", 'gender_cases', 'count'),
+	'gender_deaths': ("Deaths by Gender", 'gender_deaths', 'count'),
+	'race_share': ("Race Share of Cases (%)", 'race_cases', 'share'),
+	'summary': ("Total Cases, Hospitalizations and Deaths", 'summary', 'count'),
+}
+
+# Group labels that changed between report formats
+GROUP_ALIASES = {"Black Or African American": "Black", "U": "Unknown"}
+
+
+### SNAPSHOT DATES
+def snapshot_window(split_dir):
+	"""First and last report dates from the `split/<MMDDYYYY>` folder names."""
+	dates = pd.to_datetime([name for name in os.listdir(split_dir) if name.isdigit()], format="%m%d%Y")
+	return dates.min(), dates.max()
+
+def normalize_dates(dates, window):
+	"""
+	Report dates with the time dropped. Some merged rows were parsed day-first (04/05 became 05/04);
+	dates outside the report window whose swapped month/day falls inside it are swapped back.
+	"""
+	dates = pd.to_datetime(dates).dt.normalize()
+	first, last = window
+	outside = (dates < first) | (dates > last)
+	swapped = pd.to_datetime({
+		'year': dates.dt.year,
+		'month': dates.dt.day.where(dates.dt.day <= 12, dates.dt.month),
+		'day': dates.dt.month,
+	}, errors='coerce')
+	fix = outside & (dates.dt.day <= 12) & swapped.between(first, last)
+	return dates.where(~fix, swapped)
+
+
+### PRE-PIVOTED SERIES
+class CategorySeries:
+	"""One category's history pivoted once into a (dates x groups) array."""
+
+	def __init__(self, dates, groups, values):
+		self.dates = dates
+		self.groups = groups
+		self.values = values
+
+	@classmethod
+	def from_frame(cls, df, group, value, window):
+		df = df.dropna(subset=["Date", group])
+		df = df.assign(Date=normalize_dates(df["Date"], window), **{group: df[group].astype(str).str.strip().replace(GROUP_ALIASES)})
+		table = df.pivot_table(index="Date", columns=group, values=value, aggfunc="last").sort_index()
+		return cls(format_dates(table.index), table.columns.tolist(), table.to_numpy(dtype=float))
+
+	def view(self, transform, other=None):
+		"""Returns the (groups, values) lines for `transform`: 'count', 'share' (% of row total) or 'positivity' (% of `other`)."""
+		with np.errstate(divide="ignore", invalid="ignore"):
+			if transform == 'share':
+				totals = np.nansum(self.values, axis=1, keepdims=True)
+				return self.groups, np.where(totals > 0, self.values / totals * 100, np.nan).round(2)
+			if transform == 'positivity':
+				rates = np.where(other.values > 0, self.values / other.values * 100, np.nan)
+				overall = np.nansum(self.values, axis=1) / np.nansum(other.values, axis=1) * 100
+				return self.groups + ["All Labs"], np.column_stack([rates, overall]).round(2)
+		return self.groups, self.values
+
+def race_cases(df, window):
+	"""
+	Cases per report date and race. Race_all mixes per-ethnicity breakdown rows (`Cases`) with the older
+	per-race totals rows (`Race_Num`), and some dates have both: a date's summed breakdown is used when it
+	has one and its totals only otherwise, so no case is counted twice. Rows repeated by several snapshots
+	of the same day count once (the last one).
+	"""
+	df = df.dropna(subset=["Date", "Race"])
+	df = df.assign(Date=normalize_dates(df["Date"], window), Race=df["Race"].astype(str).str.strip().replace(GROUP_ALIASES))
+	breakdown = df[df["Cases"].notna()].drop_duplicates(["Date", "Ethnicity", "Race"], keep="last")
+	totals = df[df["Race_Num"].notna() & ~df["Date"].isin(breakdown["Date"])].drop_duplicates(["Date", "Race"], keep="last")
+	return pd.concat([
+		breakdown.groupby(["Date", "Race"], as_index=False)["Cases"].sum(),
+		totals[["Date", "Race", "Race_Num"]].rename(columns={"Race_Num": "Cases"}),
+	], ignore_index=True)
+
+def load_category_series(categories_dir, window):
+	series = {}
+	frames = {}
+	for name, (filename, group, value) in CATEGORY_SERIES.items():
+		if filename not in frames:
+			frames[filename] = pd.read_csv(os.path.join(categories_dir, filename))
+		df = frames[filename]
+		if filename == 'Race_all.csv':
+			df = race_cases(df, window)
+		series[name] = CategorySeries.from_frame(df, group, value, window)
+	return series
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Figure building without `plotly.graph_objects`: traces and layouts are emitted as plain dicts in the
+same canonical form `go.Scatter(...).to_plotly_json()` / `go.Layout(...)` would produce, skipping
+property validation. Layout templates are read-only; each figure gets its own shallow copy.
+`benchmarks/figure_builder.py` checks the output against the Plotly objects.
+"""
+
+from types import MappingProxyType
+import numpy as np
+
+
+def frozen(mapping):
+	return MappingProxyType({key: frozen(value) if isinstance(value, dict) else value for key, value in mapping.items()})
+
+def thaw(mapping):
+	return {key: thaw(value) if isinstance(value, MappingProxyType) else value for key, value in mapping.items()}
+
+
+### LAYOUT TEMPLATES
+BASE_LAYOUT = frozen(dict(
+	autosize=True,
+	margin=dict(l=30, r=30, b=20, t=40),
+	hovermode="closest",
+	plot_bgcolor="#F9F9F9",
+	paper_bgcolor="#F9F9F9",
+	legend=dict(font=dict(size=10), orientation="h", valign='middle'),
+))
+STACKED_BAR_LAYOUT = frozen(dict(thaw(BASE_LAYOUT), barmode="stack"))
+COUNT_LAYOUT = frozen(dict(thaw(BASE_LAYOUT), barmode="stack", dragmode="select", showlegend=True))
+
+# Main graph rendering: WebGL line traces above this many counties, and at most this many points per trace
+# (about the graph's width in pixels; longer histories are downsampled)
+WEBGL_TRACE_THRESHOLD = 20
+MAX_POINTS = 1000
+
+COUNT_HOVERTEMPLATE = '''<b>Date</b>: %{customdata}</b><br><b>Day of Outbreak</b>: %{text}<br>
+	<br><b>Location</b>: %{meta}<br><b>Value:</b>: %{y}<extra></extra>'''
+
+
+### BUILDERS
+def layout(template=BASE_LAYOUT, title=None, xaxis_title=None, yaxis_title=None, **overrides):
+	"""A fresh layout dict from `template`; titles are written in Plotly's `{'text': ...}` form."""
+	figure_layout = thaw(template)
+	if title is not None:
+		figure_layout["title"] = {"text": title}
+	if xaxis_title is not None:
+		figure_layout["xaxis"] = {"title": {"text": xaxis_title}}
+	if yaxis_title is not None:
+		figure_layout["yaxis"] = {"title": {"text": yaxis_title}}
+	figure_layout.update(overrides)
+	return figure_layout
+
+def trace(trace_type, x, y, name=None, color=None, **props):
+	spec = {"type": trace_type, "x": x, "y": y}
+	if name is not None:
+		spec["name"] = name
+	if color is not None:
+		spec["marker"] = {"color": color}
+	spec.update(props)
+	return spec
+
+def scatter(x, y, name=None, color=None, mode="lines+markers", **props):
+	return trace("scatter", x, y, name, color, mode=mode, **props)
+
+def bar(x, y, name=None, color=None, **props):
+	return trace("bar", x, y, name, color, **props)
+
+def figure(data, figure_layout):
+	return {"data": list(data), "layout": figure_layout}
+
+### DOWNSAMPLING
+def lttb_indices(x, y, n_out):
+	"""
+	Largest-Triangle-Three-Buckets downsampling of every row of `y` (series x points) at once: the indices of
+	`n_out` points per row that keep the shape of the series, always including the first and last point.
+	The next-bucket averages are computed up front; only the anchor walk runs bucket by bucket, vectorized
+	across the rows. NaN points are only picked when a bucket has nothing else.
+	"""
+	rows, n = y.shape
+	if n_out is None or n_out >= n or n_out < 3:
+		return np.broadcast_to(np.arange(n), (rows, n))
+	x = np.asarray(x, dtype=float)
+	valid = ~np.isnan(y)
+	filled = np.where(valid, y, 0.0)
+	edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+	# Average point of the bucket after each bucket (the last one's is the final point)
+	next_x = np.add.reduceat(x, edges[1:]) / np.diff(np.append(edges[1:], n))
+	with np.errstate(invalid="ignore", divide="ignore"):
+		next_y = np.add.reduceat(filled, edges[1:], axis=1) / np.add.reduceat(valid, edges[1:], axis=1)
+
+	indices = np.empty((rows, n_out), dtype=np.int64)
+	indices[:, 0], indices[:, -1] = 0, n - 1
+	anchor = np.zeros(rows, dtype=np.int64)
+	row = np.arange(rows)
+	with np.errstate(invalid="ignore"):
+		for bucket in range(n_out - 2):
+			start, end = edges[bucket], edges[bucket + 1]
+			anchor_x, anchor_y = x[anchor][:, None], y[row, anchor][:, None]
+			area = np.abs((anchor_x - next_x[bucket]) * (y[:, start:end] - anchor_y)
+						  - (anchor_x - x[start:end]) * (next_y[:, bucket:bucket + 1] - anchor_y))
+			anchor = start + np.nan_to_num(area, nan=-1.0).argmax(axis=1)
+			indices[:, bucket + 1] = anchor
+	return indices
+
+
+def count_traces(counties, days, date_text, values, colors, max_points=MAX_POINTS, webgl_threshold=WEBGL_TRACE_THRESHOLD):
+	"""
+	Line and bar traces of the main graph over `days`, one per county (row of `values`). Above `webgl_threshold`
+	counties the lines are drawn with WebGL. Histories longer than `max_points` are downsampled with LTTB: each
+	line on its own, the stacked bars together on the shape of their total so the stacks stay aligned.
+	Pass None to turn either off.
+	"""
+	line_type = "scattergl" if webgl_threshold is not None and len(counties) > webgl_threshold else "scatter"
+	if max_points is None or len(days) <= max_points:
+		day_text = [str(day) for day in days]
+		lines, bars = [], []
+		for i, county in enumerate(counties):
+			hover = dict(customdata=date_text, text=day_text, meta=county, hoverlabel={'align': 'left'}, hovertemplate=COUNT_HOVERTEMPLATE)
+			lines.append(trace(line_type, days, values[i], county, colors[i % len(colors)], mode="lines+markers", **hover))
+			bars.append(bar(days, values[i], county, colors[i % len(colors)], **hover))
+		return lines, bars
+
+	days, date_text = np.asarray(days), np.asarray(date_text)
+	day_text = days.astype(str)
+	line_points = lttb_indices(days, values, max_points)
+	bar_points = lttb_indices(days, np.nansum(values, axis=0)[None, :], max_points)[0]
+	bar_hover = dict(customdata=date_text[bar_points].tolist(), text=day_text[bar_points].tolist())
+	bar_days = days[bar_points].tolist()
+	lines, bars = [], []
+	for i, county in enumerate(counties):
+		points = line_points[i]
+		hover = dict(meta=county, hoverlabel={'align': 'left'}, hovertemplate=COUNT_HOVERTEMPLATE)
+		lines.append(trace(line_type, days[points].tolist(), values[i, points], county, colors[i % len(colors)], mode="lines+markers",
+						   customdata=date_text[points].tolist(), text=day_text[points].tolist(), **hover))
+		bars.append(bar(bar_days, values[i, bar_points], county, colors[i % len(colors)], **bar_hover, **hover))
+	return lines, bars
@@ -3,11 +3,9 @@
 
 import sys
 import os
+import threading
 import pandas as pd
 import numpy as np
-import datetime as dt
-import copy
-import geopandas as gpd
 import plotly.graph_objects as go
 import plotly.figure_factory as ff
 import dash
@@ -16,7 +14,7 @@ import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output, State, ClientsideFunction
 from dash.exceptions import PreventUpdate
-import plotly.express as px
+from flask import jsonify
 
 
 cwd = os.getcwd()
@@ -26,20 +24,99 @@ styles_dir = f'/{cwd}/application/static/css'
 sys.path.insert(0, data_dir)
 sys.path.insert(0, styles_dir)
 
-from mappings import ALL_COUNTIES, LIST_OF_COLORS, COLORS, DAY_DICT, DATE_DICT, LABEL_STATS, BAR_STATS
+from mappings import ALL_COUNTIES, HEALTH_DISTRICTS, STATE_NAMES, COLORS, LABEL_STATS, BAR_STATS
+from .metrics import add_derived_metrics
+from .cache import dataset_version, on_version_change, memoize, single_flight, shared_cache
+from .warmer import CacheWarmer, PRESET_GROUPS, PRESET_TABS
+from .regions import RegionStore, HOME_STATE, state_totals
+from .deaths_cube import DeathsCube
+from .demographics import DEMOGRAPHIC_VIEWS, load_category_series, snapshot_window
+from .snapshots import SnapshotDiffEngine, SNAPSHOT_KEYS, snapshot_label
+from .storage import MemoryStore, SQLiteStore, STATE_ROW
+from .aggregation import GroupAggregator, StoreAggregator
+from .day_calendar import today_day, format_dates, format_days, format_day
+from .serialization import install as install_serializer
+from .admission import AdmissionGate
+from .figures import BASE_LAYOUT, STACKED_BAR_LAYOUT, COUNT_LAYOUT, layout as figure_layout, scatter, bar, figure, count_traces
 
 
 ######################  DATA & ADDITIONAL ANALYSIS  ###################### 
+snapshot_dir = f'{data_dir}/split/05032020/PM'
+region_dir = f'{data_dir}/regions'
+categories_dir = f'{data_dir}/merged/categories'
+split_dir = f'{data_dir}/split'
+data_sources = [f'{data_dir}/merged/ga_90days.csv', f'{data_dir}/merged/georgia_pm.csv', snapshot_dir, region_dir, categories_dir, split_dir]
+
+# Columns (and types) of the county history shown in the interactive table
+COUNTY_COLUMNS = {"Date":'datetime64[ns]', "Day":'int64', "County": 'object', "TotalCases":'int64', 
+					"nConfirmed_Change": 'int64', "nDeaths_Change": 'int64', 
+					"TotalDeaths": 'int64', "Infection_per_100k": 'int64', "Deaths_per_100k": 'int64', 
+					"PctPopInfected": 'float64', "Fatality_Rate":"float64", "Population":'int64'}
+
+def current_version():
+	return dataset_version(data_sources)
+
+def most_recent_day():
+	return today_day() - 1
+
+def latest_day():
+	"""Last day with statewide figures, i.e. the end of the day slider."""
+	return int(get_datasets()['ga_time']["Day"].max())
+
+def version_view():
+	"""Flask view polled by open dashboards: only the current data version, never cached."""
+	response = jsonify(version=current_version())
+	response.headers['Cache-Control'] = 'no-store'
+	return response
+
+def prepare_county_history(over_time, most_recent):
+	"""
+	Trims a raw county history (`ga_90days.csv` layout) to `most_recent`, or to its last day with reported cases
+	when that comes first (the file is padded with all-zero rows up to day 90), cleans it and adds the derived stats.
+	"""
+	reported = over_time["Day"].where(over_time["TotalCases"] > 0).max()
+	if pd.notna(reported):
+		most_recent = min(most_recent, int(reported))
+	over_time = over_time[over_time["Day"].between(1, most_recent)].copy()
+	over_time = over_time.replace([np.inf, -np.inf], np.nan).fillna(0).astype(COUNTY_COLUMNS)
+	return add_derived_metrics(over_time, "County")
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
 def get_datasets():
-	ga_covid_data_repo = 'https://raw.githubusercontent.com/briannaleilani/georgia_covid_cases/master/ga_data/output'
-	datadir = f'{data_dir}/split/05032020/PM'
+	"""
+	Returns the loaded datasets, reloading them only when the dataset version changes.
+	A reload builds a new dict and swaps it in, so threads still holding the old one never see it half-replaced.
+	Callers must treat the frames as read-only.
+	"""
+	global _datasets
+	version = current_version()
+	if _datasets.get('version') != version:
+		with _datasets_lock:
+			if _datasets.get('version') != version:
+				data = load_datasets()
+				data['version'] = version
+				_datasets = data
+	return _datasets
+
+def load_datasets():
+	datadir = snapshot_dir
 
-	over_time = pd.read_csv(f'{data_dir}/merged/ga_90days.csv', parse_dates=['Date'])
 	ga_time = pd.read_csv(f'{data_dir}/merged/georgia_pm.csv', parse_dates=['Date'])
-
-	yesterday = (pd.Timestamp.today() - dt.timedelta(days=1)).strftime("%m/%d/%Y")
-	most_recent = DAY_DICT[yesterday]
-	over_time = over_time[over_time["Day"].between(1, most_recent)]
+	ga_time = add_derived_metrics(ga_time)
+
+	if history_db:
+		# The county history stays in the database: only each county's latest row is loaded
+		store = SQLiteStore(history_db, HOME_STATE)
+		over_time = None
+		latest = store.latest().astype(COUNTY_COLUMNS)
+		aggregator = StoreAggregator(store, HEALTH_DISTRICTS)
+	else:
+		over_time = pd.read_csv(f'{data_dir}/merged/ga_90days.csv', parse_dates=['Date'])
+		over_time = prepare_county_history(over_time, most_recent_day())
+		latest = over_time[over_time["Day"] == over_time["Day"].max()]
+		aggregator = GroupAggregator(over_time, HEALTH_DISTRICTS)
 
 	age = pd.read_csv(f"{datadir}/Age_05032020_PM.csv", parse_dates=['Date'])
 	deaths = pd.read_csv(f"{datadir}/Deaths_05032020_PM.csv", parse_dates=['Date'])
@@ -48,27 +125,17 @@ def get_datasets():
 	testing = pd.read_csv(f"{datadir}/Testing_05032020_PM.csv", parse_dates=['Date'])
 	race = pd.read_csv(f"{datadir}/Race_05032020_PM.csv", parse_dates=['Date'])
 
-	ga_dfs = [age, deaths, gender, summary, testing, over_time, ga_time, race]
-
-	for df in ga_dfs:
-		df["Date"] = df["Date"].dt.strftime("%x")
-
 	## Prepare interactive table
-	columns_to_show = {"Date":'object', "Day":'int64', "County": 'object', "TotalCases":'int64', 
-						"nConfirmed_Change": 'int64', "nDeaths_Change": 'int64', 
-	                   "TotalDeaths": 'int64', "Infection_per_100k": 'int64', "Deaths_per_100k": 'int64', 
-	                   "PctPopInfected": 'float64', "Fatality_Rate":"float64", "Population":'int64'}
-	over_time = over_time.replace([np.inf, -np.inf], np.nan).fillna(0).astype(columns_to_show)
-	display_table = over_time[columns_to_show.keys()]
-	display_table.rename(columns={
+	display_table = latest[list(COUNTY_COLUMNS)].rename(columns={
 	                        "TotalCases": "Cases",
 	                        "TotalDeaths": "Deaths",
 	                        "Infection_per_100k": "CasesPer100kPop",
 	                        "Deaths_per_100k": "DeathsPer100kPop",
 	                        "nConfirmed_Change": "DailyCaseChange",
 	                        "nDeaths_Change": "DailyDeathsChange"
-	                    }, inplace=True)
-	display_table = display_table[display_table["Day"] == display_table["Day"].max()].reset_index(drop=True)
+	                    })
+	display_table = display_table.reset_index(drop=True)
+	display_table["Date"] = format_dates(display_table["Date"], short_year=True)
 
 	data = {
 		'over_time': over_time, 
@@ -80,23 +147,84 @@ def get_datasets():
 		'testing': testing,
 		'race': race,
 		'display_table': display_table,
-		'ga_dfs': ga_dfs
+		'deaths_cube': DeathsCube(deaths),
+		'group_aggregator': aggregator,
+		'category_series': load_category_series(categories_dir, snapshot_window(split_dir)),
 	}
 
 	return data
 
+def load_region(path):
+	over_time = prepare_county_history(pd.read_csv(path, parse_dates=['Date']), most_recent_day())
+	return {'over_time': over_time, 'state_time': state_totals(over_time)}
+
+region_store = RegionStore(region_dir, load_region)
+snapshot_engine = SnapshotDiffEngine(split_dir)
+history_db = None
+# Callback class -> AdmissionGate, set up in Add_Dash
+admission_gates = {}
+
+def region_data(state=HOME_STATE):
+	"""
+	County and statewide history for `state`. Georgia is always loaded; other states are loaded on first use.
+	With a history database only the statewide history is held in memory ('over_time' is None):
+	county rows are read through `history_store`.
+	"""
+	if state == HOME_STATE:
+		data = get_datasets()
+		return {'over_time': data['over_time'], 'state_time': data['ga_time']}
+	if history_db:
+		return {'over_time': None, 'state_time': stored_state_history(state)}
+	return region_store.get(state, current_version())
+
+@memoize(current_version, shared=False)
+def stored_state_history(state):
+	return SQLiteStore(history_db, state).state_history()
+
+def history_store(state=HOME_STATE):
+	"""Query surface over `state`'s history: the SQLite database when one is configured, else the loaded frames."""
+	if history_db:
+		return SQLiteStore(history_db, state)
+	data = region_data(state)
+	return MemoryStore(data['over_time'], data['state_time'])
+
+@memoize(current_version, shared=False)
+def group_aggregator(state=HOME_STATE):
+	"""County-set aggregation over `state`'s history; Georgia's comes with its public health districts rolled up."""
+	if state == HOME_STATE:
+		return get_datasets()['group_aggregator']
+	if history_db:
+		return StoreAggregator(history_store(state))
+	return GroupAggregator(region_data(state)['over_time'])
+
+def selection_history(items, stat, day_range, state=HOME_STATE):
+	"""(days, values) of `stat` for selector values (counties, 'All Counties' or district names), one row each."""
+	days, values = history_store(state).query(items, stat, day_range)
+	aggregator = group_aggregator(state)
+	groups = [i for i, item in enumerate(items) if item in aggregator.groups]
+	if groups:
+		values[groups] = aggregator.query([items[i] for i in groups], stat, day_range)[1]
+	return days, values
+
+def region_county_options(state=HOME_STATE):
+	if state == HOME_STATE:
+		districts = [{"label": district, "value": district} for district in HEALTH_DISTRICTS]
+		return districts + [{"label": str(ALL_COUNTIES[county]), "value": str(county)} for county in ALL_COUNTIES]
+	return [{"label": county, "value": county} for county in history_store(state).counties()]
+
 def options_and_controls():
 	data = get_datasets()
 
-	over_time = data['over_time']
 	ga_time = data['ga_time']
 
 	georgia_only = [{"label": "All Counties", "value": "All Counties"}]
 
-	county_options = [{"label": str(ALL_COUNTIES[county]), "value": str(county)} for county in ALL_COUNTIES]
+	county_options = region_county_options()
 
 	stat_options = [{"label": str(value), "value":str(key)} for key, value in LABEL_STATS.items()]
-	bar_stat_options = [{"label": str(value[0]), "value":str(key), "disabled": value[1]} for key, value in LABEL_STATS.items()] 
+	bar_stat_options = [{"label": str(value[0]), "value":str(key), "disabled": value[1]} for key, value in BAR_STATS.items()]
+	state_options = [{"label": STATE_NAMES.get(state, state), "value": state}
+					 for state in sorted(set([HOME_STATE] + region_store.available()))]
 
 	# # Control for slider
 	min_day = ga_time["Day"].min()
@@ -105,49 +233,40 @@ def options_and_controls():
 	days.append(str(max_day))
 	day_options = {days[i]: days[i] for i in range(len(days))} 
 
-	layout = dict(
-		autosize=True,
-		# automargin=True,
-		margin=dict(l=30, r=30, b=20, t=40),
-		hovermode="closest",
-		plot_bgcolor="#F9F9F9",
-		paper_bgcolor="#F9F9F9",
-		legend=dict(font=dict(size=10), orientation="h", valign='middle'),
-	)
+	layout = figure_layout(BASE_LAYOUT)
 	
 	options = {
 		'georgia_only':georgia_only,
 		'county_options':county_options,
 		'day_options': day_options,
 		'stat_options': stat_options,
-		'bar_stat_options': bar_stat_options
+		'bar_stat_options': bar_stat_options,
+		'state_options': state_options
 	}
 
 	controls = {
 		'min_day': min_day,
 		'max_day': max_day,
-		'min_date': DATE_DICT[min_day],
-		'max_date': DATE_DICT[max_day]
+		'min_date': format_day(min_day),
+		'max_date': format_day(max_day)
 	}
 
 	return options, controls, layout
 
 ####################################  Static Plots  #################################### 
 
-## Map of Georgia
-def make_ga_map():
-	data = get_datasets()
-	# [counties, summary] = destructure(data, 'over_time')
-	over_time = data['over_time']
-	values = over_time['TotalCases'].tolist()
-	fips = over_time['fips'].tolist()
+## Map of Georgia (or any loaded state)
+def make_ga_map(state=HOME_STATE):
+	latest = history_store(state).latest()
+	values = latest['TotalCases'].tolist()
+	fips = latest['fips'].tolist()
 
 	endpts = list(np.mgrid[min(values):max(values):4j])
 	colorscale = ["#030512","#1d1d3b","#323268","#3d4b94","#3e6ab0",
 				  "#4989bc","#60a7c7","#85c5d3","#b7e0e4","#eafcfd"]
 
 	ga_map = ff.create_choropleth(
-		fips=fips, values=values, scope=['Georgia'], show_state_data=True,
+		fips=fips, values=values, scope=[STATE_NAMES[state]], show_state_data=True,
 		colorscale=colorscale, binning_endpoints=endpts, round_legend_values=True,
 		plot_bgcolor='rgb(229,229,229)',
 		paper_bgcolor='rgb(229,229,229)',
@@ -158,60 +277,45 @@ def make_ga_map():
 
 ## Bar Plot Layout Function
 def make_stacked_bar_plot(data,title,xaxis_title,yaxis_title):
-	options, conrols, layout = options_and_controls()
-	bar_layout = copy.deepcopy(layout)
-	# bar_layout = dict(
-		# legend=dict(valign='middle', orientation='h', x=0, y=-0.2),
-		# font=dict(size=10, color=COLORS['dark_grey']),
-		# barmode="stack",
-		# )
-	bar_layout["barmode"] = "stack"
-	# bar_layout["height"] = 600
-	bar_layout["title"] = title
-	bar_layout["xaxis_title"] = xaxis_title
-	bar_layout["yaxis_title"] = yaxis_title
-	data=data
-	figure = dict(data=data, layout=bar_layout)
-	return figure
+	return figure(data, figure_layout(STACKED_BAR_LAYOUT, title, xaxis_title, yaxis_title))
 
 # Age Table for Display
 def age_table():
 	data = get_datasets()
-	age = data['age']
-	age.fillna(0, inplace=True)
+	age = data['age'].fillna(0)
+	age["Date"] = format_dates(data['age']["Date"], short_year=True)
 	age["Ages_Total"] = age["Ages_Total"].round().astype(int)
 	age["Ages_Infected_Total"] = age["Ages_Infected_Total"].round().astype(int)
 	age["Ages_Death_Total"] = age["Ages_Death_Total"].round().astype(int)
-	age.rename(columns={"Ages_Total": "Total", "Ages_Pct": "Pct", "Ages_Infected_Total": "TotalInfected",
-					   "Ages_Inf_Pct": "PctInfected", "Ages_Death_Total": "TotalDeaths", "Ages_Death_Pct": "PctDeaths"}, inplace=True)
-	return age
+	return age.rename(columns={"Ages_Total": "Total", "Ages_Pct": "Pct", "Ages_Infected_Total": "TotalInfected",
+					   "Ages_Inf_Pct": "PctInfected", "Ages_Death_Total": "TotalDeaths", "Ages_Death_Pct": "PctDeaths"})
 
 # Gender Table for Display
 def gender_table():
 	data = get_datasets()
-	gender = data['gender']
-	gender.fillna(0, inplace=True)
+	gender = data['gender'].fillna(0)
+	gender["Date"] = format_dates(data['gender']["Date"], short_year=True)
 	gender["Gender_Num"] = gender["Gender_Num"].round().astype(int)
 	gender["nDeaths"] = gender["nDeaths"].round().astype(int)
 	gender["PctDeaths"] = round(gender["nDeaths"] / gender["nDeaths"].sum(),3)
-	gender.rename(columns={"Gender_Num": "TotalSurvived", "Gender_Pct": "PctSurvived", "nDeaths": "TotalDeaths"}, inplace=True)
+	gender = gender.rename(columns={"Gender_Num": "TotalSurvived", "Gender_Pct": "PctSurvived", "nDeaths": "TotalDeaths"})
 	gender = gender[["Gender", "TotalSurvived", "PctSurvived", "TotalDeaths", "PctDeaths", "Date"]]
 	return gender
 
 # Testing Table for Display
 def testing_table():
 	data = get_datasets()
-	testing = data['testing']
+	testing = data['testing'].copy()
+	testing["Date"] = format_dates(testing["Date"], short_year=True)
 	testing["NegativeTests"] = testing["TotalTests"] - testing["PositiveTests"]
 	testing = testing[["LabType", "TotalTests", "PositiveTests", "NegativeTests", "Date"]]
-	testing.rename(columns={"TotalTests": "Total", "PositiveTests": "Positive", "NegativeTests": "Negative"}, inplace=True)
-	return testing
+	return testing.rename(columns={"TotalTests": "Total", "PositiveTests": "Positive", "NegativeTests": "Negative"})
 
 ## Age Bar Plot
 def age_bar_plot(age):
 	age_data=[
-		go.Bar(name='Confirmed Cases', x=age["Ages"], y=age["Total"], marker=dict(color = COLORS["dark_blue"])),
-		go.Bar(name='Confirmed Deaths', x=age["Ages"], y=age["TotalDeaths"], marker=dict(color = COLORS["dark_yellow"]))
+		bar(age["Ages"].tolist(), age["Total"].tolist(), 'Confirmed Cases', COLORS["dark_blue"]),
+		bar(age["Ages"].tolist(), age["TotalDeaths"].tolist(), 'Confirmed Deaths', COLORS["dark_yellow"])
 		]
 	age_bar_plot = make_stacked_bar_plot(age_data, "GA Confirmed COVID-19 Cases by Age Group", "Age Group", "Number of Cases")
 	return age_bar_plot
@@ -219,8 +323,8 @@ def age_bar_plot(age):
 ## Gender Bar Plot
 def gender_bar_plot(gender):
 	gender_data=[
-		go.Bar(name='Confirmed Cases', x=gender["Gender"], y=gender["TotalSurvived"], marker=dict(color = COLORS["dark_blue"])),
-		go.Bar(name='Confirmed Deaths', x=gender["Gender"], y=gender["TotalDeaths"], marker=dict(color = COLORS["dark_yellow"]))
+		bar(gender["Gender"].tolist(), gender["TotalSurvived"].tolist(), 'Confirmed Cases', COLORS["dark_blue"]),
+		bar(gender["Gender"].tolist(), gender["TotalDeaths"].tolist(), 'Confirmed Deaths', COLORS["dark_yellow"])
 		]
 	gender_bar_plot = make_stacked_bar_plot(gender_data, "GA Confirmed COVID-19 Cases by Gender", "Gender", "Number of Cases")
 	return gender_bar_plot
@@ -228,8 +332,8 @@ def gender_bar_plot(gender):
 ## Testing Bar Chart
 def testing_bar_plot(testing):
 	testing_data=[
-		go.Bar(name='Negative Tests', x=testing["LabType"], y=testing["Negative"], marker=dict(color = COLORS["dark_blue"])),
-		go.Bar(name='Positive Tests', x=testing["LabType"], y=testing["Positive"], marker=dict(color = COLORS["dark_yellow"]))
+		bar(testing["LabType"].tolist(), testing["Negative"].tolist(), 'Negative Tests', COLORS["dark_blue"]),
+		bar(testing["LabType"].tolist(), testing["Positive"].tolist(), 'Positive Tests', COLORS["dark_yellow"])
 		]
 	testing_plot = make_stacked_bar_plot(testing_data, "GA COVID-19 Testing", "Lab Type", "Number of Tests Completed")
 	return testing_plot
@@ -261,18 +365,87 @@ def make_race_pie_chart():
 	)
 	return race_plot
 
-# Set up layout for application 
-def application_layout():
+## Lazily rendered tab contents
+# Chart and data sub-tabs of one summary / demographic tab
+def chart_and_table_tabs(chart_label, graph_id, chart, table_label, table_id, df):
+	return html.Div([
+		dcc.Tabs(
+				children=[
+			dcc.Tab(
+				label=chart_label, 
+				className='custom-tab',
+				selected_className='custom-tab--selected-child',
+				children=[
+					dcc.Graph(id=graph_id, className="graph_padding", figure=chart)]
+						),
+			dcc.Tab(
+				label=table_label, 
+				className='custom-tab',
+				selected_className='custom-tab--selected-child',
+				children=[
+					dash_table.DataTable(
+						id=table_id,
+						columns=[{"name": i, "id": i} for i in df.columns],
+						data=df.to_dict('records'),
+						style_as_list_view=True,
+						style_cell={'padding': '5px','textAlign': 'left'},
+						style_header={'backgroundColor': 'white','fontWeight': 'bold'},
+						style_table={'overflowX': 'scroll'},
+						),  
+					dcc.Markdown("""Data from [Georgia Department of Public Health]
+						(https://dph.georgia.gov/covid-19-daily-status-report)""")
+					])
+				],
+				className="custom-tabs-container"
+				),
+			])
+
+@memoize(current_version)
+def summary_tab_content(tab):
+	if tab == "testing":
+		testing = testing_table()
+		return chart_and_table_tabs("Testing Bar Chart", "testing_pie_chart", testing_bar_plot(testing), "Testing Data", "testing_table", testing)
+	summary = get_datasets()['summary']
+	return chart_and_table_tabs("Summary Pie Chart", "summary_pie_chart", summary_pie_chart(), "Summary Data", "summary_table", summary)
+
+@memoize(current_version)
+def demographic_tab_content(tab):
+	if tab == "gender":
+		gender = gender_table()
+		return chart_and_table_tabs("Gender Bar Chart", "gender_pie_chart", gender_bar_plot(gender), "Gender Data", "gender_table", gender)
+	elif tab == "race":
+		race = get_datasets()['race']
+		return chart_and_table_tabs("Race Bar Chart", "race_pie_chart", make_race_pie_chart(), "Race Data", "race_table", race)
+	elif tab == "over_time":
+		return html.Div([
+			dcc.Dropdown(
+				id="demographic_view_selector",
+				options=[{"label": label, "value": view} for view, (label, series, transform) in DEMOGRAPHIC_VIEWS.items()],
+				value="positivity",
+				clearable=False,
+				className="dcc_control",
+				),
+			dcc.Graph(id="demographic_time_chart", className="graph_padding"),
+			dcc.Markdown("""Daily reports from [Georgia Department of Public Health]
+				(https://dph.georgia.gov/covid-19-daily-status-report)""")
+			])
+	age = age_table()
+	return chart_and_table_tabs("Age Bar Chart", "age_pie_chart", age_bar_plot(age), "Age Data", "age_table", age)
+
+@memoize(current_version)
+def county_table_records():
+	return get_datasets()['display_table'].to_dict('records')
+
+# Set up layout for application; built once per data version, which it records for the version poll
+@memoize(current_version, shared=False)
+def application_layout(version_poll_seconds=300):
 	data = get_datasets()
 	options, controls, layout = options_and_controls()
 
-	summary = data['summary']
 	display_table = data['display_table']
-
-	testing = testing_table()
-	age = age_table()
-	gender = gender_table()
-	race = data['race']
+	deaths_cube = data['deaths_cube']
+	age_bands = deaths_cube.labels["Age_Band"][:-1]
+	snapshots = snapshot_engine.snapshots()
 
 	min_day = controls['min_day']
 	max_day = controls['max_day']
@@ -284,6 +457,14 @@ def application_layout():
 	layout = html.Div( 
 		children=[
 
+			# Page load trigger for the lazily filled components
+			dcc.Location(id="url", refresh=False),
+
+			# Data version check; `data_version` only changes when the server has newer data than `rendered_version`
+			dcc.Interval(id="version_poll", interval=version_poll_seconds * 1000),
+			dcc.Store(id="rendered_version", data=data['version']),
+			dcc.Store(id="data_version"),
+
 			dcc.Store(id="aggregate_data"),
 
 			dcc.Store(id="main_graph_data"),
@@ -404,6 +585,14 @@ def application_layout():
 						html.Div(
 							[
 								html.Div([
+										dcc.Dropdown(
+											id="state_selector",
+											options=options['state_options'],
+											value=HOME_STATE,
+											clearable=False,
+											className="dcc_control",
+											style={} if len(options['state_options']) > 1 else {'display': 'none'},
+										),
 										html.Br(),
 										html.Details([
 											html.Summary("Filter by Date"),
@@ -459,6 +648,7 @@ def application_layout():
 												{"label": "10 Counties with Highest Cases ", "value": "top_10"},
 												{"label": "Family & Friends ", "value": "family"},                              
 												{"label": "No County Assigned", "value": "unassigned"},
+												{"label": "Public Health Districts ", "value": "districts"},
 												{"label": "Pick a county ", "value": "custom"}
 											],
 											value="all",
@@ -480,6 +670,8 @@ def application_layout():
 											html.Ul([
 														html.Li("Statistic filters will only impact the graphs and have no effect on the statistic boxes."),
 														html.Li("Note that rates per population are an average rather than a cumulative amount and therefore will not show up in the bar graph"),
+														html.Li("""7-day averages smooth out day-to-day reporting noise. Growth, doubling time and days since the 10th case 
+															are calculated per location and are only available as a line graph."""),
 														]),
 											html.Hr()
 											]),
@@ -511,7 +703,12 @@ def application_layout():
 											# 	className='custom-tab', selected_className='custom-tab--selected'),
 										]
 									),
-									html.Div(id="main_graph_tabs_content"),
+									html.Div(id="main_graph_tabs_content", children=[
+										html.Div(dcc.Graph(id="line_graph", className="main_graphs graph_padding"),
+											id="line_graph_container", className="GraphContainer"),
+										html.Div(dcc.Graph(id="count_graph", className="main_graphs graph_padding"),
+											id="count_graph_container", className="GraphContainer", style={'display': 'none'}),
+									]),
 									],
 									className="pretty_container inner",
 									id="pretty_count_graph"
@@ -530,6 +727,58 @@ def application_layout():
 			className="row flex_box",
 			),
 
+			# Changes Since Last Report
+
+			html.Div(
+				[
+				html.Div(
+					[
+						html.H3("Changes Since the Last Report",
+							style={
+								'color': COLORS['text'],
+								'marginBottom': '20px',
+								'textAlign': 'center'}
+								),
+						html.Hr(),
+						html.Div(
+							[
+							dcc.Dropdown(
+								id="snapshot_selector",
+								options=[{"label": snapshot_label(snapshot), "value": snapshot} for snapshot in snapshots[::-1]],
+								value=snapshots[-1],
+								clearable=False,
+								className="dcc_control",
+								style={'flex': '1'},
+								),
+							dcc.Dropdown(
+								id="snapshot_category_selector",
+								options=[{"label": category.replace("_", " "), "value": category} for category in SNAPSHOT_KEYS],
+								value="CountyCases",
+								clearable=False,
+								className="dcc_control",
+								style={'flex': '1'},
+								),
+							],
+							className="row flex_box",
+						),
+						html.Div(id="snapshot_changes_summary", className="pretty_container inner"),
+						dash_table.DataTable(
+							id="snapshot_movers_table",
+							style_as_list_view=True,
+							style_cell={'padding': '5px','textAlign': 'left'},
+							style_header={'backgroundColor': 'white','fontWeight': 'bold'},
+							style_table={'overflowX': 'scroll'},
+							),
+						dcc.Markdown("""Compares each Georgia Department of Public Health report with the one before it 
+							(morning and evening reports are compared separately when both exist)."""),
+					],
+					className="pretty_container outer",
+					),
+				],
+				className="row flex_box",
+				id="snapshot_changes"
+			),
+
 			# Tabular Breakdowns of Charts with Data Tables
 
 			html.Div([
@@ -545,83 +794,15 @@ def application_layout():
 							),
 					html.Hr(),
 					dcc.Tabs(
+						id="summary_tabs",
+						value="summary",
 						parent_className="custom-tabs",
 						children=[
-						dcc.Tab(
-							label='Summary of Cases', 
-							className='custom-tab',
-							selected_className='custom-tab--selected',
-							children=[
-							html.Div([
-								dcc.Tabs(
-										children=[
-									dcc.Tab(
-										label="Summary Pie Chart", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dcc.Graph(id="summary_pie_chart", className="graph_padding", figure=summary_pie_chart())]
-												),
-									dcc.Tab(
-										label="Summary Data", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dash_table.DataTable(
-												id='summary_table',
-												columns=[{"name": i, "id": i} for i in summary.columns],
-												data=summary.to_dict('records'),
-												style_as_list_view=True,
-												style_cell={'padding': '5px','textAlign': 'left'},
-												style_header={'backgroundColor': 'white','fontWeight': 'bold'},
-												style_table={'overflowX': 'scroll'},
-												),  
-											dcc.Markdown("""Data from [Georgia Department of Public Health]
-												(https://dph.georgia.gov/covid-19-daily-status-report)""")
-											])
-										],
-										className="custom-tabs-container"
-										),
-									]),
-								]),
-						dcc.Tab(
-							label="Testing Rates", 
-							className='custom-tab',
-							selected_className='custom-tab--selected',
-							children=[
-							html.Div([
-								dcc.Tabs(
-										children=[
-									dcc.Tab(
-										label="Testing Bar Chart", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dcc.Graph(id="testing_pie_chart", className="graph_padding", figure=testing_bar_plot(testing))]
-												),
-									dcc.Tab(
-										label="Testing Data", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dash_table.DataTable(
-												id='testing_table',
-												columns=[{"name": i, "id": i} for i in testing.columns],
-												data=testing.to_dict('records'),
-												style_as_list_view=True,
-												style_cell={'padding': '5px','textAlign': 'left'},
-												style_header={'backgroundColor': 'white','fontWeight': 'bold'},
-												style_table={'overflowX': 'scroll'},
-												),  
-											dcc.Markdown("""Data from [Georgia Department of Public Health]
-												(https://dph.georgia.gov/covid-19-daily-status-report)""")
-											])
-										],
-										className="custom-tabs-container"
-										),
-									]),
-								]),
+							dcc.Tab(label="Summary of Cases", value="summary", className='custom-tab', selected_className='custom-tab--selected'),
+							dcc.Tab(label="Testing Rates", value="testing", className='custom-tab', selected_className='custom-tab--selected'),
 							]),
+					# Filled by callback for the selected tab only
+					html.Div(id="summary_tabs_content"),
 						],
 						className="pretty_container",
 						id="left-summary",
@@ -638,120 +819,17 @@ def application_layout():
 							),
 					html.Hr(),
 					dcc.Tabs(
+						id="demographic_tabs",
+						value="age",
 						parent_className="custom-tabs",
 						children=[
-						dcc.Tab(
-							label='Age', 
-							className='custom-tab',
-							selected_className='custom-tab--selected',
-							children=[
-							html.Div([
-								dcc.Tabs(
-										children=[
-									dcc.Tab(
-										label="Age Bar Chart", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dcc.Graph(id="age_pie_chart", className="graph_padding", figure=age_bar_plot(age))]
-												),
-									dcc.Tab(
-										label="Age Data", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dash_table.DataTable(
-												id='age_table',
-												columns=[{"name": i, "id": i} for i in age.columns],
-												data=age.to_dict('records'),
-												style_as_list_view=True,
-												style_cell={'padding': '5px','textAlign': 'left'},
-												style_header={'backgroundColor': 'white','fontWeight': 'bold'},
-												style_table={'overflowX': 'scroll'},
-												),  
-											dcc.Markdown("""Data from [Georgia Department of Public Health]
-												(https://dph.georgia.gov/covid-19-daily-status-report)""")
-											])
-										],
-										className="custom-tabs-container"
-										),
-									]),
-								]),
-						dcc.Tab(
-							label="Gender", 
-							className='custom-tab',
-							selected_className='custom-tab--selected',
-							children=[
-							html.Div([
-								dcc.Tabs(
-										children=[
-									dcc.Tab(
-										label="Gender Bar Chart", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dcc.Graph(id="gender_pie_chart", className="graph_padding", figure=gender_bar_plot(gender))]
-												),
-									dcc.Tab(
-										label="Gender Data", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dash_table.DataTable(
-												id='gender_table',
-												columns=[{"name": i, "id": i} for i in gender.columns],
-												data=gender.to_dict('records'),
-												style_as_list_view=True,
-												style_cell={'padding': '5px','textAlign': 'left'},
-												style_header={'backgroundColor': 'white','fontWeight': 'bold'},
-												style_table={'overflowX': 'scroll'},
-												),  
-											dcc.Markdown("""Data from [Georgia Department of Public Health]
-												(https://dph.georgia.gov/covid-19-daily-status-report)""")
-											])
-										],
-										className="custom-tabs-container"
-										),
-									]),
-								]),
-						dcc.Tab(
-							label="Race", 
-							className='custom-tab',
-							selected_className='custom-tab--selected',
-							children=[
-							html.Div([
-								dcc.Tabs(
-										children=[
-									dcc.Tab(
-										label="Race Bar Chart", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dcc.Graph(id="race_pie_chart", className="graph_padding", figure=make_race_pie_chart())]
-												),
-									dcc.Tab(
-										label="Race Data", 
-										className='custom-tab',
-										selected_className='custom-tab--selected-child',
-										children=[
-											dash_table.DataTable(
-												id='race_table',
-												columns=[{"name": i, "id": i} for i in race.columns],
-												data=race.to_dict('records'),
-												style_as_list_view=True,
-												style_cell={'padding': '5px','textAlign': 'left'},
-												style_header={'backgroundColor': 'white','fontWeight': 'bold'},
-												style_table={'overflowX': 'scroll'},
-												),  
-											dcc.Markdown("""Data from [Georgia Department of Public Health]
-												(https://dph.georgia.gov/covid-19-daily-status-report)""")
-											])
-										],
-										className="custom-tabs-container"
-										),
-									]),
-								]),
+							dcc.Tab(label="Age", value="age", className='custom-tab', selected_className='custom-tab--selected'),
+							dcc.Tab(label="Gender", value="gender", className='custom-tab', selected_className='custom-tab--selected'),
+							dcc.Tab(label="Race", value="race", className='custom-tab', selected_className='custom-tab--selected'),
+							dcc.Tab(label="Over Time", value="over_time", className='custom-tab', selected_className='custom-tab--selected'),
 							]),
+					# Filled by callback for the selected tab only
+					html.Div(id="demographic_tabs_content"),
 						],
 						className="pretty_container",
 						id="right-demographic",
@@ -761,6 +839,89 @@ def application_layout():
 				id="summary_graphs"
 			),
 
+			# Deaths Explorer
+
+			html.Div(
+				[
+				html.Div(
+					[
+						html.H3("Georgia Deaths Explorer",
+							style={
+								'color': COLORS['text'],
+								'marginBottom': '20px',
+								'textAlign': 'center'}
+								),
+						html.Hr(),
+						html.Div(
+							[
+							html.Div([
+								html.P("Counties"),
+								dcc.Dropdown(
+									id="deaths_county_filter",
+									options=[{"label": county, "value": county} for county in deaths_cube.labels["County"]],
+									multi=True,
+									placeholder="All counties",
+									className="dcc_control",
+									),
+								html.P("Age"),
+								dcc.RangeSlider(
+									id="deaths_age_filter",
+									min=0,
+									max=len(age_bands) - 1,
+									value=[0, len(age_bands) - 1],
+									marks={i: age_bands[i] for i in range(0, len(age_bands), 4)},
+									className="dcc_control",
+									),
+								],
+								style={'flex': '2'}
+								),
+							html.Div([
+								html.P("Gender"),
+								dcc.Checklist(
+									id="deaths_gender_filter",
+									options=[{"label": gender, "value": gender} for gender in deaths_cube.labels["Gender"]],
+									value=deaths_cube.labels["Gender"],
+									labelStyle={"display": "inline-block"},
+									className="dcc_control",
+									),
+								html.P("Underlying Condition"),
+								dcc.Checklist(
+									id="deaths_underlying_filter",
+									options=[{"label": value, "value": value} for value in deaths_cube.labels["Underlying"]],
+									value=deaths_cube.labels["Underlying"],
+									labelStyle={"display": "inline-block"},
+									className="dcc_control",
+									),
+								],
+								style={'flex': '1'}
+								),
+							],
+							className="row flex_box",
+						),
+						html.Div(
+							[
+							dcc.Graph(id="deaths_age_chart", className="graph_padding", style={'flex': '1'}),
+							dcc.Graph(id="deaths_gender_chart", className="graph_padding", style={'flex': '1'}),
+							],
+							className="row flex_box",
+						),
+						html.Div(
+							[
+							dcc.Graph(id="deaths_underlying_chart", className="graph_padding", style={'flex': '1'}),
+							dcc.Graph(id="deaths_county_chart", className="graph_padding", style={'flex': '1'}),
+							],
+							className="row flex_box",
+						),
+						dcc.Markdown("""Each chart shows its full breakdown under the other filters. 
+							Data from [Georgia Department of Public Health](https://dph.georgia.gov/covid-19-daily-status-report)"""),
+					],
+					className="pretty_container outer",
+					),
+				],
+				className="row flex_box",
+				id="deaths_explorer"
+			),
+
 
 			# County DataTable Here
 
@@ -813,7 +974,7 @@ def application_layout():
 									dash_table.DataTable(
 										id='datatable-interactivity',
 										columns=[{"name": i, "id": i, "selectable": True} for i in display_table.columns],
-										data=display_table.to_dict('records'),
+										data=[],
 										filter_action="native",
 										sort_action="native",
 										sort_mode="single",
@@ -955,39 +1116,6 @@ def application_layout():
 
 
 ### HELPER FUNCTIONS
-def filter_dataframe(df, day_slider, county_stat_selector=None, county=None):
-	"""
-	This function will filter the `over_time` or `ga_time` dataframes based on day chosen with the following options:
-	- `county` if `over_time` is used (otherwise, should be 'None')
-	-  `county_stat_selector` to filter on specific statistics (otherwise, should be 'None')
-	"""
-	dff = 0
-	if county_stat_selector == None:
-		# Pulls back full dataframe based on days chosen
-		if county == None:
-			dff = df[df['Day'].between(day_slider[0]+1, day_slider[1])]
-					 
-		# Pulls back full dataframe based on counties and days chosen
-		else:
-			dff = df[df["County"].isin(county)
-				& (df["Day"] > day_slider[0])
-				& (df["Day"] <= (day_slider[1]))
-				]
-	else:
-		# Pulls back specific stats for Georgia as a whole (not by counties)
-		if county == None:
-			dff = df[[county_stat_selector, "Day"]][df['Day'].between(day_slider[0]+1, day_slider[1])]
-			
-		# Pulls back specific stats for chosen counties
-		else:
-			dff = df[[county_stat_selector, "County", "Day"]][
-			df["County"].isin(county) 
-			& (df["Day"] > day_slider[0])
-			& (df["Day"] <= day_slider[1])           
-			]
-
-	return dff
-
 # Used for adding emphasis to text
 def emph(t, color=COLORS['text']):
 	return html.B([t],style={'color':color})
@@ -996,33 +1124,210 @@ def emph(t, color=COLORS['text']):
 def format_num(num):
 	return ('{0:{grp}d}'.format(int(num), grp=','))
 
+### CALLBACK COMPUTATIONS
+# Pure functions of the callback inputs, cached per dataset version so presets can be warmed ahead of traffic
+
+def county_group(selector, state=HOME_STATE):
+	if selector == "all":
+		return ["All Counties"]
+	elif selector == "top_10":
+		unique_counties = history_store(state).latest()
+		unique_counties = unique_counties[unique_counties["fips"] != 0]
+		top_10 = unique_counties.sort_values(by="TotalCases", ascending=False).head(10)
+		top_10 = top_10["County"].tolist()
+		return top_10
+	elif selector == 'unassigned':
+		counties = ['Unknown', 'Non-Georgia Resident']
+	elif selector == "family":
+		counties = ['Fulton', 'Cobb', 'Fannin', 'Walton', 'Rockdale', 'Gwinnett']
+	elif selector == "districts":
+		return list(group_aggregator(state).groups)
+	else:
+		return []
+	if state != HOME_STATE:
+		available = set(history_store(state).counties())
+		counties = [county for county in counties if county in available]
+	return counties
+
+# Statistic boxes at top of dashboard
+@memoize(current_version)
+def key_figures(county_options_menu, day_slider, state=HOME_STATE):
+	store = history_store(state)
+	first_day, last_day = day_slider[0], min(day_slider[1], store.max_day())
+
+	if STATE_ROW in county_options_menu:
+		def latest(stat):
+			return np.nansum(store.query([STATE_ROW], stat, [last_day - 1, last_day])[1])
+		totals = {stat: latest(stat) for stat in ["TotalCases", "TotalDeaths", "Infection_per_100k", "Fatality_Rate"]}
+		for stat in ["nConfirmed_Change", "nDeaths_Change"]:
+			totals[stat] = np.nansum(store.query([STATE_ROW], stat, [first_day, last_day])[1])
+	else:
+		# Counties and districts are summed as one population, so rates are weighted rather than averaged
+		totals = group_aggregator(state).totals(county_options_menu, [first_day, last_day])
+	totals = {stat: np.nan_to_num(value) for stat, value in totals.items()}
+
+	sum_cases = totals["TotalCases"]
+	sum_deaths = totals["TotalDeaths"]
+	c_increase = totals["nConfirmed_Change"]
+	d_increase = totals["nDeaths_Change"]
+	avg_fatality = str(round(totals["Fatality_Rate"] * 100, 2)) + "%"
+	avg_infection = round(totals["Infection_per_100k"])
+
+	day_before_slider = "03/02/2020"
+	if first_day > 1:
+		day_before_slider = format_day(first_day)
+	case_date = "As of: ", html.Br(), emph(format_day(last_day))
+	deaths_date = "As of: ", html.Br(), emph(format_day(last_day))
+	infection_date = "As of: ", html.Br(), emph(format_day(last_day))
+	fatality_date = "As of: ", html.Br(), emph(format_day(last_day))
+	c_increase_date = "Since:", html.Br(), emph(day_before_slider)
+	d_increase_date = "Since:", html.Br(), emph(day_before_slider)
+
+	return (format_num(sum_cases), format_num(sum_deaths), format_num(avg_infection), 
+		avg_fatality, format_num(c_increase), format_num(d_increase), 
+		case_date, deaths_date, infection_date, fatality_date, c_increase_date, d_increase_date)
+
+# Line and bar traces for the main graph, over the full history; the day slider only sets the x-axis range (clientside)
+@memoize(current_version)
+def count_figure(county_stat_selector, tab, county_options_menu=None, state=HOME_STATE):
+	tab_1_data = []
+	tab_2_data = []
+	new_layout = figure_layout(BASE_LAYOUT)
+
+	if county_options_menu is None:
+		return tab_1_data, tab_2_data, new_layout
+	elif tab == 'tab-2' and BAR_STATS[county_stat_selector][1]:
+		return tab_1_data, tab_2_data, new_layout
+
+	days, y_data = selection_history(county_options_menu, county_stat_selector, [0, history_store(state).max_day()], state)
+	tab_1_data, tab_2_data = count_traces(county_options_menu, days.tolist(), format_days(days), y_data, COLORS["colors8"])
+	new_layout = figure_layout(COUNT_LAYOUT, f"{LABEL_STATS[county_stat_selector]}")
+
+	return tab_1_data, tab_2_data, new_layout
+
+# Reduced main graph served while count figures are being shed: the statewide series only
+def statewide_count_figure(county_stat_selector, tab, state=HOME_STATE):
+	tab_1_data, tab_2_data, new_layout = count_figure(county_stat_selector, tab, [STATE_ROW], state)
+	new_layout = dict(new_layout, title={"text": f"{LABEL_STATS[county_stat_selector]} (statewide only, the server is busy)"})
+	return tab_1_data, tab_2_data, new_layout
+
+def admitted(callback_class, func, *args, fallback=None):
+	"""Cached results are served directly; computations go through the admission gate of their callback class."""
+	gate = admission_gates.get(callback_class)
+	if gate is None or func.is_cached(*args):
+		return func(*args)
+	return gate.run(lambda: func(*args), fallback)
+
+# Deaths explorer charts, answered from the rollup cube
+@memoize(current_version)
+def deaths_explorer_figures(counties, age_range, genders, underlying):
+	deaths_cube = get_datasets()['deaths_cube']
+	age_bands = deaths_cube.labels["Age_Band"]
+	filters = {
+		"County": counties or None,
+		"Age_Band": None if age_range is None or list(age_range) == [0, len(age_bands) - 2] else age_bands[age_range[0]:age_range[1] + 1],
+		"Gender": genders,
+		"Underlying": underlying,
+	}
+
+	def bar_chart(by, title, xaxis_title, top=None):
+		counts = deaths_cube.counts_by(by, **filters)
+		if top is not None:
+			counts = counts[counts > 0].sort_values(ascending=False).head(top)
+		bars = [bar(counts.index.tolist(), counts.values.tolist(), 'Confirmed Deaths', COLORS["dark_yellow"])]
+		return make_stacked_bar_plot(bars, title, xaxis_title, "Number of Deaths")
+
+	return (
+		bar_chart("Age_Band", "GA COVID-19 Deaths by Age", "Age"),
+		bar_chart("Gender", "GA COVID-19 Deaths by Gender", "Gender"),
+		bar_chart("Underlying", "GA COVID-19 Deaths by Underlying Condition", "Underlying Condition"),
+		bar_chart("County", "GA COVID-19 Deaths by County (Top 15)", "County", top=15),
+	)
+
+# Demographic and testing history, sliced from the pre-pivoted category arrays
+@memoize(current_version)
+def demographic_figure(view):
+	category_series = get_datasets()['category_series']
+	label, series, transform = DEMOGRAPHIC_VIEWS[view]
+	other = category_series['tests_total'] if transform == 'positivity' else None
+	groups, values = category_series[series].view(transform, other)
+	dates = category_series[series].dates
+
+	colors = COLORS["colors8"]
+	lines = [scatter(dates, values[:, i], group, colors[i % len(colors)]) for i, group in enumerate(groups)]
+	chart = make_stacked_bar_plot(lines, f"GA COVID-19 {label}", "Report Date", label)
+	chart['layout']['hovermode'] = "x unified"
+	return chart
+
+# Revisions between a report and the one before it
+@memoize(current_version)
+def snapshot_changes(snapshot, category):
+	diff = snapshot_engine.since_last(snapshot, category)
+	if diff is None:
+		return html.Span(["No earlier ", emph(category.replace("_", " ")), " report to compare with."]), [], []
+
+	before = snapshot_label(snapshot_engine.previous(snapshot))
+	summary = diff.summary
+	net = [[html.Br(), f"Net change in {column}: ", emph(f"{value:+,.0f}")] for column, value in summary['net'].items()]
+	summary_text = html.Span(["Since ", emph(before), ": ",
+							  emph(summary['revised']), " revised, ", emph(summary['added']), " added, ",
+							  emph(summary['removed']), " removed out of ", emph(summary['rows']), " rows."]
+							 + [item for line in net for item in line])
+
+	movers = diff.movers()
+	columns = [{"name": column, "id": column} for column in movers.columns]
+	return summary_text, columns, movers.to_dict('records')
+
+def warm_presets():
+	"""Yields the (computation, args) pairs behind the preset selections at the default full day range."""
+	day_slider = [0, latest_day()]
+	for group in PRESET_GROUPS:
+		counties = county_group(group)
+		yield 'key_figures', (counties, list(day_slider), HOME_STATE)
+		for stat in LABEL_STATS:
+			for tab in PRESET_TABS:
+				yield 'count_figure', (stat, tab, counties, HOME_STATE)
+
 ### CALLBACKS
 
 def init_callbacks(app):
-	data = get_datasets()
 	options, controls, layout = options_and_controls()
-	ga_time = data['ga_time']
-	over_time = data['over_time']
-	display_table = data['display_table']
-	min_day = controls['min_day']
-	max_day = controls['max_day']
 	# all_counties_option = options['all_counties_option']
-	county_options = options['county_options']
 	georgia_only = options['georgia_only']
 
 	app.clientside_callback(
     ClientsideFunction(namespace="clientside", function_name="resize"),
     Output("output-clientside", "children"),
-    [Input("count_graph", "figure"), Input("line_graph", "figure")])
+    [Input("count_graph", "figure"), Input("line_graph", "figure"), Input("main_graph_tabs", "value")])
+
+	# Slider -> main graph x-axis range, applied in the browser to the traces already loaded
+	app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="main_graph_range"),
+    [Output("line_graph", "figure"), Output("count_graph", "figure")],
+    [Input("main_graph_data", "data"), Input("day_slider", "value")])
+
+	# Version poll -> data_version, only when the data changed since the page was rendered
+	app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="poll_version"),
+    Output("data_version", "data"),
+    [Input("version_poll", "n_intervals")],
+    [State("data_version", "data"), State("rendered_version", "data")])
+
+	# New data -> slider end
+	@app.callback(Output("day_slider", "max"), [Input("data_version", "data")])
+	def update_day_slider_max(version):
+		if version is None:
+			raise PreventUpdate
+		return latest_day()
 
 	# Disable 'All Counties' as an option if 'All of Georgia' filter is NOT chosen
 	@app.callback(
 	    dash.dependencies.Output('county_options_menu', 'options'),
-	    [Input('county_group_selector', 'value')])
+	    [Input('county_group_selector', 'value'), Input('state_selector', 'value')])
 
-	def update_multi_options(value):
+	def update_multi_options(value, state):
 	    if value != "all":
-	        return county_options
+	        return region_county_options(state)
 	    else:
 	        return georgia_only
 
@@ -1031,57 +1336,13 @@ def init_callbacks(app):
 	    [
 	        Input("county_options_menu", "value"),
 	        Input("day_slider", "value"),
+	        Input("state_selector", "value"),
+	        Input("data_version", "data"),
 	    ],
 	)
 	# Updates statistic boxes at top of dashboard
-	def update_key_figures_text(county_options_menu, day_slider):
-	    dff = 0
-	    sum_cases = 0
-	    sum_deaths = 0
-	    c_increase = 0
-	    d_increase = 0
-	    avg_infection = 0
-	    avg_fatality = 0
-	    if day_slider[1] > ga_time["Day"].max():
-	    	day_slider[1] = ga_time["Day"].max()
-	    # Filters for entire state of Georgia
-	    if county_options_menu == ["All Counties"]:
-	        dff = filter_dataframe(ga_time, day_slider, None, None)
-	        sum_cases = dff.loc[dff['Day'] == day_slider[1], 'TotalCases'].iloc[0]
-	        sum_deaths = dff.loc[dff['Day'] == day_slider[1], 'TotalDeaths'].iloc[0]
-	        c_increase = dff["nConfirmed_Change"].sum()
-	        d_increase = dff["nDeaths_Change"].sum()
-	        
-	    # Filters by counties chosen
-	    else:
-	        dff = filter_dataframe(over_time, day_slider, None, county_options_menu)
-	        sum_cases = dff[dff["Day"] == day_slider[1]]["TotalCases"].sum()
-	        sum_deaths = dff[dff["Day"] == day_slider[1]]["TotalDeaths"].sum()
-	        c_increase = dff["nConfirmed_Change"].sum()
-	        d_increase = dff["nDeaths_Change"].sum()
-
-	    if (sum_deaths is not 0) & (dff["Fatality_Rate"] is not 0):
-	    	dff["Fatality_Rate"] = dff["Fatality_Rate"] * 100
-	    	avg_fatality = dff[dff["Day"] == day_slider[1]]["Fatality_Rate"].values.sum() / len(county_options_menu)
-	    	avg_fatality = str(round(avg_fatality,2)) + "%"
-
-	    if (sum_cases is not 0) & (dff["Infection_per_100k"] is not 0): 
-	        avg_infection = dff[dff["Day"] == day_slider[1]]["Infection_per_100k"].values.sum() / len(county_options_menu)
-	        avg_infection = round(avg_infection)
-
-	    day_before_slider = "03/02/2020"
-	    if day_slider[0] > 1:
-	    	day_before_slider = DATE_DICT.get(day_slider[0])
-	    case_date = "As of: ", html.Br(), emph(DATE_DICT.get(day_slider[1]))
-	    deaths_date = "As of: ", html.Br(), emph(DATE_DICT.get(day_slider[1]))
-	    infection_date = "As of: ", html.Br(), emph(DATE_DICT.get(day_slider[1]))
-	    fatality_date = "As of: ", html.Br(), emph(DATE_DICT.get(day_slider[1]))
-	    c_increase_date = "Since:", html.Br(), emph(day_before_slider)
-	    d_increase_date = "Since:", html.Br(), emph(day_before_slider)
-
-	    return (format_num(sum_cases), format_num(sum_deaths), format_num(avg_infection), 
-	    	avg_fatality, format_num(c_increase), format_num(d_increase), 
-	    	case_date, deaths_date, infection_date, fatality_date, c_increase_date, d_increase_date)
+	def update_key_figures_text(county_options_menu, day_slider, state, version=None):
+		return admitted('key_figures', key_figures, county_options_menu, day_slider, state)
 
 	# Selectors -> key figures text
 	@app.callback(
@@ -1107,23 +1368,10 @@ def init_callbacks(app):
 	# Radio -> multi
 	@app.callback(
 		Output("county_options_menu", "value"), 
-		[Input("county_group_selector", "value")])
-
-	def display_type(selector):
-	    if selector == "all":
-	        return ["All Counties"]
-	    elif selector == "top_10":
-	        unique_counties = over_time.drop_duplicates(subset="County", keep="last")
-	        unique_counties = unique_counties[unique_counties["fips"] != 0]
-	        top_10 = unique_counties.sort_values(by="TotalCases", ascending=False).head(10)
-	        top_10 = top_10["County"].tolist()
-	        return top_10
-	    elif selector == 'unassigned':
-	        return ['Unknown', 'Non-Georgia Resident']
-	    elif selector == "family":
-	        return ['Fulton', 'Cobb', 'Fannin', 'Walton', 'Rockdale', 'Gwinnett']
-	    else:
-	        return []
+		[Input("county_group_selector", "value"), Input("state_selector", "value")])
+
+	def display_type(selector, state):
+	    return county_group(selector, state)
 
 	@app.callback(Output('county_options_menu', 'style'), [Input('county_group_selector', 'value')])
 	def hide_graph(input):
@@ -1131,14 +1379,25 @@ def init_callbacks(app):
 	        return {'display':'none'}
 
 	# Slider -> count graph
-	@app.callback(Output("day_slider", "value"), [Input("count_graph", "selectedData")])
-	def update_day_slider(count_graph_selected):
+	@app.callback(Output("day_slider", "value"),
+		[Input("count_graph", "selectedData"), Input("data_version", "data")],
+		[State("day_slider", "value"), State("day_slider", "max")])
+	def update_day_slider(count_graph_selected, version, day_slider, slider_max):
+
+	    if dash.callback_context.triggered[0]["prop_id"] == "data_version.data":
+	        # A slider left at the end of the history follows it when new days arrive
+	        if day_slider and day_slider[1] >= slider_max:
+	            return [day_slider[0], latest_day()]
+	        raise PreventUpdate
 
 	    if count_graph_selected is None:
-	        return [0, max_day]
+	        return [0, latest_day()]
 
-	    nums = [int(point["pointNumber"]) for point in count_graph_selected["points"]]
-	    return [min(nums) + 0, max(nums) + (min_day+1)]
+	    # Days from the points' x values: once a long history is downsampled, point numbers are no longer days
+	    days = [int(point["x"]) for point in count_graph_selected["points"]]
+	    if not days:
+	        raise PreventUpdate
+	    return [max(min(days) - 1, 0), min(max(days), latest_day())]
 
 	# Output container for range slider
 	@app.callback(
@@ -1151,16 +1410,15 @@ def init_callbacks(app):
 		])
 
 	def update_output(day_slider, county_options_menu, county_stat_selector, tab):
-		if day_slider[1] > ga_time["Day"].max():
-			day_slider[1] = ga_time["Day"].max()
+		last_day = min(day_slider[1], latest_day())
 		return_value = html.Span(["You have selected: ", emph(LABEL_STATS[county_stat_selector]), html.Br(),
-								" Dates: ", emph(DATE_DICT.get(day_slider[0] + 1)), " - ", emph(DATE_DICT.get(day_slider[1])), html.Br(),
-								" Days: ", emph(day_slider[0] + 1), " - ", emph(day_slider[1]), html.Br(),
+								" Dates: ", emph(format_day(day_slider[0] + 1)), " - ", emph(format_day(last_day)), html.Br(),
+								" Days: ", emph(day_slider[0] + 1), " - ", emph(last_day), html.Br(),
 								" Locations: ", emph(f"{county_options_menu}"),
 								])
-		if tab == 'tab-2' and any ([county_stat_selector == 'Infection_per_100k', county_stat_selector == 'Deaths_per_100k']):
+		if tab == 'tab-2' and BAR_STATS[county_stat_selector][1]:
 			return_value = html.Span(["You have selected: ", emph(LABEL_STATS[county_stat_selector], color="red"), \
-				" which is only available as a line graph as it is based on an average rather than a cumulative amount. \
+				" which is only available as a line graph as it is based on a rate rather than a cumulative amount. \
 				Please switch to the ", emph("Line Graph", color="red"), " tab to view these stats."])
 		return return_value
 
@@ -1187,7 +1445,7 @@ def init_callbacks(app):
 	    if derived_virtual_selected_rows is None:
 	        derived_virtual_selected_rows = []
 
-	    dff = display_table if rows is None else pd.DataFrame(rows)
+	    dff = get_datasets()['display_table'] if rows is None else pd.DataFrame(rows)
 
 	    colors = [COLORS['dark_yellow'] if i in derived_virtual_selected_rows else COLORS['dark_blue']
 	              for i in range(len(dff))]
@@ -1218,117 +1476,74 @@ def init_callbacks(app):
 	        for column in selected_columns if column in dff
 	    ]
 
+	# Snapshot -> changes since last report
+	@app.callback(
+	    [
+	        Output("snapshot_changes_summary", "children"),
+	        Output("snapshot_movers_table", "columns"),
+	        Output("snapshot_movers_table", "data"),
+	    ],
+	    [Input("snapshot_selector", "value"), Input("snapshot_category_selector", "value")])
+	def update_snapshot_changes(snapshot, category):
+	    return snapshot_changes(snapshot, category)
+
+	# Demographic view -> demographic time series
+	@app.callback(Output("demographic_time_chart", "figure"), [Input("demographic_view_selector", "value")])
+	def update_demographic_chart(view):
+	    return demographic_figure(view)
+
+	# Deaths explorer filters -> deaths charts
+	@app.callback(
+	    [
+	        Output("deaths_age_chart", "figure"),
+	        Output("deaths_gender_chart", "figure"),
+	        Output("deaths_underlying_chart", "figure"),
+	        Output("deaths_county_chart", "figure"),
+	    ],
+	    [
+	        Input("deaths_county_filter", "value"),
+	        Input("deaths_age_filter", "value"),
+	        Input("deaths_gender_filter", "value"),
+	        Input("deaths_underlying_filter", "value"),
+	    ])
+	def update_deaths_explorer(counties, age_range, genders, underlying):
+	    return deaths_explorer_figures(counties, age_range, genders, underlying)
+
 		# Selectors -> count graph
 	@app.callback(Output("main_graph_data", "data"),
 	    [
 	        Input("county_stat_selector", "value"),
-	        Input("day_slider", "value"),
 	        Input('main_graph_tabs', 'value'),
-	        Input("county_options_menu", "value")
+	        Input("county_options_menu", "value"),
+	        Input("state_selector", "value"),
+	        Input("data_version", "data")
 	    ]
 	    )
 
-	def make_count_figure(county_stat_selector, day_slider, tab, county_options_menu=None):
-	    tab_1_data = []
-	    tab_2_data = []
-	    new_layout = copy.deepcopy(layout)
+	def make_count_figure(county_stat_selector, tab, county_options_menu=None, state=HOME_STATE, version=None):
+		return admitted('count_figure', count_figure, county_stat_selector, tab, county_options_menu, state,
+						fallback=lambda: statewide_count_figure(county_stat_selector, tab, state))
 
-	    # if day_slider is None or county_options_menu is None:
-	    # 	fig = dict(layout=layout_line)
-	    # 	return fig
+	# Section tabs -> contents of the selected tab, built on first request per data version
+	@app.callback(Output("summary_tabs_content", "children"), [Input("summary_tabs", "value"), Input("data_version", "data")])
+	def render_summary_tab(tab, version=None):
+	    return summary_tab_content(tab)
 
-	    if any ([day_slider is None, county_options_menu is None]):
-	    	return tab_1_data, tab_2_data, new_layout
-	    elif tab == 'tab-2' and any ([county_stat_selector == 'Infection_per_100k', county_stat_selector == 'Deaths_per_100k']):
-	    	return tab_1_data, tab_2_data, new_layout   	
+	@app.callback(Output("demographic_tabs_content", "children"), [Input("demographic_tabs", "value"), Input("data_version", "data")])
+	def render_demographic_tab(tab, version=None):
+	    return demographic_tab_content(tab)
 
-	    else:
-		    dff = filter_dataframe(over_time, day_slider, county_stat_selector, county_options_menu)
-		    if county_options_menu == ["All Counties"]:
-		        dff = filter_dataframe(ga_time, day_slider, county_stat_selector, None)
-
-		    y_data = []
-		    date_text = [value for key, value in DATE_DICT.items()][day_slider[0]:day_slider[1]]
-		    day_text = [value for key, value in DAY_DICT.items()][day_slider[0]:day_slider[1]]
-		    for county_name in county_options_menu:
-		        if county_options_menu == ["All Counties"]:
-		            y_data.append(dff[county_stat_selector])
-		            date_text = [value for key, value in DATE_DICT.items()][day_slider[0]:day_slider[1]]
-		            day_text = [value for key, value in DAY_DICT.items()][day_slider[0]:day_slider[1]]
-		        else:
-		            y_data.append(dff[county_stat_selector][dff["County"] == county_name])
-		            date_text = [value for key, value in DATE_DICT.items()][day_slider[0]:day_slider[1]]
-		            day_text = [value for key, value in DAY_DICT.items()][day_slider[0]:day_slider[1]]
-
-		    colors = COLORS["colors8"]*10
-		    hovertemplate='''<b>Date</b>: %{customdata}</b><br><b>Day of Outbreak</b>: %{text}<br>
-		    <br><b>Location</b>: %{meta}<br><b>Value:</b>: %{y}<extra></extra>'''
-
-		    for i in range(0, len(county_options_menu)):
-		    	tab_1_data.append(go.Scatter(mode="lines+markers", marker_color=colors[i],
-	                x=day_text,
-	                y=y_data[i],
-	                customdata = date_text,
-	                text = day_text,
-	                name = county_options_menu[i],
-	                meta= county_options_menu[i],
-	                hoverlabel={'align': 'left'},
-	                hovertemplate=hovertemplate))
-		    	# tab_2_data.append(go.Scatter(mode="markers",
-	      #           x=day_text,
-	      #           y=y_data[i],
-	      #           # name="Count",
-	      #           opacity=0,
-	      #           hoverinfo="skip"))
-		    	tab_2_data.append(go.Bar(name = county_options_menu[i], x=day_text, y=y_data[i], marker_color=colors[i],
-	                customdata = date_text,
-	                text = day_text,
-	                meta= county_options_menu[i],
-	                hoverlabel={'align': 'left'},
-	                hovertemplate=hovertemplate))
-
-		    new_layout["title"] = f"{LABEL_STATS[county_stat_selector]}"
-		    new_layout["dragmode"] = "select"
-		    new_layout["showlegend"] = True
-		    new_layout["autosize"] = True
-		    new_layout["barmode"] = "stack"
-
-		    # figure = dict(data=data, layout=new_layout)
-		    return tab_1_data, tab_2_data, new_layout
-
-	@app.callback(Output('main_graph_tabs_content', 'children'),
-              [
-              Input('main_graph_tabs', 'value'),
-              Input("main_graph_data", "data"),
-              ]
-          )
-	def render_content(tab, data):
-	    tab_1_data = data[0]
-	    tab_2_data = data[1]
-	    new_layout = data[2]
-	    if tab == 'tab-1':
-	        return html.Div(
-	        			dcc.Graph(
-	        				id="line_graph", 
-	        				className="main_graphs graph_padding",
-	        				figure={
-	        					'data': tab_1_data,
-	        					'layout': new_layout
-	        					}
-	        				), 
-	        			className="GraphContainer")
-	    elif tab == 'tab-2':
-	        return html.Div(
-	        			dcc.Graph(
-	        				id="count_graph", 
-	        				className="main_graphs graph_padding",
-	        				figure={
-	        					'data': tab_2_data,
-	        					'layout': new_layout
-	        					}
-	        				), 
-	        			className="GraphContainer")
-	    # elif tab == 'tab-3':
+	# Page load or new data -> county table rows
+	@app.callback(Output("datatable-interactivity", "data"), [Input("url", "pathname"), Input("data_version", "data")])
+	def load_county_table(pathname, version=None):
+	    return county_table_records()
+
+	@app.callback([Output('line_graph_container', 'style'), Output('count_graph_container', 'style')],
+              [Input('main_graph_tabs', 'value')])
+	def render_content(tab):
+	    if tab == 'tab-2':
+	        return {'display': 'none'}, {}
+	    return {}, {'display': 'none'}
 
 
 ### RUN DASHBOARD
@@ -1343,7 +1558,29 @@ def Add_Dash(server):
 					routes_pathname_prefix='/',
 					meta_tags=[{"name": "viewport", "content": "width=device-width"}])
 	app.config.suppress_callback_exceptions = True
-	app.layout = application_layout()
+	install_serializer()
+	global history_db
+	region_store.max_bytes = server.config['REGION_CACHE_MB'] * 2**20
+	single_flight.lock_dir = server.config['SINGLE_FLIGHT_LOCK_DIR'] or None
+	shared_cache.path = server.config['RESULT_CACHE_DB'] or None
+	shared_cache.max_bytes = server.config['RESULT_CACHE_MB'] * 2**20
+	for callback_class in ['count_figure', 'key_figures']:
+		admission_gates[callback_class] = AdmissionGate(callback_class, concurrency=server.config['ADMISSION_CONCURRENCY'],
+														queue_size=server.config['ADMISSION_QUEUE'], budget=server.config['ADMISSION_BUDGET_SECONDS'])
+	if server.config['HISTORY_DB']:
+		history_db = server.config['HISTORY_DB']
+		data_sources.append(history_db)
+	app.layout = lambda: application_layout(server.config['VERSION_POLL_SECONDS'])
 	init_callbacks(app)
 
+	# Precompute preset selections in the background; the load balancer polls /ready
+	warmer = CacheWarmer(current_version, warm_presets,
+						 {'key_figures': key_figures, 'count_figure': count_figure},
+						 interval=server.config['CACHE_WARM_INTERVAL'])
+	on_version_change(warmer.notify)
+	server.add_url_rule('/ready', 'ready', warmer.readiness)
+	server.add_url_rule('/version', 'version', version_view)
+	server.extensions['dash'] = app
+	warmer.start()
+
 	return app.server
\ No newline at end of file
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Rebuilds `assets/data/merged/categories/*_all.csv` from every snapshot folder under `assets/data/split`,
+and brings the county and statewide day histories (`merged/ga_90days.csv`, `merged/georgia_pm.csv`) up
+to date from each day's last report in the same pass.
+
+Snapshots are parsed and normalized in a process pool. Each worker returns its tables as plain
+numpy columns (numbers as float64, dates as datetime64, text as int32 codes plus labels) instead
+of pickled DataFrames. Results are merged in snapshot order, so the output does not depend on
+which worker finished first.
+
+Usage (from the repository root):
+	python -m application.dash_application.ingest [--workers N] [--out DIR]
+"""
+
+import os
+import sys
+import time
+import argparse
+import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .snapshots import list_snapshots
+from .day_calendar import date_to_day, format_day
+
+
+data_dir = os.path.join(os.getcwd(), 'assets', 'data')
+SPLIT_DIR = os.path.join(data_dir, 'split')
+MERGED_DIR = os.path.join(data_dir, 'merged')
+CATEGORIES_DIR = os.path.join(MERGED_DIR, 'categories')
+POPULATION_FILE = os.path.join(MERGED_DIR, 'ga_counties_pm.csv')
+COUNTY_HISTORY_FILE = 'ga_90days.csv'
+STATE_HISTORY_FILE = 'georgia_pm.csv'
+
+# Merged file -> snapshot categories concatenated into it
+MERGED_FILES = {
+	'Age_all.csv': ['Age'],
+	'CountyCases_all.csv': ['CountyCases'],
+	'Deaths_all.csv': ['Deaths'],
+	'Gender_all.csv': ['Gender'],
+	'Race_all.csv': ['Race', 'Race_Breakdown'],
+	'Race_Breakdown_all.csv': ['Race_Breakdown'],
+	'Summary_all.csv': ['Summary'],
+	'Testing_all.csv': ['Testing'],
+}
+TEXT_COLUMNS = {'Ages', 'Age_Cat', 'County', 'Confirmed', 'Ethnicity', 'Gender', 'LabType', 'Race', 'Underlying'}
+
+
+### WORKER
+def snapshot_dates(values, day):
+	"""
+	Report timestamps anchored to the snapshot folder's day. The files mix month-first, day-first and
+	ISO formats, so whichever reading lands on the folder's day wins; otherwise the folder day itself is used.
+	"""
+	day = pd.Timestamp(day)
+	if values is None:
+		return np.full(1, day.to_datetime64())
+	values = pd.Series(values).astype(str)
+	monthfirst = pd.to_datetime(values, errors='coerce', format='mixed')
+	dayfirst = pd.to_datetime(values, errors='coerce', format='mixed', dayfirst=True)
+	dates = monthfirst.where(monthfirst.dt.normalize() == day, dayfirst.where(dayfirst.dt.normalize() == day, day))
+	return dates.to_numpy(dtype='datetime64[s]')
+
+def county_statistics(df, population):
+	"""Per-county rates for a CountyCases snapshot, recomputed so every snapshot carries the same columns."""
+	cases = df['TotalCases'].to_numpy(dtype=float)
+	deaths = df['TotalDeaths'].to_numpy(dtype=float)
+	pop = df['County'].str.lower().map(population).to_numpy(dtype=float)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		return {
+			'Population': pop,
+			'PctOfInfections': (cases / np.nansum(cases)).round(4),
+			'PctDeaths': np.where(cases > 0, deaths / cases, 0).round(4),
+			'PctPopInfected': (cases / pop).round(5),
+			'Infection_per_100k': (cases / pop * 100000).round(0),
+			'Deaths_per_100k': (deaths / pop * 100000).round(0),
+			'Deaths_per_100_Infections': np.where(cases > 0, deaths / cases * 100, 0).round(0),
+		}
+
+def encode_columns(df):
+	"""A snapshot table as typed numpy columns: text -> (int32 codes, labels), everything else -> float64."""
+	columns = {}
+	for column in df.columns:
+		if column == 'Date':
+			columns[column] = df[column].to_numpy(dtype='datetime64[s]')
+		elif column in TEXT_COLUMNS:
+			codes, labels = pd.factorize(df[column].astype('string').str.strip())
+			columns[column] = (codes.astype(np.int32), labels.to_numpy(dtype=str))
+		else:
+			columns[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+	return columns
+
+def parse_snapshot(split_dir, snapshot, population):
+	"""Reads and normalizes every category file of one snapshot. Runs in a worker process."""
+	day, period = snapshot.split('_')
+	folder = os.path.join(split_dir, day, period)
+	tables = {}
+	for filename in sorted(os.listdir(folder)):
+		category = filename.rsplit('_', 2)[0]
+		df = pd.read_csv(os.path.join(folder, filename))
+		dates = snapshot_dates(df['Date'] if 'Date' in df else None, dt.datetime.strptime(day, "%m%d%Y"))
+		df = df.assign(Date=np.resize(dates, len(df)))
+		if category == 'CountyCases':
+			df = df.assign(**county_statistics(df, population))
+		tables[category] = (len(df), encode_columns(df))
+	return snapshot, tables
+
+
+### MERGE
+def decode_columns(n_rows, columns):
+	decoded = {}
+	for column, values in columns.items():
+		if isinstance(values, tuple):
+			codes, labels = values
+			decoded[column] = np.where(codes >= 0, labels[np.maximum(codes, 0)] if len(labels) else '', None)
+		else:
+			decoded[column] = values
+	return pd.DataFrame(decoded, index=pd.RangeIndex(n_rows))
+
+def merge(results):
+	"""Concatenates worker results per merged file in snapshot order, with columns sorted like the existing files."""
+	merged = {}
+	for filename, categories in MERGED_FILES.items():
+		frames = [decode_columns(*tables[category]) for _, tables in results for category in categories if category in tables]
+		if not frames:
+			continue
+		df = pd.concat(frames, ignore_index=True, sort=False)
+		merged[filename] = df[sorted(df.columns)]
+	return merged
+
+### DAY HISTORIES
+def daily_reports(results):
+	"""Outbreak day -> tables of that day's last snapshot (the PM report when there is one)."""
+	reports = {}
+	for snapshot, tables in results:
+		reports[int(date_to_day(dt.datetime.strptime(snapshot.split('_')[0], "%m%d%Y")))] = tables
+	return reports
+
+def history_rates(cases, deaths, population, prev_cases, prev_deaths):
+	"""The derived columns of day history rows, with the changes taken against the previous day's counts."""
+	with np.errstate(divide='ignore', invalid='ignore'):
+		return {
+			'PctPopInfected': np.where(population > 0, cases / population, 0).round(4),
+			'Infection_per_100k': np.where(population > 0, cases / population * 100000, 0).round(0),
+			'Deaths_per_100k': np.where(population > 0, deaths / population * 100000, 0).round(0),
+			'Deaths_per_100_Infections': np.where(cases > 0, deaths / cases * 100, 0).round(0),
+			'nConfirmed_Change': cases - prev_cases,
+			'nDeaths_Change': deaths - prev_deaths,
+			'pConfirmed_Change': np.where(prev_cases > 0, (cases - prev_cases) / prev_cases, 0).round(4),
+			'pDeaths_Change': np.where(prev_deaths > 0, (deaths - prev_deaths) / prev_deaths, 0).round(4),
+			'Fatality_Rate': np.where(cases > 0, deaths / cases, 0).round(4),
+		}
+
+def county_history(reports, existing, population):
+	"""
+	The county day history with every day that has a CountyCases report rebuilt from it. Other days (the
+	history before the first snapshot, the zero placeholder rows after the last) are kept as they are.
+	A county missing from a report keeps its previous day's counts.
+	"""
+	days = {int(day): df.set_index('County') for day, df in existing.groupby('Day')}
+	counties = existing.drop_duplicates('County', keep='last').set_index('County')[['fips', 'Population']]
+	for day in sorted(day for day, tables in reports.items() if 'CountyCases' in tables):
+		report = decode_columns(*reports[day]['CountyCases']).drop_duplicates('County', keep='last').set_index('County')
+		index = counties.index.union(report.index)
+		previous = days.get(day - 1, pd.DataFrame(columns=['TotalCases', 'TotalDeaths'])).reindex(index)
+		pop = counties['Population'].reindex(index).fillna(pd.Series(index.str.lower().map(population), index=index)).fillna(0)
+		cases = report['TotalCases'].reindex(index).fillna(previous['TotalCases']).fillna(0)
+		deaths = report['TotalDeaths'].reindex(index).fillna(previous['TotalDeaths']).fillna(0)
+		rows = pd.DataFrame({
+			'Date': format_day(day),
+			'Day': day,
+			'fips': counties['fips'].reindex(index).fillna(report['fips'].reindex(index)).fillna(0),
+			'Population': pop,
+			'TotalCases': cases,
+			'TotalDeaths': deaths,
+		}, index=index)
+		days[day] = rows.assign(**history_rates(cases.to_numpy(), deaths.to_numpy(), pop.to_numpy(),
+												previous['TotalCases'].fillna(cases).to_numpy(), previous['TotalDeaths'].fillna(deaths).to_numpy()))
+	history = pd.concat(days.values()).rename_axis('County').reset_index()
+	return history.sort_values(['County', 'Day'], kind='stable')[existing.columns].astype(existing.dtypes.to_dict())
+
+def state_history(reports, existing):
+	"""The statewide day history with every day that has a Summary report rebuilt from its totals; other days are kept."""
+	days = {int(day): row.iloc[0].to_dict() for day, row in existing.groupby('Day')}
+	population = existing['Population'].iloc[-1] if len(existing) else np.nan
+	for day in sorted(day for day, tables in reports.items() if 'Summary' in tables):
+		summary = decode_columns(*reports[day]['Summary']).set_index('Confirmed')['TotalCases']
+		previous = days.get(day - 1, {})
+		cases, deaths = summary.get('Total', np.nan), summary.get('Deaths', np.nan)
+		row = {'Date': format_day(day), 'Day': day, 'Population': population, 'TotalCases': cases,
+			   'Hospitalized': summary.get('Hospitalized', np.nan), 'TotalDeaths': deaths}
+		rates = history_rates(np.array([cases]), np.array([deaths]), np.array([population]),
+							  np.array([previous.get('TotalCases', cases)]), np.array([previous.get('TotalDeaths', deaths)]))
+		days[day] = dict(row, **{column: values[0] for column, values in rates.items()})
+	history = pd.DataFrame([days[day] for day in sorted(days)])
+	return history[existing.columns].astype(existing.dtypes.to_dict())
+
+def write_csv(df, path):
+	df.to_csv(f"{path}.tmp", index=False)
+	os.replace(f"{path}.tmp", path)
+
+def load_population(path=POPULATION_FILE):
+	counties = pd.read_csv(path, usecols=['County', 'Population']).dropna().drop_duplicates('County')
+	return dict(zip(counties['County'].str.lower(), counties['Population']))
+
+def rebuild(split_dir=SPLIT_DIR, out_dir=CATEGORIES_DIR, workers=None, history_dir=MERGED_DIR):
+	"""
+	Parses every snapshot in parallel, rewrites the merged category files and updates the day histories
+	in `history_dir` from the same results. Returns {file: rows}.
+	"""
+	snapshots = list_snapshots(split_dir)
+	population = load_population()
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		n = len(snapshots)
+		results = list(pool.map(parse_snapshot, [split_dir] * n, snapshots, [population] * n, chunksize=max(1, n // 32)))
+
+	os.makedirs(out_dir, exist_ok=True)
+	rows = {}
+	for filename, df in merge(results).items():
+		write_csv(df, os.path.join(out_dir, filename))
+		rows[filename] = len(df)
+
+	reports = daily_reports(results)
+	histories = {
+		COUNTY_HISTORY_FILE: lambda existing: county_history(reports, existing, population),
+		STATE_HISTORY_FILE: lambda existing: state_history(reports, existing),
+	}
+	for filename, build in histories.items():
+		path = os.path.join(history_dir, filename)
+		df = build(pd.read_csv(path))
+		write_csv(df, path)
+		rows[filename] = len(df)
+	return rows
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Rebuild the merged category files from the snapshot folders.")
+	parser.add_argument('--split-dir', default=SPLIT_DIR)
+	parser.add_argument('--out', default=CATEGORIES_DIR)
+	parser.add_argument('--history-dir', default=MERGED_DIR, help=f"directory of {COUNTY_HISTORY_FILE} and {STATE_HISTORY_FILE}")
+	parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per core)")
+	args = parser.parse_args(argv)
+
+	started = time.perf_counter()
+	rows = rebuild(args.split_dir, args.out, args.workers, args.history_dir)
+	for filename, count in rows.items():
+		print(f"{filename:<26} {count:>7,} rows")
+	print(f"Rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import numpy as np
+import pandas as pd
+
+
+WINDOW = 7
+MILESTONE_CASES = 10
+
+
+### DERIVED METRICS
+def rolling_mean(values, window=WINDOW):
+	"""
+	Trailing mean along the day axis of a (locations x days) array.
+	The first `window - 1` days are averaged over the days available so far.
+	"""
+	n_days = values.shape[1]
+	padded = np.zeros((values.shape[0], n_days + 1))
+	np.cumsum(values, axis=1, out=padded[:, 1:])
+	end = np.arange(1, n_days + 1)
+	start = np.maximum(end - window, 0)
+	return (padded[:, end] - padded[:, start]) / (end - start)
+
+def lag(values, days=WINDOW):
+	"""Shifts a (locations x days) array `days` columns to the right, padding with NaN."""
+	lagged = np.full(values.shape, np.nan)
+	lagged[:, days:] = values[:, :-days]
+	return lagged
+
+def derived_metrics(total_cases, new_cases, new_deaths):
+	"""
+	Computes every derived statistic in one pass over (locations x days) arrays:
+	- `Cases_7Day_Avg` / `Deaths_7Day_Avg`: trailing 7-day average of the daily increase
+	- `Cases_WoW_Growth`: % change of the 7-day case average against the week before
+	- `Doubling_Time`: days for cumulative cases to double at the past week's growth rate
+	- `Days_Since_10th_Case`: days since the location first reached 10 cumulative cases
+	Undefined values (no growth, no prior cases, milestone not reached) are NaN.
+	"""
+	cases_avg = rolling_mean(new_cases)
+	deaths_avg = rolling_mean(new_deaths)
+
+	with np.errstate(divide="ignore", invalid="ignore"):
+		prev_avg = lag(cases_avg)
+		growth = np.where(prev_avg > 0, (cases_avg - prev_avg) / prev_avg * 100, np.nan)
+
+		prev_total = lag(total_cases)
+		ratio = np.where(prev_total > 0, total_cases / prev_total, np.nan)
+		doubling = np.where(ratio > 1, WINDOW * np.log(2) / np.log(ratio), np.nan)
+
+	reached = total_cases >= MILESTONE_CASES
+	first_day = np.where(reached.any(axis=1), reached.argmax(axis=1), np.nan)
+	days_since = np.arange(total_cases.shape[1]) - first_day[:, None]
+	days_since[days_since < 0] = np.nan
+
+	return {
+		"Cases_7Day_Avg": cases_avg,
+		"Deaths_7Day_Avg": deaths_avg,
+		"Cases_WoW_Growth": growth,
+		"Doubling_Time": doubling,
+		"Days_Since_10th_Case": days_since,
+	}
+
+def add_derived_metrics(df, group=None):
+	"""
+	Returns a copy of the `over_time` (group="County") or `ga_time` (group=None) dataframe
+	with the derived statistics added as columns. Rows are scattered into a
+	(locations x days) array once, so all locations are computed together.
+	"""
+	if group is None:
+		codes, n_locations = np.zeros(len(df), dtype=int), 1
+	else:
+		codes, uniques = pd.factorize(df[group])
+		n_locations = len(uniques)
+	days = df["Day"].to_numpy().astype(int) - 1
+	shape = (n_locations, days.max() + 1)
+
+	def day_matrix(column):
+		matrix = np.zeros(shape)
+		matrix[codes, days] = df[column].to_numpy(dtype=float)
+		return matrix
+
+	metrics = derived_metrics(day_matrix("TotalCases"), day_matrix("nConfirmed_Change"), day_matrix("nDeaths_Change"))
+
+	df = df.copy()
+	for name, values in metrics.items():
+		df[name] = values[codes, days].round(2)
+	return df
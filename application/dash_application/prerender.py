@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Pre-renders the default dashboard for the current data version into a directory of static files.
+
+The page (`index.html`), its layout (`_dash-layout`) and callback graph (`_dash-dependencies`) and
+every script and stylesheet it loads are fetched from the app exactly as a browser would get them.
+The server callbacks that fire on page load are run once here, with the default control values, and
+their outputs are written into `_dash-layout`. Those callbacks are marked `prevent_initial_call` in
+`_dash-dependencies`, so a visitor's browser renders the default view without calling the app.
+Clientside callbacks still run in the browser. Callbacks on props the browser derives itself (the
+county table's `derived_virtual_data`) still reach the app when the table mounts.
+
+Serve the directory from any static file server or CDN at the app's path prefix:
+	- `_dash-layout` and `_dash-dependencies` must be served as `application/json`
+	- POST `/_dash-update-component` (and `/version`, `/ready`) go to the live app, which takes over
+	  as soon as the visitor changes a control
+
+Usage (from the repository root):
+	python -m application.dash_application.prerender [--out DIR]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from urllib.parse import urlsplit
+
+
+OUT_DIR = os.path.join(os.getcwd(), 'build', 'prerendered')
+ASSET_PATTERN = re.compile(r'(?:src|href)="(/[^"]*)"')
+# Re-runs of callbacks feeding each other before the pre-render gives up
+MAX_SETTLE_PASSES = 10
+
+
+### LAYOUT
+def component_index(node, index=None):
+	"""Maps component id -> props dict (the same objects as in the layout tree, so they can be updated in place)."""
+	if index is None:
+		index = {}
+	if isinstance(node, dict):
+		props = node.get('props')
+		if isinstance(props, dict) and isinstance(props.get('id'), str):
+			index[props['id']] = props
+		for value in node.values():
+			component_index(value, index)
+	elif isinstance(node, list):
+		for value in node:
+			component_index(value, index)
+	return index
+
+def output_specs(dependency):
+	"""[{id, property}] of a dependency's output string: `id.prop` or `..id1.prop1...id2.prop2..`."""
+	output = dependency['output']
+	parts = output.strip('.').split('...') if output.startswith('..') else [output]
+	return [dict(zip(('id', 'property'), part.rsplit('.', 1))) for part in parts]
+
+
+### INITIAL CALLBACKS
+def call(client, dependency, index):
+	"""Runs one server callback through the app with the values currently in the layout. Returns {id: {prop: value}}."""
+	outputs = output_specs(dependency)
+	values = lambda specs: [dict(spec, value=index[spec['id']].get(spec['property'])) for spec in specs]
+	body = {
+		'output': dependency['output'],
+		'outputs': outputs if dependency['output'].startswith('..') else outputs[0],
+		'inputs': values(dependency['inputs']),
+		'state': values(dependency['state']),
+		'changedPropIds': [],
+	}
+	response = client.post('/_dash-update-component', json=body)
+	if response.status_code == 204:
+		return {}
+	if response.status_code != 200:
+		raise RuntimeError(f"{dependency['output']} failed with {response.status_code}")
+	return response.get_json()['response']
+
+def input_values(dependency, index):
+	return json.dumps([index[spec['id']].get(spec['property']) for spec in dependency['inputs']], sort_keys=True, default=str)
+
+def run_initial_callbacks(client, layout, dependencies):
+	"""
+	Runs every server callback whose inputs and outputs are in the layout, in dependency order, and writes
+	the outputs into `layout`. Components added by a callback (e.g. tab contents) are picked up on the next round.
+	Callbacks feeding each other have no such order; they are run in index order and then re-run while an
+	input changed after they ran, for at most `MAX_SETTLE_PASSES` passes. Returns the indices of the callbacks that ran.
+	"""
+	done, seen = set(), {}
+
+	def run(i, index):
+		seen[i] = input_values(dependencies[i], index)
+		for component, props in call(client, dependencies[i], index).items():
+			if component in index:
+				index[component].update(props)
+		done.add(i)
+
+	cyclic = False
+	while True:
+		index = component_index(layout)
+		ready = {i for i, dependency in enumerate(dependencies)
+				 if i not in done and not dependency.get('clientside_function')
+				 and all(spec['id'] in index for spec in dependency['inputs'] + dependency['state'] + output_specs(dependency))}
+		pending = {(spec['id'], spec['property']) for i in ready for spec in output_specs(dependencies[i])}
+		runnable = [i for i in sorted(ready)
+					if not any((spec['id'], spec['property']) in pending for spec in dependencies[i]['inputs'])]
+		if not runnable and ready:
+			# Left over: callbacks feeding each other; run them in order rather than not at all
+			runnable, cyclic = sorted(ready)[:1], True
+		if not runnable:
+			break
+		for i in runnable:
+			run(i, index)
+
+	for _ in range(MAX_SETTLE_PASSES if cyclic else 0):
+		index = component_index(layout)
+		changed = [i for i in sorted(done) if input_values(dependencies[i], index) != seen[i]]
+		if not changed:
+			break
+		for i in changed:
+			run(i, index)
+	else:
+		if cyclic:
+			raise RuntimeError(f"Initial callbacks did not settle within {MAX_SETTLE_PASSES} passes")
+	return done
+
+
+### BUILD
+def write(out_dir, url_path, content):
+	path = os.path.join(out_dir, urlsplit(url_path).path.lstrip('/'))
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with open(f"{path}.tmp", 'wb') as f:
+		f.write(content)
+	os.replace(f"{path}.tmp", path)
+	return len(content)
+
+def prerender(server, out_dir=OUT_DIR):
+	"""Writes the pre-rendered default view of the Dash app on `server` to `out_dir`. Returns {url path: bytes}."""
+	client = server.test_client()
+	written = {}
+
+	page = client.get('/').get_data()
+	written['/index.html'] = write(out_dir, '/index.html', page)
+
+	layout = client.get('/_dash-layout').get_json()
+	dependencies = client.get('/_dash-dependencies').get_json()
+	for i in run_initial_callbacks(client, layout, dependencies):
+		dependencies[i]['prevent_initial_call'] = True
+	for name, content in [('/_dash-layout', layout), ('/_dash-dependencies', dependencies)]:
+		written[name] = write(out_dir, name, json.dumps(content, separators=(',', ':')).encode())
+
+	# Everything the page links to, plus the renderer's lazily loaded chunks
+	assets = set(ASSET_PATTERN.findall(page.decode()))
+	for namespace, paths in server.extensions['dash'].registered_paths.items():
+		assets.update(f"/_dash-component-suites/{namespace}/{path}" for path in paths)
+	for url in sorted(assets):
+		response = client.get(url)
+		if response.status_code == 200:
+			written[urlsplit(url).path] = write(out_dir, url, response.get_data())
+	return written
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Pre-render the default dashboard view to static files.")
+	parser.add_argument('--out', default=OUT_DIR)
+	args = parser.parse_args(argv)
+
+	started = time.perf_counter()
+	from application import create_app
+	from .ga_cases import current_version
+	written = prerender(create_app(), args.out)
+	print(f"Pre-rendered data version {current_version()} to {args.out}: "
+		  f"{len(written)} files, {sum(written.values()) / 2**20:.1f} MB in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+
+from .metrics import add_derived_metrics
+
+
+logger = logging.getLogger(__name__)
+
+HOME_STATE = 'GA'
+DEFAULT_REGION_CACHE_MB = 64
+
+
+### STATE TOTALS
+def state_totals(over_time):
+	"""Sums a prepared county history into a statewide series with the same columns as `ga_time`."""
+	totals = over_time.groupby("Day", as_index=False).agg({
+		"Date": "first",
+		"Population": "sum",
+		"TotalCases": "sum",
+		"TotalDeaths": "sum",
+		"nConfirmed_Change": "sum",
+		"nDeaths_Change": "sum",
+	})
+	cases = totals["TotalCases"].to_numpy(dtype=float)
+	deaths = totals["TotalDeaths"].to_numpy(dtype=float)
+	population = totals["Population"].to_numpy(dtype=float)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		totals["PctPopInfected"] = np.where(population > 0, cases / population, 0).round(4)
+		totals["Infection_per_100k"] = np.where(population > 0, cases / population * 100000, 0).round()
+		totals["Deaths_per_100k"] = np.where(population > 0, deaths / population * 100000, 0).round()
+		totals["Fatality_Rate"] = np.where(cases > 0, deaths / cases, 0).round(4)
+	return add_derived_metrics(totals)
+
+
+### REGION STORE
+class RegionStore:
+	"""
+	Lazily loads one state's county history per file in `region_dir` (`<STATE>.csv`, same layout as
+	`ga_90days.csv`) and keeps the most recently used states in memory up to `max_bytes`.
+	The home state is served by `get_datasets` and never evicted here.
+	"""
+
+	def __init__(self, region_dir, loader, max_bytes=DEFAULT_REGION_CACHE_MB * 2**20):
+		self.region_dir = region_dir
+		self.loader = loader
+		self.max_bytes = max_bytes
+		self.version = None
+		self._regions = OrderedDict()
+		self._sizes = {}
+		self._lock = threading.Lock()
+		self._state_locks = {}
+
+	def path(self, state):
+		return os.path.join(self.region_dir, f"{state}.csv")
+
+	def available(self):
+		if not os.path.isdir(self.region_dir):
+			return []
+		return sorted(name[:-4] for name in os.listdir(self.region_dir) if name.endswith(".csv"))
+
+	def nbytes(self):
+		return sum(self._sizes.values())
+
+	def cached(self, state, version):
+		"""The loaded region, or None. Switching to a new `version` drops every loaded region. Call with `_lock` held."""
+		if version != self.version:
+			self._regions.clear()
+			self._sizes.clear()
+			self.version = version
+		if state in self._regions:
+			self._regions.move_to_end(state)
+			return self._regions[state]
+		return None
+
+	def get(self, state, version):
+		"""
+		A state's region for data `version`. A cold state is read under its own lock, outside the store-wide
+		one, so requests for other states (loaded or not) never wait behind it.
+		"""
+		with self._lock:
+			region = self.cached(state, version)
+			if region is not None:
+				return region
+			state_lock = self._state_locks.setdefault(state, threading.Lock())
+
+		with state_lock:
+			# Another thread may have loaded it while this one waited
+			with self._lock:
+				region = self.cached(state, version)
+			if region is not None:
+				return region
+
+			if state not in self.available():
+				raise KeyError(state)
+			region = self.loader(self.path(state))
+			size = sum(int(df.memory_usage(deep=True).sum()) for df in region.values())
+			with self._lock:
+				# Not kept if the data version moved on during the load
+				if version == self.version:
+					self._regions[state] = region
+					self._sizes[state] = size
+					self.evict(keep=state)
+			return region
+
+	def evict(self, keep):
+		while self.nbytes() > self.max_bytes and len(self._regions) > 1:
+			state = next(iter(self._regions))
+			if state == keep:
+				break
+			del self._regions[state]
+			logger.info("Evicted region %s (%d bytes)", state, self._sizes.pop(state))
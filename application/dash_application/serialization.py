@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+JSON encoding of callback responses. Traces carry their numbers as NumPy arrays, which orjson writes
+natively (NaN and infinities as null, like the Plotly encoder). Everything orjson does not know, such as
+Dash components, figures and pandas objects, is handed back to it in plain form, and anything still
+unknown goes through `PlotlyJSONEncoder`. Without orjson installed, `dumps` is the Plotly encoder.
+tests/test_serialization.py checks the output against the stock encoder; `benchmarks/serializer.py` times both.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+
+try:
+	import orjson
+except ImportError:  # optional; the stock encoder is used instead
+	orjson = None
+
+
+def plotly_dumps(value):
+	return json.dumps(value, cls=PlotlyJSONEncoder, separators=(",", ":"))
+
+def plain(obj):
+	"""`default` hook for orjson: the JSON-ready form of anything it cannot write itself."""
+	if hasattr(obj, "to_plotly_json"):
+		return obj.to_plotly_json()
+	if isinstance(obj, (pd.Series, pd.Index)):
+		obj = obj.to_numpy()
+	if isinstance(obj, np.ndarray) and obj.dtype.kind in "biuf":
+		# Non-contiguous slices
+		return np.ascontiguousarray(obj)
+	return json.loads(plotly_dumps(obj))
+
+if orjson is not None:
+	OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+	def dumps(value):
+		try:
+			return orjson.dumps(value, default=plain, option=OPTIONS).decode()
+		except TypeError:
+			# orjson refuses arrays of non-native byte order outright (without calling `default`)
+			return plotly_dumps(value)
+else:
+	dumps = plotly_dumps
+
+
+def install():
+	"""
+	Encodes Dash callback responses with `dumps`. Dash 2 serializes them through `dash._callback.to_json`;
+	older versions encode inside `Dash.dispatch` and keep the stock encoder. Returns whether it was installed.
+	"""
+	try:
+		from dash import _callback
+	except ImportError:
+		return False
+	if not hasattr(_callback, "to_json"):
+		return False
+	_callback.to_json = dumps
+	return True
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import threading
+import functools
+import numpy as np
+import pandas as pd
+
+
+# Category -> (key columns, value columns); None counts rows per key (line lists)
+SNAPSHOT_KEYS = {
+	'CountyCases': (['County'], ['TotalCases', 'TotalDeaths']),
+	'Deaths': (['County'], None),
+	'Testing': (['LabType'], ['TotalTests', 'PositiveTests']),
+	'Summary': (['Confirmed'], ['TotalCases']),
+	'Age': (['Ages'], ['Ages_Total', 'Ages_Death_Total']),
+	'Gender': (['Gender'], ['Gender_Num', 'nDeaths']),
+	'Race_Breakdown': (['Race', 'Ethnicity'], ['Cases', 'Deaths']),
+}
+
+TOP_MOVERS = 10
+
+
+### SNAPSHOTS
+def list_snapshots(split_dir):
+	"""All report snapshots as `MMDDYYYY_AM|PM` ids, oldest first."""
+	snapshots = []
+	for day in os.listdir(split_dir):
+		if not day.isdigit():
+			continue
+		for period in os.listdir(os.path.join(split_dir, day)):
+			snapshots.append(f"{day}_{period}")
+	return sorted(snapshots, key=lambda snapshot: (snapshot[4:8], snapshot[:4], snapshot[-2:]))
+
+def snapshot_label(snapshot):
+	day, period = snapshot.split("_")
+	return f"{day[:2]}/{day[2:4]}/{day[4:]} {period}"
+
+def snapshot_path(split_dir, snapshot, category):
+	day, period = snapshot.split("_")
+	return os.path.join(split_dir, day, period, f"{category}_{snapshot}.csv")
+
+def file_stamp(path):
+	"""Modification time of `path` (None if missing): part of every cache key, so a revised file is re-read."""
+	try:
+		return os.stat(path).st_mtime_ns
+	except FileNotFoundError:
+		return None
+
+def load_snapshot(split_dir, snapshot, category):
+	"""One category of one snapshot, reduced to a frame indexed by its key columns. None if the file is missing."""
+	path = snapshot_path(split_dir, snapshot, category)
+	stamp = file_stamp(path)
+	return None if stamp is None else read_snapshot(path, stamp, category)
+
+@functools.lru_cache(maxsize=128)
+def read_snapshot(path, stamp, category):
+	keys, values = SNAPSHOT_KEYS[category]
+	df = pd.read_csv(path)
+	for key in keys:
+		df[key] = df[key].fillna("Unknown").astype(str).str.strip()
+	if values is None:
+		return df.groupby(keys).size().to_frame("Count")
+	values = [value for value in values if value in df]
+	return df.groupby(keys)[values].sum()
+
+
+### DIFFS
+class SnapshotDiff:
+	"""Per-key deltas between two snapshots of one category, computed with one vectorized outer join."""
+
+	def __init__(self, before, after):
+		columns = [column for column in after.columns if column in before.columns]
+		joined = before[columns].join(after[columns], how="outer", lsuffix="_before", rsuffix="_after")
+		before_values = joined[[f"{c}_before" for c in columns]].to_numpy(dtype=float)
+		after_values = joined[[f"{c}_after" for c in columns]].to_numpy(dtype=float)
+
+		added = np.isnan(before_values).all(axis=1)
+		removed = np.isnan(after_values).all(axis=1)
+		deltas = np.nan_to_num(after_values) - np.nan_to_num(before_values)
+		changed = (deltas != 0).any(axis=1) | added | removed
+
+		self.columns = columns
+		self.keys = [" / ".join(map(str, key)) if isinstance(key, tuple) else str(key) for key in joined.index]
+		self.deltas = deltas
+		self.after = np.nan_to_num(after_values)
+		self.status = np.select([added, removed, changed], ["added", "removed", "revised"], "unchanged")
+		self.summary = {
+			'rows': len(self.keys),
+			'revised': int((self.status == "revised").sum()),
+			'added': int(added.sum()),
+			'removed': int(removed.sum()),
+			'net': dict(zip(columns, deltas.sum(axis=0).tolist())),
+		}
+
+	def movers(self, n=TOP_MOVERS):
+		"""The `n` keys with the largest absolute change in the first value column, largest first."""
+		if not self.columns:
+			return pd.DataFrame()
+		magnitude = np.abs(self.deltas[:, 0])
+		n = min(n, len(magnitude))
+		top = np.argpartition(-magnitude, n - 1)[:n] if n else np.array([], dtype=int)
+		top = top[np.argsort(-magnitude[top], kind="stable")]
+		top = top[magnitude[top] > 0]
+		movers = {"Key": [self.keys[i] for i in top], "Status": self.status[top]}
+		for j, column in enumerate(self.columns):
+			movers[column] = self.after[top, j].round(2)
+			movers[f"{column} Change"] = self.deltas[top, j].round(2)
+		return pd.DataFrame(movers)
+
+class SnapshotDiffEngine:
+	"""Lists snapshots and caches diffs between consecutive ones until either file is revised."""
+
+	def __init__(self, split_dir):
+		self.split_dir = split_dir
+		self._diffs = {}
+		self._lock = threading.Lock()
+
+	def snapshots(self):
+		return list_snapshots(self.split_dir)
+
+	def previous(self, snapshot):
+		snapshots = self.snapshots()
+		i = snapshots.index(snapshot)
+		return snapshots[i - 1] if i > 0 else None
+
+	def diff(self, before, after, category):
+		key = (before, after, category)
+		stamps = tuple(file_stamp(snapshot_path(self.split_dir, snapshot, category)) for snapshot in (before, after))
+		with self._lock:
+			if key in self._diffs and self._diffs[key][0] == stamps:
+				return self._diffs[key][1]
+		before_table = load_snapshot(self.split_dir, before, category)
+		after_table = load_snapshot(self.split_dir, after, category)
+		if before_table is None or after_table is None:
+			return None
+		result = SnapshotDiff(before_table, after_table)
+		with self._lock:
+			self._diffs[key] = (stamps, result)
+		return result
+
+	def since_last(self, snapshot, category):
+		"""Diff of `snapshot` against the report just before it."""
+		before = self.previous(snapshot)
+		return None if before is None else self.diff(before, snapshot, category)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+County history storage behind one query surface: counties x stat x day range -> (days, values),
+plus the county list, each county's latest row, raw rows for export and per-day sums for aggregation.
+
+`MemoryStore` answers from the loaded `over_time` / state frames (the original behaviour).
+`SQLiteStore` answers from an embedded database with one table per state keyed on (County, Day),
+so the history no longer has to fit in each worker's memory.
+
+Build the database (from the repository root):
+	python -m application.dash_application.storage --out assets/data/history.sqlite
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+
+
+STATE_ROW = "All Counties"
+FETCH_ROWS = 4096
+SQLITE_CACHE_KB = 8192
+SQLITE_MAX_VARIABLES = 500
+LAYOUT_TABLE = "frame_columns"
+
+
+def day_axis(day_range):
+	"""Days covered by a slider value `[start, end]`: start is exclusive, like the day slider."""
+	return np.arange(int(day_range[0]) + 1, int(day_range[1]) + 1)
+
+
+### IN MEMORY
+class MemoryStore:
+	"""Queries the county history and statewide totals frames of one state held in memory."""
+
+	def __init__(self, over_time, state_time):
+		self.over_time = over_time
+		self.state_time = state_time
+
+	def stats(self):
+		return set(self.over_time.columns) - {"County", "Day", "Date"}
+
+	def max_day(self):
+		return int(self.state_time["Day"].max())
+
+	def query(self, counties, stat, day_range):
+		"""A (len(counties) x days) float array of `stat`, NaN where a county has no row for a day."""
+		days = day_axis(day_range)
+		values = np.full((len(counties), len(days)), np.nan)
+		rows = {county: i for i, county in enumerate(counties)}
+
+		in_range = self.over_time["Day"].between(days[0], days[-1]) if len(days) else False
+		df = self.over_time[in_range & self.over_time["County"].isin(rows)]
+		values[df["County"].map(rows).to_numpy(), df["Day"].to_numpy(dtype=np.int64) - days[:1]] = df[stat].to_numpy(dtype=float)
+
+		if STATE_ROW in rows:
+			state = self.state_time[self.state_time["Day"].between(days[0], days[-1])] if len(days) else self.state_time[:0]
+			values[rows[STATE_ROW], state["Day"].to_numpy(dtype=np.int64) - days[:1]] = state[stat].to_numpy(dtype=float)
+		return days, values
+
+	def counties(self):
+		return sorted(self.over_time["County"].unique())
+
+	def latest(self):
+		"""Each county's row on its last day."""
+		return self.over_time.sort_values(["County", "Day"]).drop_duplicates("County", keep="last")
+
+	def rows(self, counties, day_range):
+		"""History rows of `counties` over `(start, end]`; `[STATE_ROW]` gives the statewide rows."""
+		if counties == [STATE_ROW]:
+			return self.state_time[self.state_time["Day"].between(day_range[0] + 1, day_range[1])]
+		return self.over_time[self.over_time["County"].isin(counties) & (self.over_time["Day"] > day_range[0])
+							  & (self.over_time["Day"] <= day_range[1])]
+
+	def state_history(self):
+		return self.state_time
+
+	def sums(self, counties, columns, day_range):
+		"""{column: per-day sum over `counties`} for the days of `day_range`, 0 where no county has a row."""
+		days = day_axis(day_range)
+		df = self.rows(list(counties), day_range)
+		sums = df.groupby("Day")[columns].sum()
+		return {column: sums[column].reindex(days, fill_value=0).to_numpy(dtype=float) for column in columns}
+
+
+### SQLITE
+_connections = {}
+_connections_lock = threading.Lock()
+
+def shared_connection(path):
+	"""One read-only connection per database per worker process, shared by its threads behind a lock."""
+	key = (os.getpid(), path)
+	with _connections_lock:
+		if key not in _connections:
+			connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+			connection.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_KB}")
+			_connections[key] = (connection, threading.Lock())
+		return _connections[key]
+
+def table_name(state):
+	return f"history_{state}"
+
+class SQLiteStore:
+	"""
+	Queries one state's history table. Rows are streamed with `fetchmany` straight into the result array,
+	so memory is bounded by the size of the answer rather than by the size of the history.
+	"""
+
+	def __init__(self, path, state):
+		self.path = path
+		self.table = table_name(state)
+		self._columns = None
+		self._layouts = {}
+
+	def execute(self, sql, params=()):
+		connection, lock = shared_connection(self.path)
+		with lock:
+			cursor = connection.execute(sql, params)
+			while True:
+				rows = cursor.fetchmany(FETCH_ROWS)
+				if not rows:
+					break
+				yield from rows
+
+	def layout(self, kind):
+		"""[(column, dtype)] of the frame a table was built from ("county" or "state"), in its original order."""
+		if kind not in self._layouts:
+			self._layouts[kind] = list(self.execute(f'SELECT name, dtype FROM "{LAYOUT_TABLE}" WHERE tbl = ? AND kind = ? '
+													f'ORDER BY position', (self.table, kind)))
+		return self._layouts[kind]
+
+	def frame(self, sql, params=(), kind="county"):
+		"""A (bounded) query result as a frame with the columns and dtypes of the frame the rows were built from."""
+		connection, lock = shared_connection(self.path)
+		with lock:
+			cursor = connection.execute(sql, params)
+			df = pd.DataFrame(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+		layout = self.layout(kind)
+		df = df[[name for name, _ in layout]]
+		if "Date" in df:
+			df["Date"] = pd.to_datetime(df["Date"])
+		return df.astype(dict(layout))
+
+	def batches(self, counties):
+		names = list(dict.fromkeys(counties))
+		return [names[start:start + SQLITE_MAX_VARIABLES] for start in range(0, len(names), SQLITE_MAX_VARIABLES)]
+
+	def stats(self):
+		if self._columns is None:
+			self._columns = {row[1] for row in self.execute(f'PRAGMA table_info("{self.table}")')}
+		return self._columns - {"County", "Day", "Date"}
+
+	def max_day(self):
+		return list(self.execute(f'SELECT MAX(Day) FROM "{self.table}" WHERE County = ?', (STATE_ROW,)))[0][0]
+
+	def query(self, counties, stat, day_range):
+		if stat not in self.stats():
+			raise KeyError(stat)
+		days = day_axis(day_range)
+		values = np.full((len(counties), len(days)), np.nan)
+		rows = {county: i for i, county in enumerate(counties)}
+		for batch in self.batches(rows):
+			sql = (f'SELECT County, Day, "{stat}" FROM "{self.table}" '
+				   f'WHERE County IN ({",".join("?" * len(batch))}) AND Day > ? AND Day <= ?')
+			for county, day, value in self.execute(sql, (*batch, int(day_range[0]), int(day_range[1]))):
+				values[rows[county], day - days[0]] = np.nan if value is None else value
+		return days, values
+
+	def counties(self):
+		return [row[0] for row in self.execute(f'SELECT DISTINCT County FROM "{self.table}" WHERE County != ? ORDER BY County', (STATE_ROW,))]
+
+	def latest(self):
+		return self.frame(f'SELECT * FROM "{self.table}" JOIN (SELECT County, MAX(Day) AS Day FROM "{self.table}" '
+						  f'WHERE County != ? GROUP BY County) USING (County, Day) ORDER BY County', (STATE_ROW,))
+
+	def rows(self, counties, day_range):
+		kind = "state" if counties == [STATE_ROW] else "county"
+		frames = [self.frame(f'SELECT * FROM "{self.table}" WHERE County IN ({",".join("?" * len(batch))}) '
+							 f'AND Day > ? AND Day <= ? ORDER BY County, Day', (*batch, int(day_range[0]), int(day_range[1])), kind)
+				  for batch in self.batches(counties)]
+		if not frames:
+			return pd.DataFrame(columns=[name for name, _ in self.layout(kind)]).astype(dict(self.layout(kind)))
+		return pd.concat(frames, ignore_index=True)
+
+	def state_history(self):
+		return self.rows([STATE_ROW], [0, self.max_day()])
+
+	def sums(self, counties, columns, day_range):
+		days = day_axis(day_range)
+		sums = {column: np.zeros(len(days)) for column in columns}
+		selected = ", ".join(f'SUM("{column}")' for column in columns)
+		for batch in self.batches(counties):
+			sql = (f'SELECT Day, {selected} FROM "{self.table}" '
+				   f'WHERE County IN ({",".join("?" * len(batch))}) AND Day > ? AND Day <= ? GROUP BY Day')
+			for day, *values in self.execute(sql, (*batch, int(day_range[0]), int(day_range[1]))):
+				for column, value in zip(columns, values):
+					sums[column][day - days[0]] += value or 0
+		return sums
+
+def build_database(path, regions):
+	"""
+	Writes `{state: (over_time, state_time)}` into a fresh database, one WITHOUT ROWID table per state,
+	plus the column order and dtypes of both frames so rows read back exactly as they were loaded.
+	"""
+	tmp = f"{path}.tmp"
+	if os.path.exists(tmp):
+		os.remove(tmp)
+	connection = sqlite3.connect(tmp)
+	connection.execute(f'CREATE TABLE "{LAYOUT_TABLE}" (tbl TEXT, kind TEXT, position INTEGER, name TEXT, dtype TEXT)')
+	for state, (over_time, state_time) in regions.items():
+		table = table_name(state)
+		for kind, source in (("county", over_time), ("state", state_time)):
+			connection.executemany(f'INSERT INTO "{LAYOUT_TABLE}" VALUES (?, ?, ?, ?, ?)',
+								   [(table, kind, position, name, str(dtype)) for position, (name, dtype) in enumerate(source.dtypes.items())])
+		frames = [over_time, state_time.assign(County=STATE_ROW)]
+		columns = ["County", "Day", "Date"] + sorted(set().union(*[f.columns for f in frames]) - {"County", "Day", "Date"})
+		definitions = ", ".join(f'"{c}" {"TEXT" if c in ("County", "Date") else "INTEGER" if c == "Day" else "REAL"}' for c in columns)
+		connection.execute(f'CREATE TABLE "{table}" ({definitions}, PRIMARY KEY (County, Day)) WITHOUT ROWID')
+		insert = f'INSERT INTO "{table}" VALUES ({",".join("?" * len(columns))})'
+		for frame in frames:
+			frame = frame.reindex(columns=columns).astype({"Day": "int64", "Date": "string"})
+			connection.executemany(insert, frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None))
+	connection.commit()
+	connection.close()
+	os.replace(tmp, path)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Build the SQLite county history database.")
+	parser.add_argument('--out', default=os.path.join(os.getcwd(), 'assets', 'data', 'history.sqlite'))
+	args = parser.parse_args(argv)
+
+	from . import ga_cases
+	states = sorted(set([ga_cases.HOME_STATE] + ga_cases.region_store.available()))
+	regions = {}
+	for state in states:
+		data = ga_cases.region_data(state)
+		regions[state] = (data['over_time'], data['state_time'])
+	build_database(args.out, regions)
+	print(f"Wrote {', '.join(states)} to {args.out} ({os.path.getsize(args.out) / 2**20:.1f} MB)")
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Keeps a local mirror of the upstream `ga_data/output` tree in `assets/data/split`.
+
+Raw GitHub cannot list directories, so the files to check are derived from the report naming
+scheme (`<MMDDYYYY>/<AM|PM>/<Category>_<MMDDYYYY>_<AM|PM>.csv`): the last few local days, which
+upstream may still revise, then the days after the newest local snapshot. A report is probed through
+its `Summary` file first, so an unpublished report costs one 404, and the walk forward stops after
+`max_gap_days` consecutive days with nothing published. Each request is conditional
+(If-None-Match / If-Modified-Since), so an unchanged file costs one 304.
+
+The ETags and Last-Modified dates are kept in `.sync_state.json` next to the mirror, not inside it,
+so a sync that changes nothing leaves the data version alone.
+
+Usage (from the repository root):
+	python -m application.dash_application.sync [--base-url URL] [--recheck-days 2] [--max-gap-days 7] [--rebuild]
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import datetime as dt
+import urllib.error
+import urllib.request
+
+from .ingest import rebuild
+
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_URL = os.environ.get('DATA_REPO_URL', 'https://raw.githubusercontent.com/briannaleilani/georgia_covid_cases/master/ga_data/output')
+MIRROR_DIR = os.path.join(os.getcwd(), 'assets', 'data', 'split')
+STATE_FILE = '.sync_state.json'
+CATEGORIES = ['Age', 'CountyCases', 'Deaths', 'Gender', 'Race', 'Race_Breakdown', 'Summary', 'Testing']
+# Published with every report; checked first to tell whether a report exists
+PROBE_CATEGORY = 'Summary'
+PERIODS = ['AM', 'PM']
+FIRST_REPORT = dt.date(2020, 3, 30)
+MAX_GAP_DAYS = 7
+
+
+class MirrorSync:
+	"""
+	Conditional-request mirror of the upstream snapshot files. `sync` returns the snapshots that changed
+	and hands them to `on_change` (the ingestion step) when any did.
+	"""
+
+	def __init__(self, base_url=UPSTREAM_URL, mirror_dir=MIRROR_DIR, recheck_days=2, timeout=30, on_change=None,
+				 max_gap_days=MAX_GAP_DAYS, state_path=None):
+		self.base_url = base_url.rstrip('/')
+		self.mirror_dir = mirror_dir
+		self.recheck_days = recheck_days
+		self.max_gap_days = max_gap_days
+		self.timeout = timeout
+		self.on_change = on_change
+		self.state_path = state_path or os.path.join(os.path.dirname(os.path.abspath(mirror_dir)), STATE_FILE)
+		self.state = self.load_state()
+		self.bytes_received = 0
+		self.requests = 0
+
+	def load_state(self):
+		if os.path.exists(self.state_path):
+			with open(self.state_path) as f:
+				return json.load(f)
+		return {}
+
+	def save_state(self):
+		tmp = f"{self.state_path}.tmp"
+		with open(tmp, 'w') as f:
+			json.dump(self.state, f, indent=1, sort_keys=True)
+		os.replace(tmp, self.state_path)
+
+	def local_days(self):
+		if not os.path.isdir(self.mirror_dir):
+			return []
+		return sorted(dt.datetime.strptime(name, "%m%d%Y").date() for name in os.listdir(self.mirror_dir) if name.isdigit())
+
+	def candidate_days(self, today=None):
+		"""Days worth checking, oldest first: recent local days (may be revised) and every day after them up to today."""
+		today = today or dt.date.today()
+		days = self.local_days()
+		start = days[-1] - dt.timedelta(days=self.recheck_days - 1) if days else FIRST_REPORT
+		day = max(start, FIRST_REPORT)
+		while day <= today:
+			yield day
+			day += dt.timedelta(days=1)
+
+	@staticmethod
+	def report_paths(day, period):
+		"""Relative paths of one report's files, the probe file first."""
+		stamp = day.strftime("%m%d%Y")
+		categories = [PROBE_CATEGORY] + [category for category in CATEGORIES if category != PROBE_CATEGORY]
+		return [f"{stamp}/{period}/{category}_{stamp}_{period}.csv" for category in categories]
+
+	def fetch(self, path):
+		"""Conditionally downloads one file. Returns the status: 200 (local copy changed), 304 or 404."""
+		request = urllib.request.Request(f"{self.base_url}/{path}")
+		cached = self.state.get(path, {})
+		local_path = os.path.join(self.mirror_dir, path)
+		if os.path.exists(local_path):
+			if cached.get('etag'):
+				request.add_header('If-None-Match', cached['etag'])
+			if cached.get('last_modified'):
+				request.add_header('If-Modified-Since', cached['last_modified'])
+
+		self.requests += 1
+		try:
+			with urllib.request.urlopen(request, timeout=self.timeout) as response:
+				body = response.read()
+				headers = response.headers
+		except urllib.error.HTTPError as error:
+			if error.code in (304, 404):
+				return error.code
+			raise
+
+		self.bytes_received += len(body)
+		os.makedirs(os.path.dirname(local_path), exist_ok=True)
+		tmp = f"{local_path}.tmp"
+		with open(tmp, 'wb') as f:
+			f.write(body)
+		os.replace(tmp, local_path)
+		self.state[path] = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+		return 200
+
+	def sync(self, today=None):
+		"""
+		Checks the reports of every candidate day and returns the sorted snapshot ids (`MMDDYYYY_AM|PM`)
+		with new or changed files. Stops after `max_gap_days` consecutive days with no report upstream.
+		"""
+		changed = set()
+		gap = 0
+		for day in self.candidate_days(today):
+			published = False
+			for period in PERIODS:
+				probe, *rest = self.report_paths(day, period)
+				status = self.fetch(probe)
+				if status == 404:
+					continue
+				published = True
+				statuses = [status] + [self.fetch(path) for path in rest]
+				if 200 in statuses:
+					changed.add(f"{day.strftime('%m%d%Y')}_{period}")
+			gap = 0 if published else gap + 1
+			if gap >= self.max_gap_days:
+				break
+		self.save_state()
+		logger.info("Sync made %d requests and received %d bytes; %d snapshots changed",
+					self.requests, self.bytes_received, len(changed))
+		changed = sorted(changed, key=lambda snapshot: (snapshot[4:8], snapshot[:4], snapshot[-2:]))
+		if changed and self.on_change is not None:
+			self.on_change(changed)
+		return changed
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Mirror the upstream Georgia DPH snapshot files.")
+	parser.add_argument('--base-url', default=UPSTREAM_URL)
+	parser.add_argument('--mirror-dir', default=MIRROR_DIR)
+	parser.add_argument('--recheck-days', type=int, default=2)
+	parser.add_argument('--max-gap-days', type=int, default=MAX_GAP_DAYS,
+						help="stop after this many consecutive days with nothing published")
+	parser.add_argument('--state-file', default=None, help=f"default: {STATE_FILE} next to the mirror directory")
+	parser.add_argument('--rebuild', action='store_true', help="rebuild the merged category files and day histories when anything changed")
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO)
+	on_change = (lambda changed: rebuild(args.mirror_dir)) if args.rebuild else None
+	mirror = MirrorSync(args.base_url, args.mirror_dir, args.recheck_days, on_change=on_change,
+						max_gap_days=args.max_gap_days, state_path=args.state_file)
+	changed = mirror.sync()
+	print(f"{len(changed)} snapshots changed ({mirror.bytes_received:,} bytes): {' '.join(changed)}")
+	return changed
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
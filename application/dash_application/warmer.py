@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import time
+import logging
+import threading
+from flask import jsonify
+
+
+logger = logging.getLogger(__name__)
+
+PRESET_GROUPS = ["all", "top_10", "unassigned", "family", "districts"]
+PRESET_TABS = ["tab-1", "tab-2"]
+
+
+class CacheWarmer(threading.Thread):
+	"""
+	Background thread that precomputes the key figures and main graph figures for the preset
+	county groups x statistics x tabs over the full day range whenever a worker starts or
+	the dataset version changes. `notify` (registered as a data version listener) starts a warm
+	as soon as a change is seen; the version is also re-checked every `interval` seconds.
+	`readiness` reports ready once any version has been warmed, so a data drop or midnight does not
+	take every worker out of rotation at once; a worker still warming the new version reports `stale`.
+	A warm in which every preset failed (e.g. the data no longer loads) marks nothing warm and reports
+	the worker not ready until a later pass succeeds.
+	"""
+
+	def __init__(self, version_func, presets_func, compute_funcs, interval=60):
+		super().__init__(name="cache-warmer", daemon=True)
+		self.version_func = version_func
+		self.presets_func = presets_func
+		self.compute_funcs = compute_funcs
+		self.interval = interval
+		self.warm_version = None
+		self.warming_version = None
+		self.last_duration = None
+		self.warmed = 0
+		self.failed = 0
+		self.broken = False
+		self.wake = threading.Event()
+
+	def warm(self, version):
+		self.warming_version = version
+		started = time.monotonic()
+		warmed = failed = 0
+		for name, args in self.presets_func():
+			try:
+				self.compute_funcs[name](*args)
+				warmed += 1
+			except Exception:
+				failed += 1
+				logger.exception("Failed to warm %s%s", name, args)
+		self.warmed, self.failed = warmed, failed
+		self.last_duration = round(time.monotonic() - started, 3)
+		self.broken = failed > 0 and warmed == 0
+		if self.broken:
+			logger.error("Every preset failed to warm for data version %s", version)
+			return
+		self.warm_version = version
+		logger.info("Warmed %d presets (%d failed) for data version %s in %ss", warmed, failed, version, self.last_duration)
+
+	def notify(self, version=None):
+		self.wake.set()
+
+	def run(self):
+		while True:
+			# Cleared before the check, so a change seen while warming triggers another pass right away
+			self.wake.clear()
+			try:
+				version = self.version_func()
+				if version != self.warm_version:
+					self.warm(version)
+			except Exception:
+				logger.exception("Cache warmer failed")
+			self.wake.wait(self.interval)
+
+	def is_ready(self):
+		return self.warm_version is not None and not self.broken
+
+	def is_stale(self):
+		return self.is_ready() and self.warm_version != self.version_func()
+
+	def status(self):
+		return {
+			'status': 'failed' if self.broken else 'stale' if self.is_stale() else 'warm' if self.is_ready() else 'warming',
+			'stale': self.is_stale(),
+			'version': self.version_func(),
+			'warm_version': self.warm_version,
+			'presets_warmed': self.warmed,
+			'presets_failed': self.failed,
+			'last_duration': self.last_duration,
+		}
+
+	def readiness(self):
+		"""
+		Flask view for the load balancer: 503 until the first warm and after a warm in which every preset
+		failed, else 200 (with `stale` while re-warming).
+		"""
+		response = jsonify(self.status())
+		response.status_code = 200 if self.is_ready() else 503
+		response.headers['Cache-Control'] = 'no-store'
+		return response
@@ -0,0 +1,129 @@
+"""Streaming data export for the county selection shown in the dashboard."""
+import io
+import hashlib
+import numpy as np
+from flask import Blueprint, Response, abort, request, stream_with_context
+
+from .dash_application.ga_cases import region_store, history_store, current_version, LABEL_STATS, HOME_STATE
+from .dash_application.storage import STATE_ROW
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+export_bp = Blueprint('export_bp', __name__)
+
+# Counties written per CSV chunk / Parquet row group
+ROW_GROUP_COUNTIES = 16
+
+
+def parse_selection(args):
+    """Reads the state plus the county list, stat and day range (`start` exclusive, like the day slider) of a selection."""
+    state = args.get('state', HOME_STATE)
+    if state != HOME_STATE and state not in region_store.available():
+        abort(404, description=f"No data for state '{state}'")
+    store = history_store(state)
+    counties = args.getlist('county') or args.get('counties', STATE_ROW).split(',')
+    counties = [county.strip() for county in counties if county.strip()]
+    stat = args.get('stat')
+    max_day = int(store.max_day())
+    try:
+        day_slider = [int(args.get('start', 0)), int(args.get('end', max_day))]
+    except ValueError:
+        abort(400, description="'start' and 'end' must be whole day numbers")
+    if not 0 <= day_slider[0] < day_slider[1] <= max_day:
+        abort(400, description=f"'start' must be at least 0 and less than 'end', and 'end' at most {max_day}")
+
+    if stat is not None and stat not in LABEL_STATS:
+        abort(400, description=f"Unknown stat '{stat}'")
+    if counties != [STATE_ROW]:
+        unknown = set(counties) - set(store.counties())
+        if unknown:
+            abort(400, description=f"Unknown counties: {', '.join(sorted(unknown))}")
+    return state, counties, stat, day_slider
+
+
+def select_stat(dff, stat):
+    if stat is None:
+        return dff
+    return dff[[column for column in ['Date', 'Day', 'County', stat] if column in dff]]
+
+
+def template(state, counties, stat):
+    """An empty frame with the columns and dtypes of the selection (the rows of an empty day range)."""
+    return select_stat(history_store(state).rows(counties[:1], [0, 0]), stat)
+
+
+def row_groups(state, counties, stat, day_slider):
+    """Yields the selection a few counties at a time so only one chunk is in memory."""
+    store = history_store(state)
+    chunks = [counties[i:i + ROW_GROUP_COUNTIES] for i in range(0, len(counties), ROW_GROUP_COUNTIES)]
+    for chunk in chunks:
+        yield select_stat(store.rows(chunk, day_slider), stat)
+
+
+def stream_csv(groups):
+    header = True
+    for dff in groups:
+        yield dff.to_csv(index=False, header=header)
+        header = False
+
+
+def parquet_schema(dff):
+    """Arrow schema of a frame's dtypes: numeric and datetime dtypes map directly, anything else (text) is a string."""
+    return pa.schema([(column, pa.from_numpy_dtype(dtype) if isinstance(dtype, np.dtype) and dtype.kind in 'biufM' else pa.string())
+                      for column, dtype in dff.dtypes.items()])
+
+
+def stream_parquet(groups, schema):
+    """
+    Writes one Parquet row group per chunk and yields the bytes as soon as each is flushed. The schema is
+    fixed up front, so a chunk whose values would infer differently (all null, ints in a float column)
+    is converted to it rather than failing after the response has started.
+    """
+    sink = io.BytesIO()
+    writer = pq.ParquetWriter(sink, schema)
+    for dff in groups:
+        writer.write_table(pa.Table.from_pandas(dff, schema=schema, preserve_index=False))
+        yield drain(sink)
+    writer.close()
+    yield drain(sink)
+
+
+def drain(sink):
+    chunk = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return chunk
+
+
+@export_bp.route('/export')
+def export():
+    """Exports the selected counties, stat and day range as chunked CSV (default) or Parquet."""
+    state, counties, stat, day_slider = parse_selection(request.args)
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'parquet'):
+        abort(400, description="'format' must be 'csv' or 'parquet'")
+    if fmt == 'parquet' and pq is None:
+        abort(501, description="Parquet export requires pyarrow")
+
+    selection = f"{state}|{','.join(counties)}|{stat}|{day_slider[0]}|{day_slider[1]}|{fmt}"
+    etag = f"{current_version()}-{hashlib.sha1(selection.encode()).hexdigest()[:12]}"
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    groups = row_groups(state, counties, stat, day_slider)
+    if fmt == 'parquet':
+        body, mimetype = stream_parquet(groups, parquet_schema(template(state, counties, stat))), 'application/vnd.apache.parquet'
+    else:
+        body, mimetype = stream_csv(groups), 'text/csv'
+
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    response.headers['Content-Disposition'] = f'attachment; filename={state.lower()}_covid_{day_slider[0] + 1}_{day_slider[1]}.{fmt}'
+    return response
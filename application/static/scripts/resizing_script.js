@@ -1,6 +1,43 @@
 if (!window.dash_clientside) {
   window.dash_clientside = {};
 }
+
+// y-axis range of the points inside [lo, hi]; bar traces are stacked per x
+function visibleYRange(traces, lo, hi, stacked) {
+  var min = Infinity, max = -Infinity, positive = {}, negative = {};
+  traces.forEach(function(trace) {
+    for (var i = 0; i < trace.x.length; i++) {
+      var x = trace.x[i], y = trace.y[i];
+      if (x < lo || x > hi || y === null || isNaN(y)) continue;
+      if (stacked) {
+        var totals = y < 0 ? negative : positive;
+        totals[x] = (totals[x] || 0) + y;
+      } else {
+        min = Math.min(min, y);
+        max = Math.max(max, y);
+      }
+    }
+  });
+  if (stacked) {
+    min = 0; max = 0;
+    Object.keys(positive).forEach(function(x) { max = Math.max(max, positive[x]); });
+    Object.keys(negative).forEach(function(x) { min = Math.min(min, negative[x]); });
+  }
+  if (!isFinite(min) || !isFinite(max)) return undefined;
+  var pad = (max - min) * 0.05 || 1;
+  return [stacked && min === 0 ? 0 : min - pad, max + pad];
+}
+
+function windowedFigure(traces, layout, lo, hi, stacked) {
+  var xaxis = Object.assign({}, layout.xaxis, {range: [lo - 0.5, hi + 0.5], autorange: false});
+  var yrange = visibleYRange(traces, lo, hi, stacked);
+  var yaxis = Object.assign({}, layout.yaxis, yrange ? {range: yrange, autorange: false} : {autorange: true});
+  return {data: traces, layout: Object.assign({}, layout, {xaxis: xaxis, yaxis: yaxis})};
+}
+
+// Data version reported by the most recent poll
+var latestVersion = null;
+
 window.dash_clientside.clientside = {
   resize: function(value) {
     console.log("resizing..."); // for testing
@@ -9,5 +46,28 @@ window.dash_clientside.clientside = {
       console.log("fired resize");
     }, 500);
     return null;
+  },
+
+  // Main graph traces hold the full history; the day slider only changes the visible window
+  main_graph_range: function(data, day_slider) {
+    if (!data) {
+      return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+    }
+    var lo = day_slider[0] + 1, hi = day_slider[1];
+    return [windowedFigure(data[0], data[2], lo, hi, false), windowedFigure(data[1], data[2], lo, hi, true)];
+  },
+
+  // Each tick asks /version in the background and reports a version (found by an earlier tick) that differs
+  // from the one on screen: the version the page was rendered with until a refresh, so only a few bytes
+  // travel while the data is unchanged and a page rendered before an update refreshes on its first ticks
+  poll_version: function(n_intervals, known, rendered) {
+    fetch("/version", {cache: "no-store"})
+      .then(function(response) { return response.json(); })
+      .then(function(body) { latestVersion = body.version; })
+      .catch(function() {});
+    if (latestVersion === null || latestVersion === (known || rendered)) {
+      return window.dash_clientside.no_update;
+    }
+    return latestVersion;
   }
-};
\ No newline at end of file
+};
@@ -166,6 +166,91 @@ ALL_COUNTIES = {
      'Wilkinson': 'Wilkinson'
 }
 
+# Georgia Department of Public Health districts -> member counties (spelled as in the county data)
+HEALTH_DISTRICTS = {
+     'District 1-1 Northwest': ['Bartow', 'Catoosa', 'Chattooga', 'Dade', 'Floyd', 'Gordon', 'Haralson', 'Paulding', 'Polk', 'Walker'],
+     'District 1-2 North Georgia': ['Cherokee', 'Fannin', 'Gilmer', 'Murray', 'Pickens', 'Whitfield'],
+     'District 2 North': ['Banks', 'Dawson', 'Forsyth', 'Franklin', 'Habersham', 'Hall', 'Hart', 'Lumpkin', 'Rabun', 'Stephens',
+                          'Towns', 'Union', 'White'],
+     'District 3-1 Cobb-Douglas': ['Cobb', 'Douglas'],
+     'District 3-2 Fulton': ['Fulton'],
+     'District 3-3 Clayton': ['Clayton'],
+     'District 3-4 East Metro': ['Gwinnett', 'Newton', 'Rockdale'],
+     'District 3-5 DeKalb': ['Dekalb'],
+     'District 4 LaGrange': ['Butts', 'Carroll', 'Coweta', 'Fayette', 'Heard', 'Henry', 'Lamar', 'Meriwether', 'Pike', 'Spalding',
+                             'Troup', 'Upson'],
+     'District 5-1 South Central': ['Bleckley', 'Dodge', 'Johnson', 'Laurens', 'Montgomery', 'Pulaski', 'Telfair', 'Treutlen',
+                                    'Wheeler', 'Wilcox'],
+     'District 5-2 North Central': ['Baldwin', 'Bibb', 'Crawford', 'Hancock', 'Houston', 'Jasper', 'Jones', 'Monroe', 'Peach',
+                                    'Putnam', 'Twiggs', 'Washington', 'Wilkinson'],
+     'District 6 East Central': ['Burke', 'Columbia', 'Emanuel', 'Glascock', 'Jefferson', 'Jenkins', 'Lincoln', 'Mcduffie',
+                                 'Richmond', 'Screven', 'Taliaferro', 'Warren', 'Wilkes'],
+     'District 7 West Central': ['Chattahoochee', 'Clay', 'Crisp', 'Dooly', 'Harris', 'Macon', 'Marion', 'Muscogee', 'Quitman',
+                                 'Randolph', 'Schley', 'Stewart', 'Sumter', 'Talbot', 'Taylor', 'Webster'],
+     'District 8-1 South': ['Ben Hill', 'Berrien', 'Brooks', 'Cook', 'Echols', 'Irwin', 'Lanier', 'Lowndes', 'Tift', 'Turner'],
+     'District 8-2 Southwest': ['Baker', 'Calhoun', 'Colquitt', 'Decatur', 'Dougherty', 'Early', 'Grady', 'Lee', 'Miller',
+                                'Mitchell', 'Seminole', 'Terrell', 'Thomas', 'Worth'],
+     'District 9-1 Coastal': ['Bryan', 'Camden', 'Chatham', 'Effingham', 'Glynn', 'Liberty', 'Long', 'Mcintosh'],
+     'District 9-2 Southeast': ['Appling', 'Atkinson', 'Bacon', 'Brantley', 'Bulloch', 'Candler', 'Charlton', 'Clinch', 'Coffee',
+                                'Evans', 'Jeff Davis', 'Pierce', 'Tattnall', 'Toombs', 'Ware', 'Wayne'],
+     'District 10 Northeast': ['Barrow', 'Clarke', 'Elbert', 'Greene', 'Jackson', 'Madison', 'Morgan', 'Oconee', 'Oglethorpe',
+                               'Walton'],
+}
+
+STATE_NAMES = {
+     'AL': 'Alabama',
+     'AK': 'Alaska',
+     'AZ': 'Arizona',
+     'AR': 'Arkansas',
+     'CA': 'California',
+     'CO': 'Colorado',
+     'CT': 'Connecticut',
+     'DE': 'Delaware',
+     'DC': 'District of Columbia',
+     'FL': 'Florida',
+     'GA': 'Georgia',
+     'HI': 'Hawaii',
+     'ID': 'Idaho',
+     'IL': 'Illinois',
+     'IN': 'Indiana',
+     'IA': 'Iowa',
+     'KS': 'Kansas',
+     'KY': 'Kentucky',
+     'LA': 'Louisiana',
+     'ME': 'Maine',
+     'MD': 'Maryland',
+     'MA': 'Massachusetts',
+     'MI': 'Michigan',
+     'MN': 'Minnesota',
+     'MS': 'Mississippi',
+     'MO': 'Missouri',
+     'MT': 'Montana',
+     'NE': 'Nebraska',
+     'NV': 'Nevada',
+     'NH': 'New Hampshire',
+     'NJ': 'New Jersey',
+     'NM': 'New Mexico',
+     'NY': 'New York',
+     'NC': 'North Carolina',
+     'ND': 'North Dakota',
+     'OH': 'Ohio',
+     'OK': 'Oklahoma',
+     'OR': 'Oregon',
+     'PA': 'Pennsylvania',
+     'RI': 'Rhode Island',
+     'SC': 'South Carolina',
+     'SD': 'South Dakota',
+     'TN': 'Tennessee',
+     'TX': 'Texas',
+     'UT': 'Utah',
+     'VT': 'Vermont',
+     'VA': 'Virginia',
+     'WA': 'Washington',
+     'WV': 'West Virginia',
+     'WI': 'Wisconsin',
+     'WY': 'Wyoming'
+}
+
 COLORS = {
     'text': '#005387',
     'dark_blue': '#005387',
@@ -343,34 +428,30 @@ LIST_OF_COLORS = ['rgb(176,23,31)',
     'rgb(0,206,209)',
     'rgb(240,255,255)']
 
-# GEORGIA DAYS OF OUTBREAK WITH DATES DICTIONARY
-import os
-
-cwd = os.getcwd()
-
-data_dir = f'/{cwd}/assets/data/resources'
-
-date_day = pd.read_csv(f"{data_dir}/date_dict.csv")
-
-date = pd.to_datetime(date_day["Date"], dayfirst=True).dt.strftime('%m/%d/%Y').tolist()
-DAY_DICT = dict(zip(date, range(1,len(date)+1))) # DATES AS KEYS
-DATE_DICT = dict(zip(range(1,len(date)+1), date)) # DAYS AS KEYS
-
-
 LABEL_STATS = {
         "TotalCases": "Confirmed Cases",
         "TotalDeaths": "Confirmed Deaths",
         "nConfirmed_Change": "Cases Increase",
         "nDeaths_Change": "Deaths Increase",
         "Infection_per_100k": "Cases per 100k Population",
-        "Deaths_per_100k": "Deaths per 100k Population"
+        "Deaths_per_100k": "Deaths per 100k Population",
+        "Cases_7Day_Avg": "7-Day Average Cases Increase",
+        "Deaths_7Day_Avg": "7-Day Average Deaths Increase",
+        "Cases_WoW_Growth": "Week-over-Week Case Growth (%)",
+        "Doubling_Time": "Case Doubling Time (Days)",
+        "Days_Since_10th_Case": "Days Since 10th Case"
         }
 
 BAR_STATS = {
             "TotalCases": ["Confirmed COVID-19 Cases", False],
             "TotalDeaths": ["Confirmed COVID-19 Deaths", False],
             "nConfirmed_Change": ["COVID-19 Case Increase", False],
-            "nDeaths_change": ["COVID-19 Deaths Increase", False],
+            "nDeaths_Change": ["COVID-19 Deaths Increase", False],
             "Infection_per_100k": ["Cases per 100k Population", True],
-            "Deaths_per_100k": ["Deaths per 100k Population", True]
+            "Deaths_per_100k": ["Deaths per 100k Population", True],
+            "Cases_7Day_Avg": ["7-Day Average COVID-19 Case Increase", False],
+            "Deaths_7Day_Avg": ["7-Day Average COVID-19 Deaths Increase", False],
+            "Cases_WoW_Growth": ["Week-over-Week Case Growth (%)", True],
+            "Doubling_Time": ["Case Doubling Time (Days)", True],
+            "Days_Since_10th_Case": ["Days Since 10th Case", True]
             }
@@ -0,0 +1,58 @@
+"""Correctness and payload check of the main graph's LTTB downsampling and WebGL switch.
+
+Checks the vectorized `lttb_indices` against a plain one-series-at-a-time LTTB, then builds the
+main graph traces for growing histories and prints build time and serialized size with and
+without downsampling.
+
+Usage (from the repository root):
+    python -m benchmarks.downsampling --counties 10 159 --days 90 1000 5000
+"""
+import time
+import argparse
+import numpy as np
+
+from application.dash_application import figures, serialization
+from application.dash_application.day_calendar import format_days
+from tests.figure_reference import COLORS, reference_lttb
+
+
+def check_equivalence(rng):
+    x = np.arange(1, 2001, dtype=float)
+    y = np.cumsum(rng.normal(size=(25, 2000)), axis=1)
+    indices = figures.lttb_indices(x, y, 300)
+    for row in range(len(y)):
+        assert indices[row].tolist() == reference_lttb(x, y[row], 300), f"row {row} differs from reference LTTB"
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counties', type=int, nargs='+', default=[10, 159])
+    parser.add_argument('--days', type=int, nargs='+', default=[90, 1000, 5000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    check_equivalence(rng)
+    print(f"{'counties':>8} {'days':>6} {'full (ms)':>10} {'full (KB)':>10} {'reduced (ms)':>13} {'reduced (KB)':>13} {'line type':>10}")
+    for n_days in args.days:
+        for n_counties in args.counties:
+            days = np.arange(1, n_days + 1)
+            values = np.cumsum(rng.poisson(5, size=(n_counties, n_days)), axis=1).astype(float)
+            counties = [f"County {i}" for i in range(n_counties)]
+            build = lambda **options: figures.count_traces(counties, days.tolist(), format_days(days), values, COLORS, **options)
+            full_ms, full = timed(build, max_points=None, webgl_threshold=None)
+            reduced_ms, reduced = timed(build)
+            print(f"{n_counties:>8} {n_days:>6} {full_ms:>10.1f} {len(serialization.dumps(full)) / 1024:>10.0f} "
+                  f"{reduced_ms:>13.1f} {len(serialization.dumps(reduced)) / 1024:>13.0f} {reduced[0][0]['type']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Equivalence and speed check of the plain-dict figure builder against plotly.graph_objects.
+
+Builds the main graph traces for a growing number of counties both ways, asserts that the
+serialized JSON is identical, and prints the build time of each.
+
+Usage (from the repository root):
+    python -m benchmarks.figure_builder --counties 1 10 159 --days 90 1000
+"""
+import time
+import argparse
+import numpy as np
+
+from tests.figure_reference import as_json, builder_traces, plotly_traces, stacked_bar_layouts
+
+
+def check_equivalence():
+    """Stacked bar layout with axis titles, built both ways."""
+    built, expected = stacked_bar_layouts()
+    assert built == expected
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counties', type=int, nargs='+', default=[1, 10, 159])
+    parser.add_argument('--days', type=int, nargs='+', default=[90, 1000])
+    args = parser.parse_args()
+
+    check_equivalence()
+    print(f"{'counties':>8} {'days':>6} {'graph_objects (ms)':>19} {'builder (ms)':>13} {'speedup':>8}")
+    rng = np.random.default_rng(0)
+    for n_days in args.days:
+        for n_counties in args.counties:
+            days = np.arange(1, n_days + 1)
+            values = rng.poisson(50, size=(n_counties, n_days)).astype(float)
+            counties = [f"County {i}" for i in range(n_counties)]
+            plotly_ms, expected = timed(plotly_traces, counties, days, values)
+            builder_ms, result = timed(builder_traces, counties, days, values)
+            assert as_json(result) == as_json(expected), f"builder output differs ({n_counties} counties, {n_days} days)"
+            print(f"{n_counties:>8} {n_days:>6} {plotly_ms:>19.1f} {builder_ms:>13.2f} {plotly_ms / builder_ms:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
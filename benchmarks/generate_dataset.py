@@ -0,0 +1,92 @@
+"""Synthetic county histories in the `ga_90days.csv` layout for load and scaling tests.
+
+Usage (from the repository root):
+    python -m benchmarks.generate_dataset --counties 3000 --days 1000 --out /tmp/ZZ.csv
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from application.dash_application.day_calendar import format_days
+
+COLUMNS = ["Date", "Day", "County", "fips", "Population", "TotalCases", "TotalDeaths", "PctPopInfected",
+           "Infection_per_100k", "Deaths_per_100k", "Deaths_per_100_Infections", "nConfirmed_Change",
+           "nDeaths_Change", "pConfirmed_Change", "pDeaths_Change", "Fatality_Rate"]
+
+
+def generate_county_history(n_counties=159, n_days=90, seed=0):
+    """
+    Returns a county x day history shaped like `ga_90days.csv`. Each county follows a few
+    overlapping epidemic waves scaled by a log-normal population, with Poisson daily cases,
+    deaths as a lagged fraction of cases, and occasional negative reporting corrections.
+    """
+    rng = np.random.default_rng(seed)
+    days = np.arange(n_days)
+
+    population = np.round(rng.lognormal(mean=10.2, sigma=1.1, size=n_counties)).clip(1500, 5000000)
+    attack_rate = rng.uniform(0.02, 0.15, size=(n_counties, 1))
+    rate = np.zeros((n_counties, n_days))
+    for _ in range(max(1, n_days // 120)):
+        peak = rng.uniform(0, n_days, size=(n_counties, 1))
+        width = rng.uniform(8, 30, size=(n_counties, 1))
+        rate += np.exp(-0.5 * ((days - peak) / width) ** 2) / (width * np.sqrt(2 * np.pi))
+    rate *= attack_rate * population[:, None] / max(1, n_days // 120)
+
+    new_cases = rng.poisson(rate).astype(float)
+    corrections = rng.random((n_counties, n_days)) < 0.01
+    new_cases[corrections] = -np.round(new_cases[corrections] * rng.uniform(0.1, 0.5, corrections.sum()))
+    total_cases = np.cumsum(new_cases, axis=1).clip(0)
+    new_cases = np.diff(total_cases, axis=1, prepend=0)
+
+    fatality = rng.uniform(0.01, 0.05, size=(n_counties, 1))
+    lagged = np.zeros_like(new_cases)
+    lagged[:, 14:] = new_cases[:, :-14]
+    new_deaths = rng.binomial(lagged.clip(0).astype(int), fatality).astype(float)
+    total_deaths = np.cumsum(new_deaths, axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prev_cases = np.roll(total_cases, 1, axis=1)
+        prev_deaths = np.roll(total_deaths, 1, axis=1)
+        prev_cases[:, 0] = prev_deaths[:, 0] = 0
+        pct_cases = np.where(prev_cases > 0, new_cases / prev_cases, 0)
+        pct_deaths = np.where(prev_deaths > 0, new_deaths / prev_deaths, 0)
+        fatality_rate = np.where(total_cases > 0, total_deaths / total_cases, 0)
+
+    pop = np.repeat(population, n_days).reshape(n_counties, n_days)
+    names = np.array([f"County {i:04d}" for i in range(n_counties)])
+    df = pd.DataFrame({
+        "Date": np.tile(format_days(days + 1), n_counties),
+        "Day": np.tile(days + 1, n_counties),
+        "County": np.repeat(names, n_days),
+        "fips": np.repeat(90000.0 + np.arange(n_counties), n_days),
+        "Population": pop.ravel(),
+        "TotalCases": total_cases.ravel(),
+        "TotalDeaths": total_deaths.ravel(),
+        "PctPopInfected": (total_cases / pop).round(4).ravel(),
+        "Infection_per_100k": (total_cases / pop * 100000).round().ravel(),
+        "Deaths_per_100k": (total_deaths / pop * 100000).round().ravel(),
+        "Deaths_per_100_Infections": (fatality_rate * 100).round().ravel(),
+        "nConfirmed_Change": new_cases.ravel(),
+        "nDeaths_Change": new_deaths.ravel(),
+        "pConfirmed_Change": pct_cases.round(4).ravel(),
+        "pDeaths_Change": pct_deaths.round(4).ravel(),
+        "Fatality_Rate": fatality_rate.round(4).ravel(),
+    })
+    return df[COLUMNS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counties', type=int, default=159)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True, help="CSV path, e.g. assets/data/regions/ZZ.csv")
+    args = parser.parse_args()
+
+    df = generate_county_history(args.counties, args.days, args.seed)
+    df.to_csv(args.out, index=False)
+    print(f"Wrote {len(df):,} rows ({args.counties} counties x {args.days} days) to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
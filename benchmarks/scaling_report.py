@@ -0,0 +1,117 @@
+"""Scaling report for data loading and the dashboard callback paths on synthetic data.
+
+Generates county histories of growing size, loads each one through the same region layer
+the dashboard uses, then times the callback computations uncached and fits a power law
+(time ~ size^k) per callback. k near 1 is linear, near 2 is quadratic.
+
+Usage (from the repository root):
+    python -m benchmarks.scaling_report --counties 159 500 1000 3000 --days 90 250 500 1000
+"""
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+from application.dash_application import ga_cases
+from application.dash_application.regions import RegionStore
+from benchmarks.generate_dataset import generate_county_history
+
+STATE = 'ZZ'
+
+
+def timed(func, *args, repeat=3):
+    """Best wall time of `repeat` calls, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def callback_paths(over_time, n_days):
+    """The callback computations to time, each with the inputs a user would send."""
+    counties = over_time['County'].unique().tolist()
+    top_10, everyone = counties[:10], counties
+    day_slider = [0, n_days]
+    return {
+        'store rows (all counties)': (lambda: ga_cases.history_store(STATE).rows(everyone, day_slider), ()),
+        'selection_history (10 counties)': (ga_cases.selection_history, (top_10, 'TotalCases', day_slider, STATE)),
+        'selection_history (all counties)': (ga_cases.selection_history, (everyone, 'TotalCases', day_slider, STATE)),
+        'key_figures (10 counties)': (ga_cases.key_figures.__wrapped__, (top_10, list(day_slider), STATE)),
+        'key_figures (state)': (ga_cases.key_figures.__wrapped__, (['All Counties'], list(day_slider), STATE)),
+        'count_figure (10 counties)': (ga_cases.count_figure.__wrapped__, ('TotalCases', 'tab-1', top_10, STATE)),
+        'count_figure (all counties)': (ga_cases.count_figure.__wrapped__, ('TotalCases', 'tab-1', everyone, STATE)),
+    }
+
+
+def measure(n_counties, n_days, workdir):
+    ga_cases.region_store = RegionStore(workdir, ga_cases.load_region, max_bytes=2**40)
+    generate_county_history(n_counties, n_days).to_csv(os.path.join(workdir, f'{STATE}.csv'), index=False)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    region = ga_cases.region_data(STATE)
+    load_ms = (time.perf_counter() - started) * 1000
+    peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    over_time = region['over_time']
+    row = {
+        'counties': n_counties,
+        'days': int(over_time['Day'].max()),
+        'load (ms)': load_ms,
+        'load peak (MB)': peak_mb,
+        'resident (MB)': ga_cases.region_store.nbytes() / 2**20,
+    }
+    repeat = 1 if n_counties * n_days > 500000 else 3
+    for name, (func, args) in callback_paths(over_time, row['days']).items():
+        row[name] = timed(func, *args, repeat=repeat)
+    return row
+
+
+def print_table(rows):
+    columns = list(rows[0])
+    widths = [max(len(column), 10) for column in columns]
+    print('  '.join(column.rjust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print('  '.join((f'{row[c]:.1f}' if isinstance(row[c], float) else str(row[c])).rjust(w)
+                        for c, w in zip(columns, widths)))
+
+
+def print_curves(rows, axis):
+    """Fits log(time) = k * log(size) + c along `axis` and prints the exponent per measurement."""
+    sizes = np.array([row[axis] for row in rows], dtype=float)
+    if len(set(sizes)) < 2:
+        return
+    print(f'\nScaling exponent k (time ~ {axis}^k):')
+    for name in list(rows[0])[2:]:
+        values = np.array([max(row[name], 1e-3) for row in rows])
+        k = np.polyfit(np.log(sizes), np.log(values), 1)[0]
+        bar = '#' * int(round(max(k, 0) * 10))
+        print(f'  {name:<34} k={k:5.2f}  {bar}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counties', type=int, nargs='+', default=[159, 500, 1000, 3000])
+    parser.add_argument('--days', type=int, nargs='+', default=[90, 250, 500, 1000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        base_days, base_counties = args.days[0], args.counties[0]
+        by_counties = [measure(n, base_days, workdir) for n in args.counties]
+        by_days = [measure(base_counties, n, workdir) for n in args.days]
+
+    print(f'\n== Growing counties ({base_days} days)')
+    print_table(by_counties)
+    print_curves(by_counties, 'counties')
+    print(f'\n== Growing days ({base_counties} counties)')
+    print_table(by_days)
+    print_curves(by_days, 'days')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Speed check of the callback response serializer against the stock Plotly encoders.
+
+Builds real callback responses from the loaded dataset (main graph data for growing county
+selections, the county table bar charts, a demographic tab and the key figures) and prints the
+encoding time of each engine: `json` (PlotlyJSONEncoder), `orjson` (Plotly's orjson engine, which
+Dash and Plotly already use whenever orjson is installed) and `dumps`. The speedup is against the
+`orjson` engine, the encoder `dumps` replaces. tests/test_serialization.py checks that the engines
+agree.
+
+Usage (from the repository root):
+    python -m benchmarks.serializer --counties 10 50 161
+"""
+import time
+import argparse
+import pandas as pd
+import dash_core_components as dcc
+from plotly.io.json import to_json_plotly
+
+from application.dash_application import ga_cases, serialization
+
+
+def timed(func, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def response(output, prop, value):
+    """A callback response body as Dash wraps it."""
+    return {"multi": True, "response": {output: {prop: value}}}
+
+
+def table_graphs(columns):
+    """The county table bar charts, with pandas Series for x and y as `update_graphs` builds them."""
+    dff = pd.DataFrame(ga_cases.county_table_records())
+    return [dcc.Graph(id=column, figure={
+        "data": [{"x": dff["County"], "y": dff[column], "type": "bar", "marker": {"color": ['#005387'] * len(dff)}}],
+        "layout": {"xaxis": {"automargin": True}, "yaxis": {"automargin": True, "title": {"text": column}}, "height": 250},
+    }) for column in columns]
+
+
+def payloads(county_counts):
+    counties = ga_cases.history_store(ga_cases.HOME_STATE).counties()
+    day_slider = [0, ga_cases.latest_day()]
+    for n in county_counts:
+        for stat in ["TotalCases", "Cases_7Day_Avg"]:
+            data = ga_cases.count_figure.__wrapped__(stat, 'tab-1', counties[:n], ga_cases.HOME_STATE)
+            yield f"main graph, {n} counties, {stat}", response("main_graph_data", "data", data)
+    yield "county table graphs", response("datatable-interactivity-container", "children",
+                                          table_graphs(["Cases", "CasesPer100kPop", "Deaths"]))
+    yield "demographic tab", response("demographic_tabs_content", "children", ga_cases.demographic_tab_content.__wrapped__("race"))
+    yield "key figures", response("aggregate_data", "data", ga_cases.key_figures.__wrapped__(['All Counties'], day_slider))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counties', type=int, nargs='+', default=[10, 50, 161])
+    args = parser.parse_args()
+
+    engines = {
+        'json': lambda value: to_json_plotly(value, engine='json'),
+        'orjson': lambda value: to_json_plotly(value, engine='orjson'),
+        'dumps': serialization.dumps,
+    }
+    print(f"{'payload':<42} {'KB':>7} " + " ".join(f"{name + ' (ms)':>12}" for name in engines) + f" {'speedup':>8}")
+    for name, payload in payloads(args.counties):
+        times = {}
+        for engine, encode in engines.items():
+            times[engine], encoded = timed(encode, payload)
+        print(f"{name:<42} {len(encoded) / 1024:>7.0f} " + " ".join(f"{times[engine]:>12.2f}" for engine in engines)
+              + f" {times['orjson'] / times['dumps']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,4 +11,30 @@ class Config:
 
     # Static Assets
     STATIC_FOLDER = environ.get('STATIC_FOLDER')
-    TEMPLATES_FOLDER = environ.get('TEMPLATES_FOLDER')
\ No newline at end of file
+    TEMPLATES_FOLDER = environ.get('TEMPLATES_FOLDER')
+
+    # Longest wait (seconds) before the cache warmer checks for a new dataset version; a change seen
+    # by a request wakes it at once
+    CACHE_WARM_INTERVAL = int(environ.get('CACHE_WARM_INTERVAL', 30))
+
+    # Memory cap for lazily loaded non-Georgia state histories
+    REGION_CACHE_MB = int(environ.get('REGION_CACHE_MB', 64))
+
+    # SQLite county history built by `storage.py`; empty keeps the history in memory
+    HISTORY_DB = environ.get('HISTORY_DB', '')
+
+    # Directory for per-computation lock files shared by workers; empty coalesces within each worker only
+    SINGLE_FLIGHT_LOCK_DIR = environ.get('SINGLE_FLIGHT_LOCK_DIR', '')
+
+    # SQLite file of computed results shared by all workers and kept across restarts; empty disables it
+    RESULT_CACHE_DB = environ.get('RESULT_CACHE_DB', '')
+    RESULT_CACHE_MB = int(environ.get('RESULT_CACHE_MB', 256))
+
+    # Seconds between open dashboards' checks for a new data version
+    VERSION_POLL_SECONDS = int(environ.get('VERSION_POLL_SECONDS', 300))
+
+    # Per-worker admission control of expensive callbacks: concurrent computations, waiting calls, and
+    # the longest wait (seconds) before a call gets a reduced result or a 503
+    ADMISSION_CONCURRENCY = int(environ.get('ADMISSION_CONCURRENCY', 4))
+    ADMISSION_QUEUE = int(environ.get('ADMISSION_QUEUE', 16))
+    ADMISSION_BUDGET_SECONDS = float(environ.get('ADMISSION_BUDGET_SECONDS', 10))
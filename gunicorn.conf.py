@@ -0,0 +1,14 @@
+"""Gunicorn settings: threaded workers sharing one copy of the loaded data per process."""
+from os import environ
+
+bind = f"0.0.0.0:{environ.get('PORT', 8000)}"
+
+# gthread: each worker process serves several requests at once, so one slow callback
+# does not block the others and the datasets are loaded once per process, not per request slot
+worker_class = 'gthread'
+workers = int(environ.get('WEB_CONCURRENCY', 1))
+threads = int(environ.get('GUNICORN_THREADS', 8))
+timeout = 300
+
+# Not preloaded: the cache warmer thread is started in create_app() and threads do not survive fork
+preload_app = False
@@ -19,13 +19,19 @@ setup(
     classifiers=[],
     keywords='Plotly Dash Flask Data',
     packages=find_packages(),
-     install_requires=['pandas',
+    python_requires='>=3.11',
+     install_requires=['pandas>=2.0',
                       'numpy',
                       'geopandas',
                       'plotly',
-                      'dash',
+                      'dash>=2.0,<3',
                       'gunicorn',
                       'flask'],
+    extras_require={
+        'fast': ['orjson>=3.10'],
+        'parquet': ['pyarrow'],
+        'test': ['pytest'],
+    },
     entry_points={
         'console_scripts': [
             'run = wsgi:main',
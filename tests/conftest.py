@@ -0,0 +1,13 @@
+import pytest
+
+from application import create_app
+
+
+@pytest.fixture(scope='session')
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,61 @@
+"""Reference implementations the figure builder is checked against, shared by the tests and the benchmarks."""
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.utils import PlotlyJSONEncoder
+
+from application.dash_application import figures
+from application.dash_application.day_calendar import format_days
+
+COLORS = ['#005387', '#f2b705', '#7fb3d5', '#d98c10', '#1d3557', '#a8dadc', '#e63946', '#457b9d']
+
+
+def as_json(value):
+    return json.loads(json.dumps(value, cls=PlotlyJSONEncoder))
+
+
+def plotly_traces(counties, days, values):
+    """The main graph traces as the dashboard built them before, with validated graph objects."""
+    date_text, day_text = format_days(days), days.tolist()
+    traces = []
+    for i, county in enumerate(counties):
+        hover = dict(customdata=date_text, text=day_text, meta=county, hoverlabel={'align': 'left'},
+                     hovertemplate=figures.COUNT_HOVERTEMPLATE)
+        traces.append(go.Scatter(mode="lines+markers", marker_color=COLORS[i % len(COLORS)], x=day_text, y=values[i], name=county, **hover))
+        traces.append(go.Bar(name=county, x=day_text, y=values[i], marker_color=COLORS[i % len(COLORS)], **hover))
+    layout = go.Layout(**figures.thaw(figures.COUNT_LAYOUT), title="Total Cases")
+    return [trace.to_plotly_json() for trace in traces], layout.to_plotly_json()
+
+
+def builder_traces(counties, days, values):
+    """The same traces from the plain-dict figure builder, without downsampling or WebGL."""
+    lines, bars = figures.count_traces(counties, days.tolist(), format_days(days), values, COLORS,
+                                       max_points=None, webgl_threshold=None)
+    traces = [trace for pair in zip(lines, bars) for trace in pair]
+    return traces, figures.layout(figures.COUNT_LAYOUT, "Total Cases")
+
+
+def stacked_bar_layouts():
+    """(builder, graph objects) stacked bar layout with axis titles, as JSON."""
+    expected = go.Layout(**figures.thaw(figures.STACKED_BAR_LAYOUT), title="T", xaxis_title="X", yaxis_title="Y").to_plotly_json()
+    return as_json(figures.layout(figures.STACKED_BAR_LAYOUT, "T", "X", "Y")), as_json(expected)
+
+
+def reference_lttb(x, y, n_out):
+    """Textbook LTTB of one series."""
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picked, anchor = [0], 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x, next_y = np.mean(x[end:next_end]), np.mean(y[end:next_end])
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((x[anchor] - next_x) * (y[i] - y[anchor]) - (x[anchor] - x[i]) * (next_y - y[anchor]))
+            if area > best_area:
+                best, best_area = i, area
+        picked.append(best)
+        anchor = best
+    return picked + [n - 1]
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from application.dash_application import admission, ga_cases
+from application.dash_application.admission import AdmissionGate, Overloaded
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def blocked():
+    """A call that holds its slot until released."""
+    release = threading.Event()
+    yield lambda: release.wait(5)
+    release.set()
+
+
+def background(gate, func):
+    thread = threading.Thread(target=gate.run, args=(func,), daemon=True)
+    thread.start()
+    return thread
+
+
+def test_sheds_when_the_queue_is_full(blocked):
+    gate = AdmissionGate('test', concurrency=1, queue_size=1, budget=5)
+    background(gate, blocked)
+    wait_until(lambda: gate.running == 1)
+    background(gate, lambda: None)
+    wait_until(lambda: gate.waiting == 1)
+    assert gate.run(lambda: 'computed', fallback=lambda: 'fallback') == 'fallback'
+    assert gate.shed == 1
+
+
+def test_sheds_when_the_expected_wait_exceeds_the_budget(blocked):
+    gate = AdmissionGate('test', concurrency=2, queue_size=16, budget=10)
+    gate.average_seconds = 30.0
+    background(gate, blocked)
+    wait_until(lambda: gate.running == 1)
+    with pytest.raises(Overloaded):
+        gate.run(lambda: 'computed')
+
+
+def test_recovers_after_one_slow_call(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(admission.time, 'monotonic', lambda: clock[0])
+
+    def slow():
+        clock[0] += 45.0
+
+    gate = AdmissionGate('test', concurrency=4, queue_size=16, budget=10)
+    gate.run(slow)
+    assert gate.expected_wait() > gate.budget
+    # Nothing is running, so each call is admitted as a probe and brings the estimate back down
+    for _ in range(10):
+        assert gate.run(lambda: 'computed', fallback=lambda: 'fallback') == 'computed'
+    assert gate.expected_wait() < gate.budget
+    assert gate.shed == 0
+
+
+def test_cached_results_bypass_a_shedding_gate(monkeypatch, blocked):
+    gate = AdmissionGate('test', concurrency=1, queue_size=0, budget=5)
+    monkeypatch.setitem(ga_cases.admission_gates, 'test', gate)
+    background(gate, blocked)
+    wait_until(lambda: gate.running == 1)
+
+    def func(value):
+        return f'computed {value}'
+    func.is_cached = lambda value: value == 'cached'
+    assert ga_cases.admitted('test', func, 'cached', fallback=lambda: 'fallback') == 'computed cached'
+    assert ga_cases.admitted('test', func, 'new', fallback=lambda: 'fallback') == 'fallback'
+
+
+def test_shed_key_figures_answer_503_with_retry_after(client, monkeypatch, blocked):
+    gate = AdmissionGate('key_figures', concurrency=1, queue_size=0, budget=5)
+    monkeypatch.setitem(ga_cases.admission_gates, 'key_figures', gate)
+    background(gate, blocked)
+    wait_until(lambda: gate.running == 1)
+
+    value = lambda component, prop, value: {'id': component, 'property': prop, 'value': value}
+    response = client.post('/_dash-update-component', json={
+        'output': 'aggregate_data.data',
+        'outputs': {'id': 'aggregate_data', 'property': 'data'},
+        'inputs': [value('county_options_menu', 'value', ['Appling', 'Bacon', 'Baker']), value('day_slider', 'value', [3, 17]),
+                   value('state_selector', 'value', ga_cases.HOME_STATE), value('data_version', 'data', None)],
+        'changedPropIds': ['day_slider.value'],
+    })
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(admission.RETRY_AFTER_SECONDS)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from application.dash_application.aggregation import COUNT_COLUMNS, GroupAggregator, StoreAggregator
+from application.dash_application.ga_cases import HEALTH_DISTRICTS
+from application.dash_application.storage import MemoryStore
+
+DISTRICT = 'District 3-1 Cobb-Douglas'
+COUNTIES = {
+    # population, TotalCases, TotalDeaths over days 1-3
+    'Cobb': (100000, [10, 30, 60], [0, 1, 3]),
+    'Douglas': (50000, [5, 5, 20], [0, 0, 1]),
+    'Fulton': (200000, [40, 80, 100], [1, 2, 2]),
+}
+
+
+def history():
+    rows = []
+    for county, (population, cases, deaths) in COUNTIES.items():
+        for day in range(3):
+            rows.append({'County': county, 'Day': day + 1, 'Population': population, 'TotalCases': cases[day],
+                         'TotalDeaths': deaths[day], 'nConfirmed_Change': cases[day] - (cases[day - 1] if day else 0),
+                         'nDeaths_Change': deaths[day] - (deaths[day - 1] if day else 0)})
+    over_time = pd.DataFrame(rows)
+    return over_time, over_time.groupby('Day', as_index=False)[COUNT_COLUMNS].sum()
+
+
+@pytest.fixture(params=['dense', 'store'])
+def aggregator(request):
+    over_time, state_time = history()
+    groups = {DISTRICT: HEALTH_DISTRICTS[DISTRICT]}
+    if request.param == 'dense':
+        return GroupAggregator(over_time, groups)
+    return StoreAggregator(MemoryStore(over_time, state_time), groups)
+
+
+def series(aggregator, items, stat):
+    return aggregator.query(items, stat, [0, 3])[1][0]
+
+
+def test_district_rates_are_summed_counts_over_summed_population(aggregator):
+    assert HEALTH_DISTRICTS[DISTRICT] == ['Cobb', 'Douglas']
+    # Cobb + Douglas: 15, 35, 80 cases and 0, 1, 4 deaths in 150,000 people
+    np.testing.assert_array_equal(series(aggregator, [DISTRICT], 'TotalCases'), [15, 35, 80])
+    np.testing.assert_array_equal(series(aggregator, [DISTRICT], 'nConfirmed_Change'), [15, 20, 45])
+    np.testing.assert_array_equal(series(aggregator, [DISTRICT], 'Population'), [150000] * 3)
+    np.testing.assert_allclose(series(aggregator, [DISTRICT], 'Infection_per_100k'), [10.0, 23.33, 53.33])
+    np.testing.assert_allclose(series(aggregator, [DISTRICT], 'Deaths_per_100k'), [0.0, 0.67, 2.67])
+    np.testing.assert_allclose(series(aggregator, [DISTRICT], 'Fatality_Rate'), [0.0, 0.0286, 0.05])
+    # New cases over the previous day's total: 20 / 15, 45 / 35
+    np.testing.assert_allclose(series(aggregator, [DISTRICT], 'pConfirmed_Change'), [0.0, 1.3333, 1.2857])
+    # Not the mean of the county rates (60 and 40 per 100k on day 3)
+    assert series(aggregator, [DISTRICT], 'Infection_per_100k')[-1] != 50.0
+
+
+def test_selection_counts_each_county_once(aggregator):
+    for stat in ('TotalCases', 'Infection_per_100k'):
+        np.testing.assert_array_equal(series(aggregator, [DISTRICT, 'Cobb'], stat), series(aggregator, [DISTRICT], stat))
+    # District and a county outside it: 60 + 20 + 100 cases in 350,000 people
+    np.testing.assert_allclose(aggregator.aggregate([[DISTRICT, 'Fulton']])['Infection_per_100k'][0], [15.71, 32.86, 51.43])
+
+
+def test_totals_over_a_day_range(aggregator):
+    totals = aggregator.totals([DISTRICT], [1, 3])
+    assert (totals['TotalCases'], totals['TotalDeaths']) == (80, 4)
+    # Increases over days 2-3
+    assert (totals['nConfirmed_Change'], totals['nDeaths_Change']) == (65, 4)
+    assert totals['Infection_per_100k'] == pytest.approx(53.33)
+    assert totals['Fatality_Rate'] == pytest.approx(0.05)
@@ -0,0 +1,16 @@
+import pytest
+
+
+def test_counties_accepts_repeated_and_comma_separated_forms(client):
+    repeated = client.get('/api/v1/series?county=Fulton&county=Cobb&stat=TotalCases').get_json()
+    plural = client.get('/api/v1/series?counties=Fulton,Cobb&stats=TotalCases').get_json()
+    assert set(repeated['series']['TotalCases']) == {'Fulton', 'Cobb'}
+    assert repeated['series'] == plural['series']
+
+
+@pytest.mark.parametrize('url', ['/api/v1/series?countys=Fulton', '/api/v1/state?stat=TotalCases',
+                                 '/api/v1/meta?state=GA', '/api/v1/demographics/age?day=3'])
+def test_unknown_query_parameters_are_rejected(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert 'Unknown query parameters' in response.get_json()['description']
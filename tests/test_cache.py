@@ -0,0 +1,44 @@
+import os
+
+from application.dash_application.cache import SharedCache, SingleFlight
+
+
+def test_lock_files_kept_for_the_current_version_only(tmp_path):
+    flight = SingleFlight(str(tmp_path))
+    for key in range(5):
+        assert flight.do(('v1', key), lambda: key, 'v1') == key
+    assert os.listdir(tmp_path) == ['v1'] and len(os.listdir(tmp_path / 'v1')) == 5
+
+    flight.do(('v2', 0), lambda: 0, 'v2')
+    assert os.listdir(tmp_path) == ['v2'] and len(os.listdir(tmp_path / 'v2')) == 1
+
+
+def test_shared_cache_keeps_a_running_size_and_evicts_least_recently_used(tmp_path):
+    cache = SharedCache(str(tmp_path / 'results.sqlite'), max_bytes=3000)
+    for key in range(3):
+        cache.set('v1', key, b'x' * 900)
+    bytes_stored = lambda: cache.connection().execute("SELECT bytes FROM totals").fetchone()[0]
+    sizes = lambda: cache.connection().execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    assert bytes_stored() == sizes()
+
+    # A hit is not written until its batch is flushed; the next write flushes it before evicting
+    assert cache.get('v1', 0) == b'x' * 900
+    assert cache._touched
+    cache.set('v1', 3, b'x' * 900)
+    assert cache.get('v1', 0) is not None and cache.get('v1', 1) is None
+    assert bytes_stored() == sizes() <= 3000
+
+    cache.set('v1', 3, b'y' * 100)
+    assert bytes_stored() == sizes()
+    cache.set('v2', 0, b'z')
+    assert cache.get('v1', 3) is None and bytes_stored() == sizes()
+
+
+def test_shared_cache_totals_survive_reopening(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    SharedCache(path).set('v1', 'a', b'x' * 500)
+    cache = SharedCache(path)
+    cache.version = 'v1'
+    cache.set('v1', 'b', b'x' * 500)
+    assert cache.connection().execute("SELECT bytes FROM totals").fetchone()[0] == \
+        cache.connection().execute("SELECT SUM(size) FROM results").fetchone()[0]
@@ -0,0 +1,15 @@
+import datetime as dt
+
+from application.dash_application.day_calendar import date_to_day, day_to_date, format_dates, format_days, today_day
+
+
+def test_days_round_trip_past_the_original_date_table():
+    assert str(day_to_date(1)) == '2020-03-02'
+    assert date_to_day(day_to_date([1, 63, 2500])).tolist() == [1, 63, 2500]
+    assert today_day(dt.date(2020, 3, 3)) == 2
+
+
+def test_labels():
+    assert format_days([1, 305]) == ['03/02/2020', '12/31/2020']
+    # `%x`, as the tables have always shown it
+    assert format_dates(day_to_date([1, 305]), short_year=True) == ['03/02/20', '12/31/20']
@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from application.dash_application.deaths_cube import DeathsCube, UNKNOWN
+
+
+def line_list():
+    rng = np.random.default_rng(0)
+    n = 400
+    ages = rng.integers(0, 105, n).astype(float)
+    ages[::37] = np.nan
+    return pd.DataFrame({
+        'County': rng.choice(['Fulton', 'Cobb', 'Dougherty', None], n, p=[0.4, 0.3, 0.25, 0.05]),
+        'Age': np.concatenate([[0, 4, 5, 94, 95, 120], ages[6:]]),
+        'Gender': rng.choice(['Female', 'Male', 'Other', None], n, p=[0.45, 0.45, 0.05, 0.05]),
+        'Underlying': rng.choice(['Yes', 'No', 'Unk', None], n),
+    })
+
+
+def expected_dimensions(deaths):
+    """The cube's dimension values worked out row by row with pandas."""
+    def band(age):
+        if np.isnan(age):
+            return UNKNOWN
+        return '95+' if age >= 95 else f"{int(age // 5 * 5)}-{int(age // 5 * 5 + 4)}"
+    return pd.DataFrame({
+        'County': deaths['County'].fillna(UNKNOWN),
+        'Age_Band': deaths['Age'].map(band),
+        'Gender': deaths['Gender'].where(deaths['Gender'].isin(['Female', 'Male']), UNKNOWN),
+        'Underlying': deaths['Underlying'].where(deaths['Underlying'].isin(['Yes', 'No']), UNKNOWN),
+    })
+
+
+FILTERS = [
+    {},
+    {'County': ['Fulton']},
+    {'County': ['Cobb', 'Dougherty'], 'Gender': ['Male']},
+    {'Age_Band': ['60-64', '95+', UNKNOWN], 'Underlying': ['Yes']},
+    {'County': [UNKNOWN], 'Gender': [UNKNOWN], 'Underlying': ['No', UNKNOWN]},
+]
+
+
+@pytest.mark.parametrize('by, filters', list(itertools.product(DeathsCube.DIMENSIONS, FILTERS)))
+def test_slices_match_a_groupby(by, filters):
+    deaths = line_list()
+    cube = DeathsCube(deaths)
+    rows = expected_dimensions(deaths)
+    for dim, values in filters.items():
+        if dim != by:
+            rows = rows[rows[dim].isin(values)]
+    expected = rows.groupby(by).size().reindex(cube.labels[by], fill_value=0)
+    result = cube.counts_by(by, **filters)
+    assert result.index.tolist() == cube.labels[by]
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+def test_age_bands_at_the_edges():
+    cube = DeathsCube(line_list())
+    assert cube.labels['Age_Band'][:2] == ['0-4', '5-9'] and cube.labels['Age_Band'][-2:] == ['95+', UNKNOWN]
+    assert cube.total == 400
+
+
+@pytest.mark.parametrize('filters', [{'County': []}, {'Gender': []}, {'County': ['Nowhere']}])
+def test_empty_selections_count_nothing(filters):
+    result = DeathsCube(line_list()).counts_by('Age_Band', **filters)
+    assert len(result) == len(DeathsCube(line_list()).labels['Age_Band']) and (result == 0).all()
+
+
+def test_filter_on_the_breakdown_dimension_is_ignored():
+    cube = DeathsCube(line_list())
+    pd.testing.assert_series_equal(cube.counts_by('Gender', Gender=['Male']), cube.counts_by('Gender'))
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from application.dash_application.demographics import load_category_series, race_cases, snapshot_window
+
+WINDOW = (pd.Timestamp('2020-04-01'), pd.Timestamp('2020-04-30'))
+
+
+def race_frame():
+    breakdown = [(cases, '2020-04-12 00:00:00', ethnicity, 'Black Or African American', None)
+                 for cases, ethnicity in [(18, 'Hispanic/Latino'), (2249, 'Non-Hispanic/Latino'), (474, 'Unknown')]]
+    return pd.DataFrame(breakdown + [
+        (None, '2020-04-12 00:00:00', None, 'Black', 2741),   # totals row on a date that has the breakdown
+        (None, '2020-04-11 00:00:00', None, 'Black', 2670),
+        (None, '2020-04-10 00:00:00', None, 'Black', 2579),   # totals only
+        (5, '2020-04-11 18:00:00', 'Unknown', 'Asian', None),
+        (None, '2020-04-11 00:00:00', None, 'Asian', 80),
+    ], columns=['Cases', 'Date', 'Ethnicity', 'Race', 'Race_Num'])
+
+
+def cases(df, date, race):
+    return df.loc[(df['Date'] == pd.Timestamp(date)) & (df['Race'] == race), 'Cases'].tolist()
+
+
+def test_breakdown_wins_over_totals_on_the_same_date():
+    df = race_cases(race_frame(), WINDOW)
+    assert cases(df, '2020-04-12 00:00:00', 'Black') == [18 + 2249 + 474]
+
+
+def test_totals_used_only_where_a_date_has_no_breakdown():
+    df = race_cases(race_frame(), WINDOW)
+    # 04/11 has a breakdown row (Asian), so its totals rows are not mixed in
+    assert cases(df, '2020-04-11 00:00:00', 'Asian') == [5]
+    assert cases(df, '2020-04-11 00:00:00', 'Black') == []
+
+
+def test_repeated_snapshot_rows_count_once():
+    df = race_frame()
+    df = race_cases(pd.concat([df, df]), WINDOW)
+    assert cases(df, '2020-04-12 00:00:00', 'Black') == [2741]
+
+
+def test_shipped_race_series_matches_published_totals():
+    series = load_category_series('assets/data/merged/categories', snapshot_window('assets/data/split'))['race_cases']
+    black = series.values[series.dates.index('04/12/2020'), series.groups.index('Black')]
+    assert black == 2741
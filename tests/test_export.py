@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from application import export
+from application.dash_application import ga_cases
+
+
+def max_day():
+    return ga_cases.history_store(ga_cases.HOME_STATE).max_day()
+
+
+def test_csv_of_the_selected_counties_stat_and_days(client):
+    response = client.get('/export?county=Fulton&county=Cobb&stat=TotalCases&start=10&end=20')
+    assert response.status_code == 200 and response.mimetype == 'text/csv'
+    df = pd.read_csv(io.BytesIO(response.data))
+    assert list(df.columns) == ['Date', 'Day', 'County', 'TotalCases']
+    assert set(df['County']) == {'Fulton', 'Cobb'}
+    assert (df['Day'].min(), df['Day'].max(), len(df)) == (11, 20, 20)
+
+
+def test_statewide_csv_by_default(client):
+    df = pd.read_csv(io.BytesIO(client.get('/export').data))
+    assert 'County' not in df and len(df) == max_day()
+
+
+def test_parquet_matches_csv(client):
+    query = '/export?counties=' + ','.join(ga_cases.history_store(ga_cases.HOME_STATE).counties()[:40]) + '&start=5&end=30'
+    response = client.get(query + '&format=parquet')
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.data))
+    assert table.num_rows == 40 * 25
+    from_csv = pd.read_csv(io.BytesIO(client.get(query).data), parse_dates=['Date'])
+    pd.testing.assert_frame_equal(table.to_pandas(), from_csv, check_dtype=False)
+
+
+def test_parquet_stream_converts_chunks_to_the_schema():
+    schema = export.parquet_schema(pd.DataFrame({'County': pd.Series([], dtype=str), 'Rate': pd.Series([], dtype=float)}))
+    groups = [pd.DataFrame({'County': ['A'], 'Rate': [1]}), pd.DataFrame({'County': [None], 'Rate': [np.nan]})]
+    table = pq.read_table(io.BytesIO(b''.join(export.stream_parquet(iter(groups), schema))))
+    assert table.schema.field('Rate').type == pa.float64()
+    assert table.column('County').to_pylist() == ['A', None]
+
+
+def test_etag_revalidates_with_304(client):
+    first = client.get('/export?county=Fulton')
+    etag = first.headers['ETag'].strip('"')
+    again = client.get('/export?county=Fulton', headers={'If-None-Match': f'"{etag}"'})
+    assert again.status_code == 304 and not again.data
+    assert client.get('/export?county=Cobb', headers={'If-None-Match': f'"{etag}"'}).status_code == 200
+
+
+@pytest.mark.parametrize('query', ['start=-1', 'start=20&end=10', 'start=5&end=5', 'end=100000', 'start=x',
+                                   'stat=Nope', 'county=Nowhere', 'format=xlsx'])
+def test_bad_selections_are_rejected(client, query):
+    assert client.get(f'/export?{query}').status_code == 400
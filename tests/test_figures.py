@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from application.dash_application import figures
+from figure_reference import COLORS, as_json, builder_traces, plotly_traces, reference_lttb, stacked_bar_layouts
+
+
+@pytest.mark.parametrize('n_counties, n_days', [(1, 90), (3, 400)])
+def test_count_traces_match_graph_objects(n_counties, n_days):
+    days = np.arange(1, n_days + 1)
+    values = np.random.default_rng(0).poisson(50, size=(n_counties, n_days)).astype(float)
+    counties = [f"County {i}" for i in range(n_counties)]
+    assert as_json(builder_traces(counties, days, values)) == as_json(plotly_traces(counties, days, values))
+
+
+def test_layout_matches_graph_objects():
+    built, expected = stacked_bar_layouts()
+    assert built == expected
+
+
+def test_lttb_matches_reference():
+    x = np.arange(1, 2001, dtype=float)
+    y = np.cumsum(np.random.default_rng(0).normal(size=(25, 2000)), axis=1)
+    indices = figures.lttb_indices(x, y, 300)
+    for row in range(len(y)):
+        assert indices[row].tolist() == reference_lttb(x, y[row], 300)
+
+
+def test_lttb_keeps_short_series_and_ends():
+    y = np.arange(12, dtype=float).reshape(2, 6)
+    assert figures.lttb_indices(np.arange(6), y, 10).tolist() == [list(range(6))] * 2
+    y = np.where(np.arange(500) % 7 == 0, np.nan, np.arange(500.0))[None, :]
+    indices = figures.lttb_indices(np.arange(500), y, 50)[0]
+    assert indices[0] == 0 and indices[-1] == 499 and len(set(indices)) == 50
+    assert not np.isnan(y[0, indices[1:-1]]).any()
+
+
+def test_downsampled_traces_keep_stacks_aligned():
+    days = np.arange(1, 3001)
+    values = np.cumsum(np.random.default_rng(1).poisson(5, size=(4, 3000)), axis=1).astype(float)
+    lines, bars = figures.count_traces([f"C{i}" for i in range(4)], days.tolist(), [str(d) for d in days], values, COLORS,
+                                       max_points=500)
+    assert all(len(line['x']) == 500 for line in lines)
+    assert all(bar['x'] == bars[0]['x'] for bar in bars)
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from application.dash_application.ingest import rebuild
+
+COUNTY_COLUMNS = ['Date', 'Day', 'County', 'fips', 'Population', 'TotalCases', 'TotalDeaths', 'PctPopInfected',
+                  'Infection_per_100k', 'Deaths_per_100k', 'Deaths_per_100_Infections', 'nConfirmed_Change',
+                  'nDeaths_Change', 'pConfirmed_Change', 'pDeaths_Change', 'Fatality_Rate']
+STATE_COLUMNS = ['Date', 'Day', 'Population', 'TotalCases', 'Hospitalized', 'TotalDeaths', 'PctPopInfected',
+                 'Infection_per_100k', 'Deaths_per_100k', 'Deaths_per_100_Infections', 'nConfirmed_Change',
+                 'nDeaths_Change', 'pConfirmed_Change', 'pDeaths_Change', 'Fatality_Rate']
+
+
+def write_report(split, stamp, period, counties, total, hospitalized, deaths):
+    folder = split / stamp / period
+    folder.mkdir(parents=True)
+    pd.DataFrame(counties, columns=['County', 'fips', 'TotalCases', 'TotalDeaths']).to_csv(
+        folder / f"CountyCases_{stamp}_{period}.csv", index=False)
+    pd.DataFrame({'Confirmed': ['Total', 'Hospitalized', 'Deaths'], 'TotalCases': [total, hospitalized, deaths]}).to_csv(
+        folder / f"Summary_{stamp}_{period}.csv", index=False)
+
+
+def history_row(day, county, cases, deaths, population=1000):
+    row = dict.fromkeys(COUNTY_COLUMNS, 0.0)
+    row.update(Date=f"03/{day + 1:02d}/2020", Day=day, County=county, fips=13001.0, Population=population,
+               TotalCases=cases, TotalDeaths=deaths)
+    return row
+
+
+@pytest.fixture
+def merged(tmp_path):
+    split = tmp_path / 'split'
+    # Day 29 (03/30): AM then PM, the PM report wins. Day 30 is a new day; Bravo is missing from it.
+    write_report(split, '03302020', 'AM', [('Alpha', 13001, 8, 0), ('Bravo', 13003, 1, 0)], 9, 1, 0)
+    write_report(split, '03302020', 'PM', [('Alpha', 13001, 10, 1), ('Bravo', 13003, 2, 0)], 12, 2, 1)
+    write_report(split, '03312020', 'PM', [('Alpha', 13001, 15, 1)], 17, 3, 1)
+
+    history_dir = tmp_path / 'merged'
+    history_dir.mkdir()
+    rows = [history_row(day, county, cases, 0) for county in ['Alpha', 'Bravo']
+            for day, cases in [(28, 5), (29, 6), (30, 0), (31, 0)]]
+    pd.DataFrame(rows, columns=COUNTY_COLUMNS).to_csv(history_dir / 'ga_90days.csv', index=False)
+    state = [dict(dict.fromkeys(STATE_COLUMNS, 0.0), Date=f"03/{day + 1:02d}/2020", Day=float(day), Population=2000.0,
+                  TotalCases=10.0) for day in [28, 29]]
+    pd.DataFrame(state, columns=STATE_COLUMNS).to_csv(history_dir / 'georgia_pm.csv', index=False)
+
+    counts = rebuild(str(split), str(tmp_path / 'categories'), workers=1, history_dir=str(history_dir))
+    return counts, pd.read_csv(history_dir / 'ga_90days.csv'), pd.read_csv(history_dir / 'georgia_pm.csv')
+
+
+def test_county_history_rebuilt_from_each_days_last_report(merged):
+    counts, county, state = merged
+    assert counts['ga_90days.csv'] == 8
+    alpha = county[county['County'] == 'Alpha'].set_index('Day')
+    assert alpha['TotalCases'].to_dict() == {28: 5, 29: 10, 30: 15, 31: 0}
+    assert alpha.loc[29, 'nConfirmed_Change'] == 5 and alpha.loc[30, 'nConfirmed_Change'] == 5
+    assert alpha.loc[30, 'Date'] == '03/31/2020'
+    assert alpha.loc[30, 'Infection_per_100k'] == 1500
+    # Missing from the 03/31 report: carries its previous counts
+    bravo = county[county['County'] == 'Bravo'].set_index('Day')
+    assert bravo.loc[30, 'TotalCases'] == 2 and bravo.loc[30, 'nConfirmed_Change'] == 0
+
+
+def test_days_without_reports_are_kept(merged):
+    counts, county, state = merged
+    assert county[county['Day'] == 28]['TotalCases'].tolist() == [5, 5]
+    # Zero placeholder rows after the last report stay as they were
+    assert county[county['Day'] == 31]['TotalCases'].tolist() == [0, 0]
+    assert county['Day'].dtype == 'int64'
+
+
+def test_state_history_appends_new_days(merged):
+    counts, county, state = merged
+    assert state['Day'].tolist() == [28.0, 29.0, 30.0]
+    assert state['TotalCases'].tolist() == [10, 12, 17]
+    assert state['Hospitalized'].tolist() == [0, 2, 3]
+    assert state.loc[2, 'nConfirmed_Change'] == 5 and state.loc[2, 'Population'] == 2000
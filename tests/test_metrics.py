@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from application.dash_application.metrics import add_derived_metrics, derived_metrics, rolling_mean
+
+
+def metrics(total_cases, new_cases=None, new_deaths=None):
+    total_cases = np.array([total_cases], dtype=float)
+    new_cases = np.diff(total_cases, prepend=0) if new_cases is None else np.array([new_cases], dtype=float)
+    new_deaths = np.zeros_like(total_cases) if new_deaths is None else np.array([new_deaths], dtype=float)
+    return {name: values[0] for name, values in derived_metrics(total_cases, new_cases, new_deaths).items()}
+
+
+def test_rolling_mean_averages_the_days_available_so_far():
+    values = np.arange(1, 11, dtype=float)[None, :]
+    np.testing.assert_allclose(rolling_mean(values)[0], [1, 1.5, 2, 2.5, 3, 3.5, 4, 5, 6, 7])
+
+
+def test_short_history():
+    result = metrics([2, 5, 9], new_deaths=[0, 1, 0])
+    np.testing.assert_allclose(result['Cases_7Day_Avg'], [2, 2.5, 3])
+    np.testing.assert_allclose(result['Deaths_7Day_Avg'], [0, 0.5, 1 / 3])
+    # No week-earlier value to compare with
+    assert np.isnan(result['Cases_WoW_Growth']).all()
+    assert np.isnan(result['Doubling_Time']).all()
+    assert np.isnan(result['Days_Since_10th_Case']).all()
+
+
+def test_week_over_week_growth():
+    result = metrics(np.cumsum([10] * 7 + [20] * 7))
+    assert np.isnan(result['Cases_WoW_Growth'][:7]).all()
+    # Day 14: this week's average of 20 against last week's 10
+    assert result['Cases_WoW_Growth'][13] == 100
+
+
+def test_doubling_time():
+    totals = 10 * 2 ** (np.arange(15) / 7)
+    np.testing.assert_allclose(metrics(totals)['Doubling_Time'][7:], 7)
+    # Tripling in a week doubles in 7 ln 2 / ln 3 days
+    assert metrics([1] * 7 + [3])['Doubling_Time'][7] == np.float64(7 * np.log(2) / np.log(3))
+
+
+def test_no_doubling_time_without_growth():
+    # Flat totals, then a downward correction, then cases appearing from zero
+    result = metrics([50] * 8 + [40] * 7 + [0] * 7 + [5], new_cases=[50] + [0] * 7 + [-10] + [0] * 6 + [-40] + [0] * 6 + [5])
+    assert np.isnan(result['Doubling_Time']).all()
+    assert np.isfinite(result['Cases_7Day_Avg']).all()
+    # Growth is undefined while last week's average is not positive
+    assert np.isnan(result['Cases_WoW_Growth'][15:]).all()
+
+
+def test_days_since_the_10th_case():
+    np.testing.assert_array_equal(metrics([0, 5, 10, 12, 15])['Days_Since_10th_Case'], [np.nan, np.nan, 0, 1, 2])
+    assert np.isnan(metrics([0, 3, 9, 9])['Days_Since_10th_Case']).all()
+
+
+def test_add_derived_metrics_per_county():
+    a, b = [1, 4, 12, 20], [0, 0, 2, 3]
+    df = pd.DataFrame({
+        'County': ['B', 'A'] * 4,
+        'Day': np.repeat([1, 2, 3, 4], 2),
+        'TotalCases': [value for pair in zip(b, a) for value in pair],
+    })
+    df['nConfirmed_Change'] = df.groupby('County')['TotalCases'].diff().fillna(df['TotalCases'])
+    df['nDeaths_Change'] = 0
+    result = add_derived_metrics(df, 'County').set_index(['County', 'Day'])
+    for county, totals in (('A', a), ('B', b)):
+        expected = metrics(totals)
+        for name in ('Cases_7Day_Avg', 'Days_Since_10th_Case'):
+            np.testing.assert_array_equal(result.loc[county, name].to_numpy(), expected[name].round(2))
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from application.dash_application import prerender
+
+
+def test_prerendered_default_view(app, tmp_path):
+    written = prerender.prerender(app, str(tmp_path))
+    assert {'/index.html', '/_dash-layout', '/_dash-dependencies'} <= set(written)
+    layout = prerender.component_index(json.loads((tmp_path / '_dash-layout').read_text()))
+    dependencies = json.loads((tmp_path / '_dash-dependencies').read_text())
+
+    # Key figures and the main graph data are filled in with the default selection
+    assert layout['aggregate_data'].get('data')
+    lines, bars, _ = layout['main_graph_data']['data']
+    assert lines and bars
+
+    flagged = {dependency['output'] for dependency in dependencies if dependency.get('prevent_initial_call')}
+    assert {'aggregate_data.data', 'main_graph_data.data'} <= flagged
+    # Clientside callbacks still run in the browser
+    assert not any(dependency.get('clientside_function') for dependency in dependencies
+                   if dependency['output'] in flagged)
+    assert (tmp_path / 'static' / 'scripts' / 'resizing_script.js').exists()
+
+
+class Response:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def get_json(self):
+        return self.body
+
+
+class Client:
+    """Answers each callback with `functions[output](*input values)`."""
+
+    def __init__(self, functions):
+        self.functions = functions
+        self.calls = []
+
+    def post(self, path, json):
+        self.calls.append(json['output'])
+        component, prop = json['output'].rsplit('.', 1)
+        value = self.functions[json['output']](*[spec['value'] for spec in json['inputs']])
+        return Response({'response': {component: {prop: value}}})
+
+
+def component(id, value=0):
+    return {'type': 'Input', 'namespace': 'dcc', 'props': {'id': id, 'value': value}}
+
+
+def dependency(output, inputs):
+    return {'output': output, 'inputs': [{'id': i, 'property': 'value'} for i in inputs], 'state': []}
+
+
+def test_callbacks_run_in_dependency_order():
+    layout = {'props': {'children': [component('a', 1), component('b'), component('c')]}}
+    client = Client({'c.value': lambda b: b * 2, 'b.value': lambda a: a + 1})
+    done = prerender.run_initial_callbacks(client, layout, [dependency('c.value', ['b']), dependency('b.value', ['a'])])
+    assert done == {0, 1} and client.calls == ['b.value', 'c.value']
+    assert prerender.component_index(layout)['c']['value'] == 4
+
+
+def test_callbacks_feeding_each_other_are_rerun_until_settled():
+    layout = {'props': {'children': [component('x'), component('y')]}}
+    client = Client({'x.value': lambda y: y, 'y.value': lambda x: 5})
+    prerender.run_initial_callbacks(client, layout, [dependency('x.value', ['y']), dependency('y.value', ['x'])])
+    assert prerender.component_index(layout)['x']['value'] == 5
+
+
+def test_callbacks_that_never_settle_fail_the_build():
+    layout = {'props': {'children': [component('x'), component('y')]}}
+    client = Client({'x.value': lambda y: y + 1, 'y.value': lambda x: x + 1})
+    with pytest.raises(RuntimeError):
+        prerender.run_initial_callbacks(client, layout, [dependency('x.value', ['y']), dependency('y.value', ['x'])])
@@ -0,0 +1,57 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from application.dash_application.regions import RegionStore
+
+
+def region_dir(tmp_path, states):
+    for state in states:
+        (tmp_path / f"{state}.csv").write_text("County,Day\n")
+    return str(tmp_path)
+
+
+def frames(path):
+    return {'over_time': pd.DataFrame({'County': ['A'], 'Day': [1]})}
+
+
+def test_loads_once_per_version(tmp_path):
+    loads = []
+    store = RegionStore(region_dir(tmp_path, ['AL']), lambda path: loads.append(path) or frames(path))
+    assert store.get('AL', 'v1') is store.get('AL', 'v1')
+    assert len(loads) == 1
+    store.get('AL', 'v2')
+    assert len(loads) == 2
+
+
+def test_unknown_state(tmp_path):
+    store = RegionStore(region_dir(tmp_path, ['AL']), frames)
+    with pytest.raises(KeyError):
+        store.get('ZZ', 'v1')
+
+
+def test_cold_load_does_not_block_other_states(tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def loader(path):
+        if path.endswith('FL.csv'):
+            started.set()
+            assert release.wait(5)
+        return frames(path)
+
+    store = RegionStore(region_dir(tmp_path, ['AL', 'FL', 'TN']), loader)
+    store.get('AL', 'v1')
+    slow = threading.Thread(target=store.get, args=('FL', 'v1'))
+    slow.start()
+    assert started.wait(5)
+    try:
+        # Served (cached and cold) while FL is still loading
+        others = threading.Thread(target=lambda: [store.get('AL', 'v1'), store.get('TN', 'v1')])
+        others.start()
+        others.join(5)
+        assert not others.is_alive()
+    finally:
+        release.set()
+        slow.join()
+    assert set(store._regions) == {'AL', 'FL', 'TN'}
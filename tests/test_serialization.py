@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import dash_core_components as dcc
+from plotly.io.json import to_json_plotly
+
+from application.dash_application import ga_cases, serialization
+
+
+def plotly_json(value):
+    return json.loads(to_json_plotly(value, engine='json'))
+
+
+@pytest.mark.parametrize('value', [
+    {'y': np.array([1.5, np.nan, np.inf, -np.inf]), 'x': np.arange(4), 'flags': np.array([True, False])},
+    {'x': pd.Series([1, 2, 3]), 'labels': pd.Index(['a', 'b']), 'day': pd.Timestamp('2020-03-02')},
+    {'strided': np.arange(10.0)[::3], 'big_endian': np.arange(3, dtype='>f8'), 'matrix': np.eye(2)},
+    [dcc.Graph(id='graph', figure={'data': [{'x': np.arange(3), 'y': pd.Series([1.0, None, 3.0]), 'type': 'bar'}]})],
+])
+def test_dumps_matches_the_plotly_encoder(value):
+    assert json.loads(serialization.dumps(value)) == plotly_json(value)
+
+
+def test_dumps_matches_the_plotly_encoder_on_callback_responses(app):
+    counties = ga_cases.history_store(ga_cases.HOME_STATE).counties()
+    responses = [
+        ga_cases.count_figure.__wrapped__('Cases_7Day_Avg', 'tab-1', counties[:20], ga_cases.HOME_STATE),
+        ga_cases.key_figures.__wrapped__(['All Counties'], [0, ga_cases.latest_day()]),
+        ga_cases.demographic_tab_content.__wrapped__('race'),
+    ]
+    for response in responses:
+        body = {'multi': True, 'response': {'output': {'data': response}}}
+        assert json.loads(serialization.dumps(body)) == plotly_json(body)
+
+
+def test_install_routes_callback_responses_through_dumps(app, client):
+    from dash import _callback
+    assert serialization.install()
+    assert _callback.to_json is serialization.dumps
+
+    county = ga_cases.history_store(ga_cases.HOME_STATE).counties()[0]
+    response = client.post('/_dash-update-component', json={
+        'output': 'main_graph_data.data',
+        'outputs': {'id': 'main_graph_data', 'property': 'data'},
+        'inputs': [{'id': 'county_stat_selector', 'property': 'value', 'value': 'TotalCases'},
+                   {'id': 'main_graph_tabs', 'property': 'value', 'value': 'tab-1'},
+                   {'id': 'county_options_menu', 'property': 'value', 'value': [county]},
+                   {'id': 'state_selector', 'property': 'value', 'value': ga_cases.HOME_STATE},
+                   {'id': 'data_version', 'property': 'data', 'value': None}],
+        'changedPropIds': [],
+    })
+    assert response.status_code == 200
+    expected = ga_cases.count_figure.__wrapped__('TotalCases', 'tab-1', [county], ga_cases.HOME_STATE)
+    assert response.get_json()['response']['main_graph_data']['data'] == plotly_json(expected)
@@ -0,0 +1,32 @@
+import os
+
+from application.dash_application.snapshots import SnapshotDiffEngine, load_snapshot
+
+
+def write_summary(split, snapshot, hospitalized, bump=0):
+    day, period = snapshot.split('_')
+    folder = split / day / period
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"Summary_{snapshot}.csv"
+    path.write_text(f"Confirmed,TotalCases\nTotal,100\nHospitalized,{hospitalized}\n")
+    if bump:
+        later = path.stat().st_mtime + bump
+        os.utime(path, (later, later))
+
+
+def test_revised_snapshot_is_reloaded(tmp_path):
+    write_summary(tmp_path, '04012020_PM', 10)
+    assert load_snapshot(str(tmp_path), '04012020_PM', 'Summary').loc['Hospitalized', 'TotalCases'] == 10
+    write_summary(tmp_path, '04012020_PM', 12, bump=10)
+    assert load_snapshot(str(tmp_path), '04012020_PM', 'Summary').loc['Hospitalized', 'TotalCases'] == 12
+
+
+def test_diff_follows_revisions(tmp_path):
+    write_summary(tmp_path, '04012020_PM', 10)
+    write_summary(tmp_path, '04022020_PM', 15)
+    engine = SnapshotDiffEngine(str(tmp_path))
+    assert engine.since_last('04022020_PM', 'Summary').summary['net'] == {'TotalCases': 5}
+    assert engine.since_last('04022020_PM', 'Summary') is engine.since_last('04022020_PM', 'Summary')
+
+    write_summary(tmp_path, '04022020_PM', 19, bump=10)
+    assert engine.since_last('04022020_PM', 'Summary').summary['net'] == {'TotalCases': 9}
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from application.dash_application.aggregation import COUNT_COLUMNS, GroupAggregator, StoreAggregator
+from application.dash_application.storage import STATE_ROW, MemoryStore, SQLiteStore, build_database
+
+GROUPS = {'North': ['A', 'B']}
+
+
+def history():
+    rows = []
+    for county, population, first_day in (('A', 1000, 1), ('B', 5000, 1), ('C', 200, 3)):
+        for day in range(first_day, 7):
+            cases = day * population // 100
+            rows.append({'Date': pd.Timestamp('2020-03-01') + pd.Timedelta(days=day), 'Day': day, 'County': county,
+                         'Population': population, 'TotalCases': cases, 'TotalDeaths': cases // 10,
+                         'nConfirmed_Change': population // 100, 'nDeaths_Change': population // 1000,
+                         'Infection_per_100k': cases / population * 100000})
+    over_time = pd.DataFrame(rows)
+    state_time = over_time.groupby(['Date', 'Day'], as_index=False)[COUNT_COLUMNS].sum().assign(Hospitalized=1.0)
+    return over_time, state_time
+
+
+@pytest.fixture
+def stores(tmp_path):
+    over_time, state_time = history()
+    path = str(tmp_path / 'history.sqlite')
+    build_database(path, {'XX': (over_time, state_time)})
+    return MemoryStore(over_time, state_time), SQLiteStore(path, 'XX')
+
+
+def test_stores_answer_alike(stores):
+    memory, database = stores
+    assert memory.counties() == database.counties() == ['A', 'B', 'C']
+    assert memory.max_day() == database.max_day() == 6
+    pd.testing.assert_frame_equal(memory.latest().reset_index(drop=True), database.latest())
+    for counties in (['C', 'A'], [STATE_ROW]):
+        pd.testing.assert_frame_equal(memory.rows(counties, [1, 4]).reset_index(drop=True), database.rows(counties, [1, 4]))
+        np.testing.assert_array_equal(memory.query(counties, 'TotalCases', [0, 6])[1],
+                                      database.query(counties, 'TotalCases', [0, 6])[1])
+    for column, values in memory.sums(['B', 'C'], COUNT_COLUMNS, [0, 6]).items():
+        np.testing.assert_array_equal(values, database.sums(['B', 'C'], COUNT_COLUMNS, [0, 6])[column])
+
+
+def test_store_aggregator_matches_group_aggregator(stores):
+    memory, database = stores
+    dense, stored = GroupAggregator(memory.over_time, GROUPS), StoreAggregator(database, GROUPS)
+    for items in (['A'], ['North', 'C'], ['C']):
+        for stat in ('TotalCases', 'Infection_per_100k', 'Fatality_Rate'):
+            np.testing.assert_array_equal(dense.query(items, stat, [0, 6])[1], stored.query(items, stat, [0, 6])[1])
+        assert dense.totals(items, [2, 6]) == stored.totals(items, [2, 6])
@@ -0,0 +1,101 @@
+import os
+import datetime as dt
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from application.dash_application.sync import CATEGORIES, MirrorSync
+
+TODAY = dt.date(2020, 4, 30)
+# Upstream reports: day -> periods (everything else answers 404)
+REPORTS = {dt.date(2020, 4, 1): ['AM', 'PM'], dt.date(2020, 4, 3): ['PM']}
+
+
+class Upstream(SimpleHTTPRequestHandler):
+    """Static file server (answers If-Modified-Since with 304) that records the paths requested."""
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        super().do_GET()
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    root = tmp_path / 'upstream'
+    for day, periods in REPORTS.items():
+        stamp = day.strftime('%m%d%Y')
+        for period in periods:
+            folder = root / stamp / period
+            folder.mkdir(parents=True)
+            for category in CATEGORIES:
+                (folder / f"{category}_{stamp}_{period}.csv").write_text(f"Date,{category}\n{stamp},1\n")
+    Upstream.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(Upstream, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def mirror(tmp_path, base_url, changes=None):
+    on_change = changes.append if changes is not None else None
+    return MirrorSync(base_url, str(tmp_path / 'data' / 'split'), recheck_days=2, max_gap_days=3, on_change=on_change)
+
+
+def test_first_sync_downloads_every_published_report(tmp_path, upstream):
+    root, base_url = upstream
+    changes = []
+    changed = mirror(tmp_path, base_url, changes).sync(TODAY)
+    assert changed == ['04012020_AM', '04012020_PM', '04032020_PM']
+    assert changes == [changed]
+    split = tmp_path / 'data' / 'split'
+    assert sorted(os.listdir(split / '04012020' / 'AM')) == sorted(f"{c}_04012020_AM.csv" for c in CATEGORIES)
+    # Sync state lives next to the mirror, never inside it
+    assert (tmp_path / 'data' / '.sync_state.json').exists()
+    assert not any(name.startswith('.') for name in os.listdir(split))
+
+
+def test_stops_probing_after_a_gap(tmp_path, upstream):
+    root, base_url = upstream
+    mirror(tmp_path, base_url).sync(TODAY)
+    # 03/30 -> 04/06: 3 empty days after the last report, not every day up to TODAY
+    probed = {path.split('/')[1] for path in Upstream.requests}
+    assert max(probed) == '04062020'
+    # An unpublished report costs one request
+    assert [path for path in Upstream.requests if path.startswith('/04042020/')] == [
+        '/04042020/AM/Summary_04042020_AM.csv', '/04042020/PM/Summary_04042020_PM.csv']
+
+
+def test_second_sync_is_all_not_modified(tmp_path, upstream):
+    root, base_url = upstream
+    mirror(tmp_path, base_url).sync(TODAY)
+    state = (tmp_path / 'data' / '.sync_state.json').read_text()
+
+    changes = []
+    again = mirror(tmp_path, base_url, changes)
+    assert again.sync(TODAY) == []
+    assert again.bytes_received == 0
+    assert changes == []
+    assert (tmp_path / 'data' / '.sync_state.json').read_text() == state
+
+
+def test_revised_file_is_fetched_again(tmp_path, upstream):
+    root, base_url = upstream
+    mirror(tmp_path, base_url).sync(TODAY)
+
+    revised = root / '04032020' / 'PM' / 'Summary_04032020_PM.csv'
+    revised.write_text("Date,Summary\n04032020,2\n")
+    later = revised.stat().st_mtime + 10
+    os.utime(revised, (later, later))
+
+    changes = []
+    again = mirror(tmp_path, base_url, changes)
+    assert again.sync(TODAY) == ['04032020_PM']
+    assert changes == [['04032020_PM']]
+    assert (tmp_path / 'data' / 'split' / '04032020' / 'PM' / 'Summary_04032020_PM.csv').read_text() == revised.read_text()
@@ -0,0 +1,97 @@
+import time
+
+from application.dash_application import cache
+from application.dash_application.warmer import CacheWarmer
+
+
+class Versions:
+    def __init__(self, version):
+        self.version = version
+
+    def __call__(self):
+        return self.version
+
+
+def warmer(versions, calls):
+    return CacheWarmer(versions, lambda: [('compute', (1,))], {'compute': calls.append}, interval=3600)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_not_ready_until_first_warm():
+    versions, calls = Versions('a'), []
+    w = warmer(versions, calls)
+    assert not w.is_ready()
+    assert w.status()['status'] == 'warming'
+    w.warm('a')
+    assert w.is_ready() and not w.is_stale()
+    assert calls == [1]
+
+
+def test_stays_ready_while_rewarming_a_new_version():
+    versions, calls = Versions('a'), []
+    w = warmer(versions, calls)
+    w.warm('a')
+    versions.version = 'b'
+    assert w.is_ready()
+    assert w.status()['status'] == 'stale' and w.status()['stale']
+
+
+def test_notify_starts_a_warm_without_waiting_for_the_interval():
+    versions, calls = Versions('a'), []
+    w = warmer(versions, calls)
+    w.start()
+    wait_for(lambda: w.warm_version == 'a')
+    versions.version = 'b'
+    w.notify('b')
+    wait_for(lambda: w.warm_version == 'b')
+    assert len(calls) == 2
+
+
+def test_version_listeners_called_on_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_version_state', {'checked_at': 0, 'version': None})
+    monkeypatch.setattr(cache, '_version_listeners', [])
+    seen = []
+    cache.on_version_change(seen.append)
+    source = tmp_path / 'data.csv'
+    source.write_text('a')
+    first = cache.dataset_version([str(source)], force=True)
+    assert cache.dataset_version([str(source)], force=True) == first
+    assert seen == []
+    source.write_text('ab')
+    second = cache.dataset_version([str(source)], force=True)
+    assert seen == [second] != [first]
+
+
+def test_not_ready_when_every_preset_fails():
+    versions, broken = Versions('a'), [True]
+
+    def compute(value):
+        if broken[0]:
+            raise RuntimeError("data did not load")
+
+    w = CacheWarmer(versions, lambda: [('compute', (1,)), ('compute', (2,))], {'compute': compute}, interval=3600)
+    w.warm('a')
+    assert not w.is_ready() and w.warm_version is None
+    assert w.status()['status'] == 'failed' and w.status()['presets_failed'] == 2
+
+    broken[0] = False
+    w.warm('a')
+    assert w.is_ready()
+
+    # A later version that no longer loads takes the worker out of rotation too
+    broken[0] = True
+    versions.version = 'b'
+    w.warm('b')
+    assert not w.is_ready() and w.warm_version == 'a'
+
+
+def test_ready_when_only_some_presets_fail():
+    w = CacheWarmer(Versions('a'), lambda: [('ok', ()), ('bad', ())], {'ok': lambda: None, 'bad': lambda: 1 / 0})
+    w.warm('a')
+    assert w.is_ready() and w.status()['presets_failed'] == 1